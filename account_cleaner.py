@@ -4,14 +4,203 @@ Specialized module for cleaning email addresses and user account data.
 """
 
 import logging
+import mmap
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Optional, Set, Iterator, Iterable, Tuple, Union
 import json
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None  # Optional; removal falls back to the combined regex
+
 from backup_manager import BackupManager
 from config_manager import ConfigManager
-from utils import SafeFileOperations
+from utils import SafeFileOperations, FileSearcher, DirectorySnapshot
+
+
+# File types that may hold account data, and name fragments of files to ignore
+_CONFIG_EXTS = frozenset(('.json', '.ini', '.cfg', '.conf', '.xml', '.txt', '.log'))
+_SKIP_MARKERS = ('temp', 'cache', 'backup')
+
+# Worker threads used to scan discovered files concurrently
+_SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Files at least this large are memory-mapped instead of read into memory
+_MMAP_THRESHOLD = 64 * 1024
+
+# Files at least this large are scanned in fixed-size chunks instead of as one
+# buffer; consecutive chunks overlap by more than the longest expected match
+_STREAM_THRESHOLD = 8 * 1024 * 1024
+_CHUNK_SIZE = 4 * 1024 * 1024
+_CHUNK_OVERLAP = 512
+
+# Compiled once at import; these run against every discovered config file.
+# Bytes patterns so they can scan a memory-mapped buffer without decoding it.
+_EMAIL_RE = re.compile(rb'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+
+# Quoted JSON-style and unquoted key=value/key: value forms in a single pass;
+# exactly one of the two groups is set on each match
+_USERNAMES_RE = re.compile(
+    rb'(?:"username"|"user"|"login"|"account")\s*:\s*"([^"]+)"'
+    rb'|(?:username|user|login)\s*[=:]\s*([^\s\n]+)',
+    re.IGNORECASE
+)
+
+# Bytes matched by \w in a bytes regex, for the whole-word username check
+_WORD_BYTES = frozenset(b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_')
+
+
+def _is_word_byte(buffer: Union[bytes, mmap.mmap], index: int) -> bool:
+    """Return True if buffer[index] exists and is a word character."""
+    return 0 <= index < len(buffer) and buffer[index] in _WORD_BYTES
+
+
+class _MultiTargetMatcher:
+    """Aho-Corasick matcher replacing the same spans as the removal regex would."""
+    
+    def __init__(self, emails: Tuple[str, ...], usernames: Tuple[str, ...]):
+        # The automaton works on str; latin-1 maps every byte to one character,
+        # so offsets in the decoded text are offsets in the raw buffer
+        self._automaton = ahocorasick.Automaton()
+        self._longest = 0
+        for rank, targets in enumerate((emails, usernames)):
+            for target in targets:
+                key = target.encode('utf-8').decode('latin-1')
+                if key and not self._automaton.exists(key):
+                    self._automaton.add_word(key, (rank, len(key)))
+                    self._longest = max(self._longest, len(key))
+        self._automaton.make_automaton()
+    
+    def _spans(self, buffer: Union[bytes, mmap.mmap]) -> List[Tuple[int, int]]:
+        """Return the non-overlapping spans the regex alternation would replace."""
+        candidates = []
+        # Decode one chunk at a time so a memory-mapped file is never copied
+        # whole; each window extends far enough to hold any match starting in it
+        for offset in range(0, len(buffer), _CHUNK_SIZE):
+            window = str(buffer[offset:offset + _CHUNK_SIZE + self._longest - 1], 'latin-1')
+            for window_end, (rank, length) in self._automaton.iter(window):
+                start = offset + window_end - length + 1
+                if start >= offset + _CHUNK_SIZE:
+                    continue
+                end = start + length - 1
+                # Usernames only count as whole words, like \b...\b in the regex
+                if rank == 1 and (_is_word_byte(buffer, start - 1) == _is_word_byte(buffer, start) or
+                                  _is_word_byte(buffer, end) == _is_word_byte(buffer, end + 1)):
+                    continue
+                candidates.append((start, rank, -length))
+        
+        # Leftmost first, then emails before usernames, then longest first
+        candidates.sort()
+        spans = []
+        last_end = 0
+        for start, _, negative_length in candidates:
+            if start >= last_end:
+                last_end = start - negative_length
+                spans.append((start, last_end))
+        return spans
+    
+    def replace(self, replacement: bytes, buffer: Union[bytes, mmap.mmap]) -> Optional[bytes]:
+        """Replace every span in one splice over the buffer, or return None if there are none."""
+        spans = self._spans(buffer)
+        if not spans:
+            return None
+        content = bytearray()
+        position = 0
+        for start, end in spans:
+            content += buffer[position:start]
+            content += replacement
+            position = end
+        content += buffer[position:]
+        return bytes(content)
+
+
+@lru_cache(maxsize=128)
+def _compile_removal_pattern(emails: Tuple[str, ...],
+                             usernames: Tuple[str, ...]) -> Optional[Union[re.Pattern, _MultiTargetMatcher]]:
+    """Compile emails and whole-word usernames into one matcher over bytes."""
+    if ahocorasick is not None and (emails or usernames):
+        return _MultiTargetMatcher(emails, usernames)
+    
+    alternatives = []
+    if emails:
+        alternatives.append('|'.join(map(re.escape, emails)))
+    if usernames:
+        alternatives.append(r'\b(?:' + '|'.join(map(re.escape, usernames)) + r')\b')
+    
+    if not alternatives:
+        return None
+    return re.compile('|'.join(alternatives).encode('utf-8'))
+
+
+def _replace_targets(pattern: Union[re.Pattern, _MultiTargetMatcher], replacement: bytes,
+                     buffer: Union[bytes, mmap.mmap]) -> Optional[bytes]:
+    """Return buffer with every removal target replaced, or None if it holds none."""
+    if isinstance(pattern, _MultiTargetMatcher):
+        return pattern.replace(replacement, buffer)
+    # The probe stops at the first match, so files without targets aren't copied
+    if pattern.search(buffer) is None:
+        return None
+    return pattern.sub(replacement, buffer)
+
+
+def _scan_large_file(file_path: Path) -> Tuple[Set[bytes], Set[bytes]]:
+    """Collect raw email and username matches from a large file chunk by chunk.
+    
+    Each window is the tail of the previous one plus a new chunk. Only matches
+    starting before the last _CHUNK_OVERLAP bytes are taken from a window; the
+    rest are picked up from the next one, which resumes where the previous
+    search stopped so no match is reported twice or from a truncated token.
+    """
+    emails: Set[bytes] = set()
+    usernames: Set[bytes] = set()
+    resume = {_EMAIL_RE: 0, _USERNAMES_RE: 0}
+    
+    with open(file_path, 'rb') as f:
+        window = b''
+        while True:
+            chunk = f.read(_CHUNK_SIZE)
+            window += chunk
+            cutoff = len(window) - _CHUNK_OVERLAP if chunk else len(window)
+            
+            for pattern in resume:
+                pos = resume[pattern]
+                while True:
+                    match = pattern.search(window, pos)
+                    if match is None or match.start() >= cutoff:
+                        break
+                    if pattern is _EMAIL_RE:
+                        emails.add(match.group())
+                    else:
+                        usernames.add(match.group(1) or match.group(2))
+                    pos = max(match.end(), match.start() + 1)
+                resume[pattern] = pos
+            
+            if not chunk:
+                break
+            
+            # Keep one byte before the cutoff so \b sees the preceding character
+            keep = max(cutoff - 1, 0)
+            window = window[keep:]
+            resume = {pattern: max(pos - keep, 1) for pattern, pos in resume.items()}
+    
+    return emails, usernames
+
+
+@contextmanager
+def _open_buffer(file_path: Path) -> Iterator[Union[bytes, mmap.mmap]]:
+    """Yield a file's raw content, memory-mapped when the file is large."""
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size >= _MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield mm
+        else:
+            yield f.read()
 
 
 class AccountDataCleaner:
@@ -22,7 +211,8 @@ class AccountDataCleaner:
         self.backup_manager = backup_manager
         self.config_manager = ConfigManager()
     
-    def discover_account_data(self, augmentcode_paths: List[Path]) -> Dict[str, Any]:
+    def discover_account_data(self, augmentcode_paths: List[Path],
+                              snapshot: Optional[DirectorySnapshot] = None) -> Dict[str, Any]:
         """Discover email addresses and account data in AugmentCode files."""
         discovery_results = {
             'email_addresses': set(),
@@ -35,83 +225,106 @@ class AccountDataCleaner:
             if not path.exists():
                 continue
                 
-            # Search configuration files
-            config_files = self._find_config_files(path)
-            for config_file in config_files:
-                account_data = self._extract_account_data_from_file(config_file)
+            # Search configuration files; extraction is I/O-bound, so fan the
+            # files out over threads and merge the results on this thread
+            config_files = self._find_config_files(path, snapshot)
+            file_paths = [file_path for file_path, _ in config_files]
+            file_sizes = [file_size for _, file_size in config_files]
+            with ThreadPoolExecutor(max_workers=_SCAN_WORKERS) as executor:
+                results = list(executor.map(self._extract_account_data_from_file,
+                                            file_paths, file_sizes))
+            
+            for config_file, account_data in zip(file_paths, results):
                 if account_data:
                     discovery_results['account_files'].append({
                         'file': config_file,
                         'data': account_data
                     })
-                    discovery_results['email_addresses'].update(account_data.get('emails', []))
-                    discovery_results['user_identifiers'].update(account_data.get('user_ids', []))
+                    discovery_results['email_addresses'].update(account_data['emails'])
+                    discovery_results['user_identifiers'].update(account_data['user_ids'])
         
-        # Convert sets to lists for JSON serialization
-        discovery_results['email_addresses'] = list(discovery_results['email_addresses'])
-        discovery_results['user_identifiers'] = list(discovery_results['user_identifiers'])
-        discovery_results['total_references'] = len(discovery_results['email_addresses']) + len(discovery_results['user_identifiers'])
+        # Materialize each set once as a sorted list for deterministic,
+        # JSON-serializable output and take the counts from those lists
+        emails = sorted(discovery_results['email_addresses'])
+        user_ids = sorted(discovery_results['user_identifiers'])
+        email_count = len(emails)
+        user_id_count = len(user_ids)
+        discovery_results.update(email_addresses=emails, user_identifiers=user_ids,
+                                 total_references=email_count + user_id_count)
         
-        self.logger.info(f"Account discovery complete: {len(discovery_results['email_addresses'])} emails, "
-                        f"{len(discovery_results['user_identifiers'])} user IDs found")
+        self.logger.info(f"Account discovery complete: {email_count} emails, "
+                        f"{user_id_count} user IDs found")
         
         return discovery_results
     
-    def _find_config_files(self, base_path: Path) -> List[Path]:
-        """Find configuration files that might contain account data."""
-        config_files = []
-        config_extensions = ['.json', '.ini', '.cfg', '.conf', '.xml', '.txt', '.log']
-        
-        try:
-            for file_path in base_path.rglob('*'):
-                if file_path.is_file() and file_path.suffix.lower() in config_extensions:
+    def _find_config_files(self, base_path: Path,
+                           snapshot: Optional[DirectorySnapshot] = None) -> List[Tuple[Path, int]]:
+        """Find configuration files that might contain account data, with their sizes."""
+        return list(self._iter_files(base_path, snapshot))
+    
+    def _iter_files(self, base_path: Path,
+                    snapshot: Optional[DirectorySnapshot] = None) -> Iterator[Tuple[Path, int]]:
+        """Walk base_path with os.scandir and yield candidate config files and sizes."""
+        scandir = snapshot.scandir if snapshot else FileSearcher.list_directory
+        stack = [str(base_path)]
+        while stack:
+            current_dir = stack.pop()
+            try:
+                for entry in scandir(current_dir):
+                    # DirEntry caches the type from the directory read, so
+                    # these checks don't cost an extra stat per entry
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        continue
+                    
+                    name_lower = entry.name.lower()
+                    dot = name_lower.rfind('.')
+                    if dot < 0 or name_lower[dot:] not in _CONFIG_EXTS:
+                        continue
                     # Skip obviously non-config files
-                    if any(skip in file_path.name.lower() for skip in ['temp', 'cache', 'backup']):
+                    if any(marker in name_lower for marker in _SKIP_MARKERS):
                         continue
-                    config_files.append(file_path)
-        except PermissionError:
-            self.logger.warning(f"Permission denied accessing {base_path}")
-        
-        return config_files
+                    if entry.is_file(follow_symlinks=False):
+                        try:
+                            file_size = entry.stat(follow_symlinks=False).st_size
+                        except OSError:
+                            continue
+                        yield Path(entry.path), file_size
+            except PermissionError:
+                self.logger.warning(f"Permission denied accessing {current_dir}")
+            except OSError as e:
+                self.logger.warning(f"Error scanning {current_dir}: {e}")
     
-    def _extract_account_data_from_file(self, file_path: Path) -> Dict[str, Any]:
+    def _extract_account_data_from_file(self, file_path: Path,
+                                        file_size: Optional[int] = None) -> Dict[str, Any]:
         """Extract email addresses and user identifiers from a file."""
         account_data = {
-            'emails': [],
-            'user_ids': [],
-            'usernames': []
+            'emails': set(),
+            'user_ids': set(),
+            'usernames': set()
         }
         
         try:
-            # Read file content
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            # Extract email addresses
-            email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-            emails = re.findall(email_pattern, content)
-            account_data['emails'] = list(set(emails))  # Remove duplicates
+            if file_size is None:
+                file_size = os.stat(file_path).st_size
             
-            # Extract potential usernames (alphanumeric strings that might be usernames)
-            username_patterns = [
-                r'"username":\s*"([^"]+)"',
-                r'"user":\s*"([^"]+)"',
-                r'"login":\s*"([^"]+)"',
-                r'"account":\s*"([^"]+)"',
-                r'username\s*[=:]\s*([^\s\n]+)',
-                r'user\s*[=:]\s*([^\s\n]+)',
-                r'login\s*[=:]\s*([^\s\n]+)'
-            ]
+            # Collect unique matches as bytes, then decode each one once
+            if file_size >= _STREAM_THRESHOLD:
+                raw_emails, raw_usernames = _scan_large_file(file_path)
+            else:
+                with _open_buffer(file_path) as buffer:
+                    raw_emails = set(_EMAIL_RE.findall(buffer))
+                    raw_usernames = {m.group(1) or m.group(2) for m in _USERNAMES_RE.finditer(buffer)}
             
-            for pattern in username_patterns:
-                matches = re.findall(pattern, content, re.IGNORECASE)
-                account_data['usernames'].extend(matches)
+            # Extract email addresses
+            account_data['emails'] = {email.decode('utf-8', 'ignore') for email in raw_emails}
             
-            # Remove duplicates and filter out obvious non-usernames
-            account_data['usernames'] = list(set([
-                username for username in account_data['usernames']
+            # Extract potential usernames, filtering out obvious non-usernames
+            usernames = (username.decode('utf-8', 'ignore') for username in raw_usernames)
+            account_data['usernames'] = {
+                username for username in usernames
                 if len(username) > 2 and not username.isdigit()
-            ]))
+            }
             
             # Combine usernames into user_ids
             account_data['user_ids'] = account_data['usernames']
@@ -151,53 +364,74 @@ class AccountDataCleaner:
             if not clean_success:
                 success = False
         
+        if not self.backup_manager.flush_manifest(backup_dir):
+            self.logger.error(f"Failed to record account file backups in {backup_dir}")
+            success = False
         return success
     
     def _clean_account_file(self, file_path: Path, account_data: Dict[str, Any], 
                            target_email: str, remove_all: bool) -> bool:
         """Clean account data from a specific file."""
+        pattern = self._build_removal_pattern(account_data, target_email, remove_all)
+        if pattern is None:
+            self.logger.info(f"No changes needed for {file_path}")
+            return True
+        
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            original_content = content
-            
-            if remove_all:
-                # Remove all found emails and usernames
-                for email in account_data.get('emails', []):
-                    content = content.replace(email, '[REMOVED]')
-                
-                for username in account_data.get('usernames', []):
-                    # Be careful not to replace common words
-                    if len(username) > 4:
-                        content = re.sub(rf'\b{re.escape(username)}\b', '[REMOVED]', content)
-            
-            elif target_email:
-                # Remove only the specific email
-                content = content.replace(target_email, '[REMOVED]')
-                
-                # Also remove any usernames that match the email prefix
-                email_prefix = target_email.split('@')[0]
-                if len(email_prefix) > 3:
-                    content = re.sub(rf'\b{re.escape(email_prefix)}\b', '[REMOVED]', content)
-            
-            # Write back if content changed
-            if content != original_content:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                
-                self.logger.info(f"Cleaned account data from {file_path}")
-                return True
-            else:
+            # Match against the raw (possibly memory-mapped) bytes; files that
+            # don't contain any target are never rewritten
+            with _open_buffer(file_path) as buffer:
+                content = _replace_targets(pattern, b'[REMOVED]', buffer)
+            if content is None:
                 self.logger.info(f"No changes needed for {file_path}")
                 return True
+            
+            # Write to a sibling temp file and swap it in, so a crash mid-write
+            # never leaves the original truncated
+            if not SafeFileOperations.safe_atomic_write(file_path, content):
+                return False
+            
+            self.logger.info(f"Cleaned account data from {file_path}")
+            return True
                 
         except Exception as e:
             self.logger.error(f"Error cleaning account file {file_path}: {e}")
             return False
     
+    def _build_removal_pattern(self, account_data: Dict[str, Any], target_email: str,
+                               remove_all: bool) -> Optional[Union[re.Pattern, _MultiTargetMatcher]]:
+        """Combine every removal target into one alternation for a single-pass substitution."""
+        emails: Iterable[str] = ()
+        usernames: Iterable[str] = ()
+        
+        if remove_all:
+            # Remove all found emails and usernames
+            emails = account_data.get('emails', [])
+            # Be careful not to replace common words
+            usernames = [username for username in account_data.get('usernames', []) if len(username) > 4]
+        
+        elif target_email:
+            # Remove only the specific email
+            emails = [target_email]
+            
+            # Also remove any usernames that match the email prefix
+            email_prefix = target_email.split('@')[0]
+            if len(email_prefix) > 3:
+                usernames = [email_prefix]
+        
+        # Longest first so a shorter target never wins over one that contains it;
+        # the sorted tuples also make the cache key independent of input order
+        return _compile_removal_pattern(
+            tuple(sorted(emails, key=lambda value: (-len(value), value))),
+            tuple(sorted(usernames, key=lambda value: (-len(value), value)))
+        )
+    
     def generate_account_report(self, discovery_results: Dict[str, Any]) -> str:
         """Generate a human-readable report of discovered account data."""
+        return "\n".join(self.generate_account_report_lines(discovery_results))
+    
+    def generate_account_report_lines(self, discovery_results: Dict[str, Any]) -> List[str]:
+        """Return the account report as separate lines."""
         report_lines = []
         
         report_lines.append("=== ACCOUNT DATA DISCOVERY REPORT ===")
@@ -243,4 +477,4 @@ class AccountDataCleaner:
                     report_lines.append(f"    User IDs: {len(data['user_ids'])}")
                 report_lines.append("")
         
-        return "\n".join(report_lines)
+        return report_lines
@@ -5,15 +5,47 @@ Handles backup and restore operations for AugmentCode data.
 
 import os
 import shutil
+import stat
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, suppress
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator, Tuple
 import json
 
 from utils import SafeFileOperations, OSDetector
 
 
+# The platform can't change while the process runs, so detect it once
+_IS_WINDOWS = OSDetector.is_windows()
+
+# Upper bound on concurrent subtree copies, to keep open file handles bounded
+_COPY_WORKERS = 8
+
+# Manifest file names: one JSON object per line, and the older single-document form
+_MANIFEST_NAME = 'backup_manifest.jsonl'
+_LEGACY_MANIFEST_NAME = 'backup_manifest.json'
+
+# Concurrent manifest reads when listing backups
+_MANIFEST_WORKERS = 8
+
+# Largest chunk handed to a single os.copy_file_range call
+_COPY_CHUNK_SIZE = 1 << 30
+
+# Reparse tag of a Windows directory junction (stat.IO_REPARSE_TAG_MOUNT_POINT)
+_IO_REPARSE_TAG_MOUNT_POINT = 0xA0000003
+
+
+def _is_junction(path_stat: os.stat_result) -> bool:
+    """Return True for a Windows directory junction, which lstat reports as a directory."""
+    if not getattr(path_stat, 'st_file_attributes', 0) & stat.FILE_ATTRIBUTE_REPARSE_POINT:
+        return False
+    # st_reparse_tag is new in Python 3.8; before that treat any reparse point as a link
+    return getattr(path_stat, 'st_reparse_tag', _IO_REPARSE_TAG_MOUNT_POINT) == _IO_REPARSE_TAG_MOUNT_POINT
+
+
 class BackupManager:
     """Manages backup and restore operations for AugmentCode data."""
     
@@ -25,7 +57,7 @@ class BackupManager:
             self.backup_root = backup_root
         else:
             # Default backup location
-            if OSDetector.is_windows():
+            if _IS_WINDOWS:
                 documents = Path.home() / 'Documents'
             else:
                 documents = Path.home()
@@ -34,6 +66,16 @@ class BackupManager:
         
         self.backup_root.mkdir(parents=True, exist_ok=True)
         self.logger.info(f"Backup root directory: {self.backup_root}")
+        
+        # Manifests of backups in progress, and the items not yet appended to
+        # their manifest files by flush_manifest()
+        self._manifests: Dict[Path, Dict[str, Any]] = {}
+        self._pending_items: Dict[Path, List[Dict[str, Any]]] = {}
+        # Cleanup jobs back up files from several threads at once
+        self._manifest_lock = threading.Lock()
+        # Backup directory -> (manifest file stamp, list_backups summary), so
+        # refreshing the list only re-reads manifests that changed
+        self._summary_cache: Dict[Path, Tuple[Tuple[str, int, int], Dict[str, Any]]] = {}
     
     def create_timestamped_backup_dir(self) -> Path:
         """Create a new timestamped backup directory."""
@@ -48,16 +90,35 @@ class BackupManager:
             'items': []
         }
         
-        manifest_path = backup_dir / 'backup_manifest.json'
-        SafeFileOperations.safe_write_json(manifest_path, manifest)
+        self._manifests[backup_dir] = manifest
+        self._write_manifest(backup_dir, manifest)
         
         self.logger.info(f"Created backup directory: {backup_dir}")
         return backup_dir
     
+    @contextmanager
+    def session(self) -> Iterator[Path]:
+        """Create a timestamped backup directory and flush its manifest on exit."""
+        backup_dir = self.create_timestamped_backup_dir()
+        try:
+            yield backup_dir
+        finally:
+            if self.flush_manifest(backup_dir):
+                # The manifest is complete on disk; without the in-memory copy
+                # list_backups treats the backup as finished and can cache it
+                with self._manifest_lock:
+                    if backup_dir not in self._pending_items:
+                        self._manifests.pop(backup_dir, None)
+            else:
+                self.logger.error(f"Backup manifest for {backup_dir} is incomplete; "
+                                  f"some backed-up items can't be restored")
+    
     def backup_file(self, source_file: Path, backup_dir: Path, 
                    relative_path: Optional[str] = None) -> bool:
         """Backup a single file to the backup directory."""
-        if not source_file.exists():
+        try:
+            source_size = source_file.stat().st_size
+        except OSError:
             self.logger.error(f"Source file does not exist: {source_file}")
             return False
         
@@ -69,7 +130,7 @@ class BackupManager:
         dest_file.parent.mkdir(parents=True, exist_ok=True)
         
         try:
-            shutil.copy2(source_file, dest_file)
+            self._fast_copy(source_file, dest_file)
             self.logger.info(f"Backed up file: {source_file} -> {dest_file}")
             
             # Update manifest
@@ -77,7 +138,7 @@ class BackupManager:
                 'type': 'file',
                 'source': str(source_file),
                 'destination': str(dest_file),
-                'size': source_file.stat().st_size
+                'size': source_size
             })
             
             return True
@@ -98,12 +159,9 @@ class BackupManager:
             dest_dir = backup_dir / 'directories' / source_dir.name
         
         try:
-            shutil.copytree(source_dir, dest_dir, dirs_exist_ok=True)
+            total_size = self._copy_directory(source_dir, dest_dir)
             self.logger.info(f"Backed up directory: {source_dir} -> {dest_dir}")
             
-            # Calculate directory size
-            total_size = sum(f.stat().st_size for f in source_dir.rglob('*') if f.is_file())
-            
             # Update manifest
             self._update_manifest(backup_dir, {
                 'type': 'directory',
@@ -117,10 +175,120 @@ class BackupManager:
             self.logger.error(f"Failed to backup directory {source_dir}: {e}")
             return False
     
+    def _copy_directory(self, source_dir: Path, dest_dir: Path) -> int:
+        """Copy a directory tree, one worker per top-level subdirectory.
+        
+        Returns the total size of the copied files.
+        """
+        dest_dir.mkdir(parents=True, exist_ok=True)
+        
+        def copy_subtree(sub_path: str, sub_dest: Path) -> int:
+            shutil.copytree(sub_path, sub_dest, copy_function=self._fast_copy,
+                            dirs_exist_ok=True)
+            return self._dir_size(Path(sub_path))
+        
+        total_size = 0
+        with ThreadPoolExecutor(max_workers=_COPY_WORKERS) as executor:
+            futures = []
+            with os.scandir(source_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        futures.append(executor.submit(
+                            copy_subtree, entry.path, dest_dir / entry.name
+                        ))
+                    else:
+                        self._fast_copy(entry.path, dest_dir / entry.name)
+                        total_size += entry.stat().st_size
+            
+            for future in futures:
+                total_size += future.result()
+        
+        shutil.copystat(source_dir, dest_dir)
+        return total_size
+    
+    @staticmethod
+    def _fast_copy(src: Path, dst: Path) -> Path:
+        """Copy a file and its metadata like shutil.copy2, in-kernel where supported."""
+        # Only regular files: opening a FIFO would block, where copy2 raises
+        # SpecialFileError, and device files have no meaningful size to check
+        if hasattr(os, 'copy_file_range') and stat.S_ISREG(os.stat(src).st_mode):
+            try:
+                with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                    src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+                    expected = os.fstat(src_fd).st_size
+                    copied = 0
+                    while True:
+                        count = os.copy_file_range(src_fd, dst_fd, _COPY_CHUNK_SIZE)
+                        if count <= 0:
+                            break
+                        copied += count
+                # Some filesystems (FUSE, overlays, older kernels across
+                # devices) report end of file early; a short copy must not
+                # pass for a backup, so redo it the portable way
+                if copied >= expected:
+                    shutil.copystat(src, dst)
+                    return dst
+            except OSError:
+                # Unsupported by the kernel or filesystem (e.g. EXDEV, ENOSYS)
+                pass
+        
+        # shutil.copy2 already uses fcopyfile on macOS and CopyFile2 on Windows
+        return shutil.copy2(src, dst)
+    
+    @staticmethod
+    def _dir_size(directory: Path) -> int:
+        """Sum file sizes under a directory using cached os.scandir entries."""
+        total_size = 0
+        stack = [directory]
+        
+        while stack:
+            current_dir = stack.pop()
+            try:
+                entries = os.scandir(current_dir)
+            except OSError:
+                continue
+            
+            with entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            total_size += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        
+        return total_size
+    
+    @staticmethod
+    def _remove_tree(root: Path) -> None:
+        """Delete a directory tree using cached os.scandir entry types."""
+        if os.path.islink(root) or (_IS_WINDOWS and _is_junction(os.lstat(root))):
+            raise OSError(f"Refusing to delete symbolic link {root}")
+        
+        # Unlink files on the way down, then remove directories deepest first
+        stack = [os.fspath(root)]
+        directories = []
+        while stack:
+            current_dir = stack.pop()
+            directories.append(current_dir)
+            with os.scandir(current_dir) as entries:
+                for entry in entries:
+                    if not entry.is_dir(follow_symlinks=False):
+                        os.unlink(entry.path)
+                    elif _IS_WINDOWS and _is_junction(entry.stat(follow_symlinks=False)):
+                        # Remove the junction itself, never what it points to
+                        os.rmdir(entry.path)
+                    else:
+                        stack.append(entry.path)
+        
+        for directory in reversed(directories):
+            os.rmdir(directory)
+    
     def backup_registry_key(self, backup_dir: Path, key_path: str, 
                            key_data: Dict[str, Any]) -> bool:
         """Backup Windows registry key data (stored as JSON)."""
-        if not OSDetector.is_windows():
+        if not _IS_WINDOWS:
             self.logger.warning("Registry backup requested on non-Windows system")
             return False
         
@@ -152,13 +320,132 @@ class BackupManager:
             return False
     
     def _update_manifest(self, backup_dir: Path, item_info: Dict[str, Any]) -> None:
-        """Update the backup manifest with new item information."""
-        manifest_path = backup_dir / 'backup_manifest.json'
+        """Record a backed-up item in the in-memory manifest for backup_dir."""
+        with self._manifest_lock:
+            manifest = self._manifests.get(backup_dir)
+            if manifest is None:
+                # Backup directory created elsewhere; pick up its manifest once
+                manifest = self._read_manifest(backup_dir)
+                if not manifest:
+                    return
+                self._manifests[backup_dir] = manifest
+            
+            manifest['items'].append(item_info)
+            self._pending_items.setdefault(backup_dir, []).append(item_info)
+    
+    def flush_manifest(self, backup_dir: Path) -> bool:
+        """Append the items recorded since the last flush to the manifest file."""
+        with self._manifest_lock:
+            pending = self._pending_items.pop(backup_dir, None)
+        if not pending:
+            return True
+        
+        manifest_path = backup_dir / _MANIFEST_NAME
+        if not manifest_path.exists():
+            # Upgrading a legacy manifest: write header and every item
+            written = self._write_manifest(backup_dir, self._manifests[backup_dir])
+        else:
+            written = self._append_manifest_items(manifest_path, pending)
+        
+        if not written:
+            # Keep the items for the next flush, ahead of any recorded meanwhile
+            with self._manifest_lock:
+                self._pending_items[backup_dir] = pending + self._pending_items.get(backup_dir, [])
+        return written
+    
+    def _append_manifest_items(self, manifest_path: Path, items: List[Dict[str, Any]]) -> bool:
+        """Append item lines to a manifest file, leaving it unchanged if that fails."""
+        try:
+            with open(manifest_path, 'a', encoding='utf-8') as f:
+                start = f.tell()
+                try:
+                    f.write(''.join(json.dumps(item, ensure_ascii=False) + '\n' for item in items))
+                    f.flush()
+                except OSError:
+                    # A torn last line would make the whole manifest unreadable
+                    with suppress(OSError):
+                        f.truncate(start)
+                    raise
+            return True
+        except OSError as e:
+            self.logger.error(f"Failed to update manifest {manifest_path}: {e}")
+            return False
+    
+    def _write_manifest(self, backup_dir: Path, manifest: Dict[str, Any]) -> bool:
+        """Write a complete manifest file: a header line followed by one line per item."""
+        manifest_path = backup_dir / _MANIFEST_NAME
+        header = {'__header__': True}
+        header.update((key, value) for key, value in manifest.items() if key != 'items')
+        
+        try:
+            with open(manifest_path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(header, ensure_ascii=False) + '\n')
+                for item in manifest.get('items', []):
+                    f.write(json.dumps(item, ensure_ascii=False) + '\n')
+            return True
+        except OSError as e:
+            self.logger.error(f"Failed to write manifest {manifest_path}: {e}")
+            # Without a partial file the next flush rewrites the whole manifest
+            with suppress(OSError):
+                manifest_path.unlink()
+            return False
+    
+    def _read_manifest(self, backup_dir: Path) -> Optional[Dict[str, Any]]:
+        """Read a manifest from disk, falling back to the legacy JSON document."""
+        manifest_path = backup_dir / _MANIFEST_NAME
+        if not manifest_path.exists():
+            legacy_path = backup_dir / _LEGACY_MANIFEST_NAME
+            if legacy_path.exists():
+                return SafeFileOperations.safe_read_json(legacy_path)
+            return None
+        
+        manifest: Dict[str, Any] = {'items': []}
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if entry.pop('__header__', False):
+                        manifest.update(entry)
+                    else:
+                        manifest['items'].append(entry)
+        except (json.JSONDecodeError, OSError) as e:
+            self.logger.error(f"Failed to read manifest {manifest_path}: {e}")
+            return None
         
-        manifest = SafeFileOperations.safe_read_json(manifest_path)
+        return manifest
+    
+    def _load_manifest(self, backup_dir: Path) -> Optional[Dict[str, Any]]:
+        """Get a backup's manifest, preferring any unflushed in-memory copy."""
+        manifest = self._manifests.get(backup_dir)
+        if manifest is not None:
+            return manifest
+        return self._read_manifest(backup_dir)
+    
+    @staticmethod
+    def _manifest_stamp(backup_dir: Path) -> Optional[Tuple[str, int, int]]:
+        """Identify the current contents of a backup's manifest file, if it has one."""
+        for name in (_MANIFEST_NAME, _LEGACY_MANIFEST_NAME):
+            try:
+                file_stat = (backup_dir / name).stat()
+            except OSError:
+                continue
+            return name, file_stat.st_mtime_ns, file_stat.st_size
+        return None
+    
+    @staticmethod
+    def _summarize_manifest(manifest: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Reduce a manifest to the fields list_backups reports."""
         if manifest:
-            manifest['items'].append(item_info)
-            SafeFileOperations.safe_write_json(manifest_path, manifest)
+            items = manifest.get('items', [])
+            return {
+                'timestamp': manifest.get('timestamp'),
+                'items_count': len(items),
+                'total_size': sum(item.get('size', 0) for item in items)
+            }
+        # Still list backups without a readable manifest so they can be deleted
+        return {'timestamp': None, 'items_count': 0, 'total_size': 0}
     
     def list_backups(self) -> List[Dict[str, Any]]:
         """List all available backups with their information."""
@@ -167,44 +454,50 @@ class BackupManager:
         if not self.backup_root.exists():
             return backups
         
-        for backup_dir in self.backup_root.iterdir():
-            if backup_dir.is_dir() and backup_dir.name.startswith('Backup_'):
-                manifest_path = backup_dir / 'backup_manifest.json'
-                
-                backup_info = {
-                    'name': backup_dir.name,
-                    'path': backup_dir,
-                    'timestamp': None,
-                    'items_count': 0,
-                    'total_size': 0
-                }
-                
-                if manifest_path.exists():
-                    manifest = SafeFileOperations.safe_read_json(manifest_path)
-                    if manifest:
-                        backup_info['timestamp'] = manifest.get('timestamp')
-                        backup_info['items_count'] = len(manifest.get('items', []))
-                        backup_info['total_size'] = sum(
-                            item.get('size', 0) for item in manifest.get('items', [])
-                        )
-                
-                backups.append(backup_info)
+        # Directory names are Backup_YYYYMMDD_HHMMSS, so sorting by name orders
+        # newest first without reading any manifest
+        with os.scandir(self.backup_root) as entries:
+            backup_dirs = [
+                Path(entry.path) for entry in sorted(
+                    (entry for entry in entries
+                     if entry.name.startswith('Backup_') and entry.is_dir(follow_symlinks=False)),
+                    key=lambda entry: entry.name, reverse=True
+                )
+            ]
+        
+        # Summaries of manifests unchanged since the last listing are reused;
+        # in-progress backups have no stamp and are always summarized afresh
+        stamps = [None if backup_dir in self._manifests else self._manifest_stamp(backup_dir)
+                  for backup_dir in backup_dirs]
+        summaries: List[Optional[Dict[str, Any]]] = [None] * len(backup_dirs)
+        to_load = []
+        for i, (backup_dir, stamp) in enumerate(zip(backup_dirs, stamps)):
+            cached = self._summary_cache.get(backup_dir)
+            if stamp is not None and cached is not None and cached[0] == stamp:
+                summaries[i] = cached[1]
+            else:
+                to_load.append(i)
+        
+        if to_load:
+            # Manifest reads are independent blocking I/O, so overlap them
+            with ThreadPoolExecutor(max_workers=_MANIFEST_WORKERS) as executor:
+                manifests = list(executor.map(self._load_manifest, (backup_dirs[i] for i in to_load)))
+            
+            for i, manifest in zip(to_load, manifests):
+                summaries[i] = self._summarize_manifest(manifest)
+                if stamps[i] is not None:
+                    self._summary_cache[backup_dirs[i]] = (stamps[i], summaries[i])
+        
+        for backup_dir, summary in zip(backup_dirs, summaries):
+            backups.append({'name': backup_dir.name, 'path': backup_dir, **summary})
         
-        # Sort by timestamp (newest first)
-        backups.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
         return backups
     
     def restore_from_backup(self, backup_dir: Path) -> bool:
         """Restore data from a backup directory."""
-        manifest_path = backup_dir / 'backup_manifest.json'
-        
-        if not manifest_path.exists():
-            self.logger.error(f"No manifest found in backup directory: {backup_dir}")
-            return False
-        
-        manifest = SafeFileOperations.safe_read_json(manifest_path)
+        manifest = self._load_manifest(backup_dir)
         if not manifest:
-            self.logger.error(f"Failed to read manifest from: {manifest_path}")
+            self.logger.error(f"No readable manifest found in backup directory: {backup_dir}")
             return False
         
         success_count = 0
@@ -250,7 +543,10 @@ class BackupManager:
     def delete_backup(self, backup_dir: Path) -> bool:
         """Delete a backup directory."""
         try:
-            shutil.rmtree(backup_dir)
+            self._remove_tree(backup_dir)
+            self._manifests.pop(backup_dir, None)
+            self._pending_items.pop(backup_dir, None)
+            self._summary_cache.pop(backup_dir, None)
             self.logger.info(f"Deleted backup: {backup_dir}")
             return True
         except Exception as e:
@@ -7,16 +7,18 @@ Creates a standalone executable using PyInstaller.
 import sys
 import subprocess
 import shutil
+from importlib.metadata import version, PackageNotFoundError
 from pathlib import Path
 
 
 def check_pyinstaller():
     """Check if PyInstaller is installed."""
     try:
-        import PyInstaller
-        print(f"✓ PyInstaller found: {PyInstaller.__version__}")
+        # Reads only the dist-info metadata instead of importing PyInstaller
+        pyinstaller_version = version("pyinstaller")
+        print(f"✓ PyInstaller found: {pyinstaller_version}")
         return True
-    except ImportError:
+    except PackageNotFoundError:
         print("✗ PyInstaller not found. Installing...")
         try:
             subprocess.check_call([sys.executable, "-m", "pip", "install", "pyinstaller"])
@@ -33,7 +35,7 @@ def build_executable():
     
     # PyInstaller command
     cmd = [
-        "pyinstaller",
+        sys.executable, "-m", "PyInstaller",
         "--onefile",           # Create a single executable file
         "--windowed",          # Hide console window (GUI app)
         "--name", "FreeAugmentCodeCleaner",  # Executable name
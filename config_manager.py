@@ -4,277 +4,713 @@ Handles reading and writing various configuration file formats.
 """
 
 import logging
+import multiprocessing
+import os
 import configparser
 import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Tuple, Iterator, Iterable
 import json
 import re
 
 from utils import SafeFileOperations
 
+try:
+    from lxml import etree as _xml_parser
+except ImportError:
+    _xml_parser = ET  # Searches stream through the standard library parser instead
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None  # Optional; key classification falls back to the fused regex
+
+
+# Search results kept per (search, file, mtime, size) on each ConfigManager
+_SEARCH_CACHE_SIZE = 256
+
+# Parsing and matching hold the GIL, so batches of uncached files this large
+# in total are searched in worker processes; smaller ones finish serially in
+# less time than it takes to start the workers
+_PROCESS_POOL_MIN_BYTES = 32 * 1024 * 1024
+_SEARCH_WORKERS = os.cpu_count() or 1
+
+# Only these suffixes are ever parsed; anything else (images, binaries, ...)
+# is skipped without being opened
+_SEARCHABLE_SUFFIXES = {'.json', '.ini', '.cfg', '.conf', '.config', '.xml',
+                        '.txt', '.log', '.yaml', '.yml', ''}
+
+# Files larger than this are not configuration files worth parsing
+_MAX_SEARCH_BYTES = 32 * 1024 * 1024
+
+# Parsed JSON kept for the second search pass over the same files; a scan
+# visits every file before the next pass starts, so this must cover a whole
+# batch, and only files up to _JSON_CACHE_MAX_BYTES are held to bound memory
+_JSON_CACHE_SIZE = 128
+_JSON_CACHE_MAX_BYTES = 1024 * 1024
+
+# Common patterns for telemetry IDs
+_ID_PATTERNS = [
+    r'device[_-]?id',
+    r'machine[_-]?id',
+    r'telemetry[_-]?id',
+    r'client[_-]?id',
+    r'unique[_-]?id',
+    r'installation[_-]?id',
+    r'session[_-]?id',
+    r'user[_-]?id',
+    r'guid',
+    r'uuid'
+]
+
+# Account-related patterns
+_ACCOUNT_PATTERNS = [
+    r'email',
+    r'username',
+    r'user[_-]?name',
+    r'login',
+    r'account',
+    r'profile',
+    r'identity'
+]
+
+# Email pattern
+_EMAIL_PATTERN = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+
+
+class IdHit:
+    """A telemetry ID found in a configuration file."""
+
+    # Fields a format does not use stay None and are left out of to_dict();
+    # only 'value' may legitimately be None (JSON null, empty XML element)
+    __slots__ = ('file', 'format', 'key_path', 'section', 'element_path', 'element_index',
+                 'line_number', 'key', 'tag', 'attribute', 'value', 'pattern_matched', 'type',
+                 'full_line')
+
+    def __init__(self, file: Path, format: str, value: Any, pattern_matched: str,
+                 key_path: Optional[str] = None, section: Optional[str] = None,
+                 element_path: Optional[str] = None, element_index: Optional[Tuple[int, ...]] = None,
+                 line_number: Optional[int] = None,
+                 key: Optional[str] = None, tag: Optional[str] = None,
+                 attribute: Optional[str] = None, type: Optional[str] = None,
+                 full_line: Optional[str] = None):
+        self.file = file
+        self.format = format
+        self.key_path = key_path
+        self.section = section
+        self.element_path = element_path
+        self.element_index = element_index
+        self.line_number = line_number
+        self.key = key
+        self.tag = tag
+        self.attribute = attribute
+        self.value = value
+        self.pattern_matched = pattern_matched
+        self.type = type
+        self.full_line = full_line
+
+    def _fields(self) -> Iterator[str]:
+        """Yield the names of the fields set for this hit's format."""
+        for cls in reversed(type(self).__mro__):
+            for name in cls.__dict__.get('__slots__', ()):
+                if name == 'value' or getattr(self, name) is not None:
+                    yield name
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the hit as a plain dict, e.g. for JSON serialization."""
+        return {name: getattr(self, name) for name in self._fields()}
+
+    # Read-only mapping access for callers written against the old dict records
+    def __getitem__(self, name: str) -> Any:
+        if name in self._fields():
+            return getattr(self, name)
+        raise KeyError(name)
+
+    def __contains__(self, name: Any) -> bool:
+        return name in self._fields()
+
+    def __iter__(self) -> Iterator[str]:
+        return self._fields()
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Return a field like dict.get, or default if this hit's format has none."""
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    # Equal by (mutable) contents like the dicts they replace, so unhashable too
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class AccountHit(IdHit):
+    """Account data, an account field or an email address, found in a configuration file."""
+
+    __slots__ = ('data_type',)
+
+    def __init__(self, file: Path, format: str, value: Any, pattern_matched: str,
+                 data_type: str, **fields: Any):
+        super().__init__(file, format, value, pattern_matched, **fields)
+        self.data_type = data_type
+
+
+@lru_cache(maxsize=_JSON_CACHE_SIZE)
+def _read_json_cached(path: str, mtime_ns: int, size: int) -> Any:
+    """Parse a JSON file once per (path, mtime, size) so both searches share it."""
+    return SafeFileOperations.safe_read_json(Path(path))
+
+
+def _search_one_file(path: str, kind: str) -> Optional[List[IdHit]]:
+    """Worker process entry point: search one file, or return None if that fails."""
+    return ConfigManager()._search_file(kind, Path(path))
+
+
+def _walk_json(data: Any) -> Iterator[Tuple[str, Any, str]]:
+    """Yield (key, value, key_path) for every dict entry in document order."""
+    # Entries with key None are list items: walked into but not reported
+    stack = [(None, data, "")]
+    while stack:
+        key, value, path = stack.pop()
+        if key is not None:
+            yield key, value, path
+        
+        if isinstance(value, dict):
+            stack.extend((child_key, child_value, f"{path}.{child_key}" if path else child_key)
+                         for child_key, child_value in reversed(value.items()))
+        elif isinstance(value, list):
+            stack.extend((None, value[i], f"{path}[{i}]") for i in reversed(range(len(value))))
+
+
+def _scan_ini(file_path: Path) -> Iterator[Tuple[str, str, str]]:
+    """Yield (section, key, value) from an INI file in a single linear pass.
+    
+    Search-only stand-in for configparser: follows its layout rules (comment
+    lines, [section] headers, the first '=' or ':' as delimiter, lowercased
+    keys, indented continuation lines, blank lines inside values) but does no
+    validation or interpolation, and reports DEFAULT entries once under DEFAULT.
+    """
+    section = None
+    pending = None  # [section, key, value_lines, indent] of the last option
+    
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            stripped = line.strip()
+            if not stripped:
+                # Blank lines belong to a value if a continuation line follows
+                if pending is not None:
+                    pending[2].append('')
+                continue
+            if stripped[0] in '#;':
+                continue
+            
+            indent = len(line) - len(line.lstrip())
+            if pending is not None and indent > pending[3]:
+                pending[2].append(stripped)
+                continue
+            
+            if pending is not None:
+                yield pending[0], pending[1], '\n'.join(pending[2]).rstrip()
+                pending = None
+            
+            # Like configparser, the header runs to the last ']' on the line
+            header_end = stripped.rfind(']')
+            if stripped[0] == '[' and header_end > 1:
+                section = stripped[1:header_end]
+                continue
+            if section is None:
+                continue
+            
+            delimiters = [index for index in (stripped.find('='), stripped.find(':')) if index > 0]
+            if delimiters:
+                delimiter = min(delimiters)
+                key = stripped[:delimiter].rstrip().lower()
+                value = stripped[delimiter + 1:].strip()
+                pending = [section, key, [value], indent]
+    
+    if pending is not None:
+        yield pending[0], pending[1], '\n'.join(pending[2]).rstrip()
+
+
+def _iter_xml(file_path: Path) -> Iterator[Tuple[int, Any, str, Tuple[int, ...]]]:
+    """Stream (document_order, element, element_path, element_index) for each element of an XML file.
+    
+    Elements are yielded once they are complete, so their text is available,
+    then cleared and detached, keeping memory proportional to nesting depth.
+    document_order is the position of the start tag, for restoring pre-order;
+    element_index is the child index at each level below the root.
+    """
+    open_elements = []  # [order, path, element, index, children seen so far]
+    order = 0
+    for event, element in _xml_parser.iterparse(str(file_path), events=('start', 'end')):
+        if event == 'start':
+            if open_elements:
+                parent = open_elements[-1]
+                path = f"{parent[1]}/{element.tag}"
+                index = parent[3] + (parent[4],)
+                parent[4] += 1
+            else:
+                path = element.tag
+                index = ()
+            open_elements.append([order, path, element, index, 0])
+            order += 1
+            continue
+        
+        element_order, path, _, index, _ = open_elements.pop()
+        yield element_order, element, path, index
+        
+        element.clear()
+        if open_elements:
+            # Earlier siblings are already detached, so this removal is cheap
+            open_elements[-1][2].remove(element)
+
+
+def _expand_literals(pattern: str) -> Optional[List[str]]:
+    """Expand a key pattern into the literal strings it matches, if it is that simple."""
+    parts = pattern.split('[_-]?')
+    if any(re.escape(part) != part for part in parts):
+        return None
+    
+    literals = ['']
+    for index, part in enumerate(parts):
+        separators = ('', '_', '-') if index else ('',)
+        literals = [literal + separator + part for literal in literals for separator in separators]
+    return literals
+
+
+class _PatternClassifier:
+    """Find which of several patterns a key contains with a single scan."""
+    
+    def __init__(self, patterns: List[str]):
+        self.patterns = list(patterns)
+        # One anchored lookahead per pattern: alternation tries them in list
+        # order, so the group that matched is the first pattern the key contains
+        self._regex = re.compile(
+            '|'.join(rf'(?=.*?({pattern}))' for pattern in self.patterns),
+            re.IGNORECASE | re.DOTALL
+        )
+        self._automaton = self._build_automaton() if ahocorasick is not None else None
+        
+        # Keys that are exactly one literal form (e.g. 'device_id') are the
+        # common hit; resolve them with one dict lookup on the lowercased key
+        self._literal_patterns = {}
+        for pattern in self.patterns:
+            for literal in _expand_literals(pattern) or ():
+                match = self._regex.match(literal)
+                self._literal_patterns.setdefault(literal, self.patterns[match.lastindex - 1])
+    
+    def _build_automaton(self) -> Optional[Any]:
+        """Index every literal form of every pattern, or None if one isn't literal."""
+        automaton = ahocorasick.Automaton()
+        for index, pattern in enumerate(self.patterns):
+            literals = _expand_literals(pattern)
+            if literals is None:
+                return None
+            for literal in literals:
+                # Keep the earliest pattern when two expand to the same literal
+                if not automaton.exists(literal):
+                    automaton.add_word(literal, index)
+        automaton.make_automaton()
+        return automaton
+    
+    def classify(self, text: str) -> Optional[str]:
+        """Return the first pattern found anywhere in text, or None."""
+        lowered = text.lower()
+        pattern = self._literal_patterns.get(lowered)
+        if pattern is not None:
+            return pattern
+        
+        # Lowercasing only matches re.IGNORECASE exactly for ASCII text
+        if self._automaton is not None and text.isascii():
+            first_index = min((index for _, index in self._automaton.iter(lowered)), default=None)
+            return self.patterns[first_index] if first_index is not None else None
+        
+        match = self._regex.match(text)
+        return self.patterns[match.lastindex - 1] if match else None
+    
+    def classify_many(self, texts: Iterable[str]) -> List[Optional[str]]:
+        """Classify a batch of keys, scanning each distinct key only once."""
+        # Keys repeat heavily across the objects of a JSON array
+        seen: Dict[str, Optional[str]] = {}
+        results = []
+        for text in texts:
+            if text not in seen:
+                seen[text] = self.classify(text)
+            results.append(seen[text])
+        return results
+
+
+# Compiled once at import instead of inside the per-key and per-line loops
+_ID_CLASSIFIER = _PatternClassifier(_ID_PATTERNS)
+_ACCOUNT_CLASSIFIER = _PatternClassifier(_ACCOUNT_PATTERNS)
+_EMAIL_RE = re.compile(_EMAIL_PATTERN)
+
+# Key=value or key:value pairs in plain text files; each entry keeps its
+# source string for the reported 'pattern_matched'. The separator whitespace
+# excludes newlines so a match never spans lines when scanning a whole file.
+_ID_KV_REGEXES = [(re.compile(rf'({pattern})[^\S\n]*[=:][^\S\n]*([^\s\n]+)', re.IGNORECASE), pattern)
+                  for pattern in _ID_PATTERNS]
+_ACCOUNT_KV_REGEXES = [(re.compile(rf'({pattern})[^\S\n]*[=:][^\S\n]*([^\s\n]+)', re.IGNORECASE), pattern)
+                       for pattern in _ACCOUNT_PATTERNS]
+
+
+def _scan_text(content: str, patterns: List[Tuple[re.Pattern, str]],
+               email_re: Optional[re.Pattern] = None) -> Iterator[Tuple[int, str, Optional[str], re.Match]]:
+    """Yield (line_number, full_line, pattern, match) from whole-text regex scans.
+    
+    Output matches a line-by-line search: per line, every email first (pattern
+    None), then the first match of each key=value pattern in list order.
+    """
+    found = []
+    if email_re is not None:
+        found.extend((match.start(), 0, None, match) for match in email_re.finditer(content))
+    for rank, (regex, pattern) in enumerate(patterns, 1):
+        found.extend((match.start(), rank, pattern, match) for match in regex.finditer(content))
+    found.sort(key=lambda item: item[0])
+    
+    # Count newlines only between consecutive matches, never line by line
+    ordered = []
+    first_per_line = set()
+    line_number = 1
+    position = 0
+    for start, rank, pattern, match in found:
+        line_number += content.count('\n', position, start)
+        position = start
+        if rank:
+            if (rank, line_number) in first_per_line:
+                continue
+            first_per_line.add((rank, line_number))
+        ordered.append((line_number, rank, start, pattern, match))
+    ordered.sort(key=lambda item: item[:3])
+    
+    # Hits on the same line share one stripped copy of it
+    full_line_number = None
+    full_line = ""
+    for line_number, _, start, pattern, match in ordered:
+        if line_number != full_line_number:
+            line_start = content.rfind('\n', 0, start) + 1
+            line_end = content.find('\n', start)
+            if line_end < 0:
+                line_end = len(content)
+            full_line_number = line_number
+            full_line = content[line_start:line_end].strip()
+        yield line_number, full_line, pattern, match
+
 
 class ConfigManager:
     """Manages configuration files in various formats (JSON, INI, XML)."""
     
-    def __init__(self):
+    def __init__(self, max_size: int = _MAX_SEARCH_BYTES):
         self.logger = logging.getLogger('FreeAugmentCode.ConfigManager')
+        self.max_size = max_size
+        self._search_cache: OrderedDict = OrderedDict()
     
-    def search_for_telemetry_ids(self, config_files: List[Path]) -> List[Dict[str, Any]]:
-        """Search for telemetry IDs in configuration files."""
-        found_ids = []
-
-        # Common patterns for telemetry IDs
-        id_patterns = [
-            r'device[_-]?id',
-            r'machine[_-]?id',
-            r'telemetry[_-]?id',
-            r'client[_-]?id',
-            r'unique[_-]?id',
-            r'installation[_-]?id',
-            r'session[_-]?id',
-            r'user[_-]?id',
-            r'guid',
-            r'uuid'
-        ]
+    def invalidate(self, file_path: Optional[Path] = None) -> None:
+        """Drop cached parses and search results, for one file or for all."""
+        _read_json_cached.cache_clear()
+        if file_path is None:
+            self._search_cache.clear()
+            return
+        for cache_key in [key for key in self._search_cache if key[1] == str(file_path)]:
+            del self._search_cache[cache_key]
+    
+    def _search_cache_key(self, kind: str, config_file: Path) -> Optional[Tuple[str, str, int, int]]:
+        """Key cached results by file identity and version, or None if it can't be stat'ed."""
+        try:
+            stat = config_file.stat()
+        except OSError:
+            return None
+        return (kind, str(config_file), stat.st_mtime_ns, stat.st_size)
+    
+    def _should_search(self, config_file: Path, kind: str) -> Tuple[bool, Optional[Tuple[str, str, int, int]]]:
+        """Cheaply decide whether a file is worth parsing, returning its cache key too."""
+        if config_file.suffix.lower() not in _SEARCHABLE_SUFFIXES:
+            self.logger.debug(f"Skipping {config_file}: not a configuration file type")
+            return False, None
         
+        cache_key = self._search_cache_key(kind, config_file)
+        # Files that can't be stat'ed are still searched so the failure is logged
+        if cache_key is not None and not 0 < cache_key[3] <= self.max_size:
+            self.logger.debug(f"Skipping {config_file}: {cache_key[3]} bytes")
+            return False, cache_key
+        return True, cache_key
+    
+    def _search_files(self, kind: str, description: str, config_files: List[Path]) -> List[IdHit]:
+        """Search files for one kind of data, reusing results for unchanged files."""
+        searched_files = []
+        cache_keys = []
+        results = []
         for config_file in config_files:
-            self.logger.info(f"Searching for telemetry IDs in: {config_file}")
-            
-            try:
-                if config_file.suffix.lower() == '.json':
-                    ids = self._search_json_for_ids(config_file, id_patterns)
-                elif config_file.suffix.lower() in ['.ini', '.cfg', '.conf']:
-                    ids = self._search_ini_for_ids(config_file, id_patterns)
-                elif config_file.suffix.lower() == '.xml':
-                    ids = self._search_xml_for_ids(config_file, id_patterns)
-                else:
-                    # Try to search as plain text
-                    ids = self._search_text_for_ids(config_file, id_patterns)
-                
-                if ids:
-                    found_ids.extend(ids)
-                    
-            except Exception as e:
-                self.logger.error(f"Error searching {config_file}: {e}")
+            searchable, cache_key = self._should_search(config_file, kind)
+            if not searchable:
+                continue
+            self.logger.info(f"Searching for {description} in: {config_file}")
+            cached = self._search_cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                self._search_cache.move_to_end(cache_key)
+            searched_files.append(config_file)
+            cache_keys.append(cache_key)
+            results.append(cached)
         
-        return found_ids
-
-    def search_for_account_data(self, config_files: List[Path]) -> List[Dict[str, Any]]:
-        """Search for email addresses and account data in configuration files."""
-        found_accounts = []
-
-        # Email pattern
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-
-        # Account-related patterns
-        account_patterns = [
-            r'email',
-            r'username',
-            r'user[_-]?name',
-            r'login',
-            r'account',
-            r'profile',
-            r'identity'
-        ]
-
-        for config_file in config_files:
-            self.logger.info(f"Searching for account data in: {config_file}")
-
-            try:
-                if config_file.suffix.lower() == '.json':
-                    accounts = self._search_json_for_accounts(config_file, email_pattern, account_patterns)
-                elif config_file.suffix.lower() in ['.ini', '.cfg', '.conf']:
-                    accounts = self._search_ini_for_accounts(config_file, email_pattern, account_patterns)
-                elif config_file.suffix.lower() == '.xml':
-                    accounts = self._search_xml_for_accounts(config_file, email_pattern, account_patterns)
-                else:
-                    # Try to search as plain text
-                    accounts = self._search_text_for_accounts(config_file, email_pattern, account_patterns)
+        pending = [index for index, result in enumerate(results) if result is None]
+        pending_bytes = sum(cache_keys[index][3] for index in pending if cache_keys[index])
+        fresh = None
+        if len(pending) > 1 and pending_bytes >= _PROCESS_POOL_MIN_BYTES:
+            fresh = self._search_in_processes(kind, [str(searched_files[index]) for index in pending])
+        if fresh is None:
+            fresh = [self._search_file(kind, searched_files[index]) for index in pending]
+        
+        for index, result in zip(pending, fresh):
+            # Failed searches are logged and skipped, but never cached
+            if result is not None and cache_keys[index] is not None:
+                self._search_cache[cache_keys[index]] = result
+                if len(self._search_cache) > _SEARCH_CACHE_SIZE:
+                    self._search_cache.popitem(last=False)
+            results[index] = result
+        
+        found = []
+        for result in results:
+            if result:
+                found.extend(result)
+        return found
+    
+    def _search_in_processes(self, kind: str, paths: List[str]) -> Optional[List[Optional[List[IdHit]]]]:
+        """Search paths in worker processes, or return None if a pool can't run here."""
+        try:
+            # Spawned workers don't inherit the GUI's threads the way forked ones would
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=_SEARCH_WORKERS, mp_context=context) as executor:
+                return list(executor.map(_search_one_file, paths, repeat(kind), chunksize=8))
+        except (OSError, NotImplementedError, BrokenProcessPool) as e:
+            self.logger.warning(f"Process pool unavailable, searching serially: {e}")
+            return None
+    
+    def _search_file(self, kind: str, config_file: Path) -> Optional[List[IdHit]]:
+        """Search one file for IDs or account data, or return None if that fails."""
+        try:
+            # Materialise here: results are cached and pickled back from workers
+            if kind == 'ids':
+                return list(self._search_file_for_ids(config_file))
+            return list(self._search_file_for_accounts(config_file))
+        except Exception as e:
+            self.logger.error(f"Error searching {config_file}: {e}")
+            return None
+    
+    def _read_json(self, file_path: Path) -> Any:
+        """Read a JSON file through the shared parse cache."""
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return SafeFileOperations.safe_read_json(file_path)
+        if stat.st_size > _JSON_CACHE_MAX_BYTES:
+            return SafeFileOperations.safe_read_json(file_path)
+        return _read_json_cached(str(file_path), stat.st_mtime_ns, stat.st_size)
+    
+    def search_for_telemetry_ids(self, config_files: List[Path]) -> List[IdHit]:
+        """Search for telemetry IDs in configuration files."""
+        return self._search_files('ids', 'telemetry IDs', config_files)
 
-                if accounts:
-                    found_accounts.extend(accounts)
+    def _search_file_for_ids(self, config_file: Path) -> Iterator[IdHit]:
+        """Search one configuration file for telemetry IDs according to its format."""
+        if config_file.suffix.lower() == '.json':
+            return self._search_json_for_ids(config_file, _ID_CLASSIFIER)
+        elif config_file.suffix.lower() in ['.ini', '.cfg', '.conf']:
+            return self._search_ini_for_ids(config_file, _ID_CLASSIFIER)
+        elif config_file.suffix.lower() == '.xml':
+            return self._search_xml_for_ids(config_file, _ID_CLASSIFIER)
+        else:
+            # Try to search as plain text
+            return self._search_text_for_ids(config_file, _ID_KV_REGEXES)
 
-            except Exception as e:
-                self.logger.error(f"Error searching {config_file}: {e}")
+    def search_for_account_data(self, config_files: List[Path]) -> List[AccountHit]:
+        """Search for email addresses and account data in configuration files."""
+        return self._search_files('accounts', 'account data', config_files)
 
-        return found_accounts
+    def _search_file_for_accounts(self, config_file: Path) -> Iterator[AccountHit]:
+        """Search one configuration file for account data according to its format."""
+        if config_file.suffix.lower() == '.json':
+            return self._search_json_for_accounts(config_file, _EMAIL_RE, _ACCOUNT_CLASSIFIER)
+        elif config_file.suffix.lower() in ['.ini', '.cfg', '.conf']:
+            return self._search_ini_for_accounts(config_file, _EMAIL_RE, _ACCOUNT_CLASSIFIER)
+        elif config_file.suffix.lower() == '.xml':
+            return self._search_xml_for_accounts(config_file, _EMAIL_RE, _ACCOUNT_CLASSIFIER)
+        else:
+            # Try to search as plain text
+            return self._search_text_for_accounts(config_file, _EMAIL_RE, _ACCOUNT_KV_REGEXES)
 
-    def _search_json_for_ids(self, file_path: Path, patterns: List[str]) -> List[Dict[str, Any]]:
+    def _search_json_for_ids(self, file_path: Path,
+                             classifier: _PatternClassifier) -> Iterator[IdHit]:
         """Search for ID patterns in JSON files."""
-        found_ids = []
-        data = SafeFileOperations.safe_read_json(file_path)
+        data = self._read_json(file_path)
         
         if not data:
-            return found_ids
-        
-        def search_dict(obj: Any, path: str = "") -> None:
-            if isinstance(obj, dict):
-                for key, value in obj.items():
-                    current_path = f"{path}.{key}" if path else key
-                    
-                    # Check if key matches any pattern
-                    for pattern in patterns:
-                        if re.search(pattern, key, re.IGNORECASE):
-                            found_ids.append({
-                                'file': file_path,
-                                'format': 'json',
-                                'key_path': current_path,
-                                'key': key,
-                                'value': value,
-                                'pattern_matched': pattern
-                            })
-                            break
-                    
-                    # Recursively search nested objects
-                    search_dict(value, current_path)
-            elif isinstance(obj, list):
-                for i, item in enumerate(obj):
-                    search_dict(item, f"{path}[{i}]")
+            return
         
-        search_dict(data)
-        return found_ids
+        entries = list(_walk_json(data))
+        patterns = classifier.classify_many(key for key, _, _ in entries)
+        for (key, value, current_path), pattern in zip(entries, patterns):
+            # Check if key matches any pattern
+            if pattern:
+                yield IdHit(
+                    file=file_path,
+                    format='json',
+                    key_path=current_path,
+                    key=key,
+                    value=value,
+                    pattern_matched=pattern
+                )
     
-    def _search_ini_for_ids(self, file_path: Path, patterns: List[str]) -> List[Dict[str, Any]]:
+    def _search_ini_for_ids(self, file_path: Path,
+                            classifier: _PatternClassifier) -> Iterator[IdHit]:
         """Search for ID patterns in INI files."""
-        found_ids = []
-        
         try:
-            config = configparser.ConfigParser()
-            config.read(file_path, encoding='utf-8')
-            
-            for section_name in config.sections():
-                section = config[section_name]
-                for key, value in section.items():
-                    for pattern in patterns:
-                        if re.search(pattern, key, re.IGNORECASE):
-                            found_ids.append({
-                                'file': file_path,
-                                'format': 'ini',
-                                'section': section_name,
-                                'key': key,
-                                'value': value,
-                                'pattern_matched': pattern
-                            })
-                            break
+            for section_name, key, value in _scan_ini(file_path):
+                pattern = classifier.classify(key)
+                if pattern:
+                    yield IdHit(
+                        file=file_path,
+                        format='ini',
+                        section=section_name,
+                        key=key,
+                        value=value,
+                        pattern_matched=pattern
+                    )
         except Exception as e:
             self.logger.error(f"Error parsing INI file {file_path}: {e}")
-        
-        return found_ids
     
-    def _search_xml_for_ids(self, file_path: Path, patterns: List[str]) -> List[Dict[str, Any]]:
+    def _search_xml_for_ids(self, file_path: Path,
+                            classifier: _PatternClassifier) -> Iterator[IdHit]:
         """Search for ID patterns in XML files."""
-        found_ids = []
+        matches = []
         
         try:
-            tree = ET.parse(file_path)
-            root = tree.getroot()
-            
-            def search_element(element: ET.Element, path: str = "") -> None:
-                current_path = f"{path}/{element.tag}" if path else element.tag
-                
+            for order, element, current_path, element_index in _iter_xml(file_path):
                 # Check element tag
-                for pattern in patterns:
-                    if re.search(pattern, element.tag, re.IGNORECASE):
-                        found_ids.append({
-                            'file': file_path,
-                            'format': 'xml',
-                            'element_path': current_path,
-                            'tag': element.tag,
-                            'value': element.text,
-                            'pattern_matched': pattern,
-                            'type': 'element'
-                        })
-                        break
+                pattern = classifier.classify(element.tag)
+                if pattern:
+                    matches.append((order, IdHit(
+                        file=file_path,
+                        format='xml',
+                        element_path=current_path,
+                        element_index=element_index,
+                        tag=element.tag,
+                        value=element.text,
+                        pattern_matched=pattern,
+                        type='element'
+                    )))
                 
                 # Check attributes
                 for attr_name, attr_value in element.attrib.items():
-                    for pattern in patterns:
-                        if re.search(pattern, attr_name, re.IGNORECASE):
-                            found_ids.append({
-                                'file': file_path,
-                                'format': 'xml',
-                                'element_path': current_path,
-                                'attribute': attr_name,
-                                'value': attr_value,
-                                'pattern_matched': pattern,
-                                'type': 'attribute'
-                            })
-                            break
-                
-                # Recursively search child elements
-                for child in element:
-                    search_element(child, current_path)
-            
-            search_element(root)
+                    pattern = classifier.classify(attr_name)
+                    if pattern:
+                        matches.append((order, IdHit(
+                            file=file_path,
+                            format='xml',
+                            element_path=current_path,
+                            element_index=element_index,
+                            attribute=attr_name,
+                            value=attr_value,
+                            pattern_matched=pattern,
+                            type='attribute'
+                        )))
             
         except Exception as e:
             self.logger.error(f"Error parsing XML file {file_path}: {e}")
+            # Like a failed up-front parse, a malformed document yields nothing
+            matches = []
         
-        return found_ids
+        # Elements arrive as they close; report them in document order
+        matches.sort(key=lambda match: match[0])
+        yield from (record for _, record in matches)
     
-    def _search_text_for_ids(self, file_path: Path, patterns: List[str]) -> List[Dict[str, Any]]:
+    def _search_text_for_ids(self, file_path: Path,
+                             patterns: List[Tuple[re.Pattern, str]]) -> Iterator[IdHit]:
         """Search for ID patterns in plain text files."""
-        found_ids = []
-        
         try:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                 content = f.read()
             
-            lines = content.split('\n')
-            for line_num, line in enumerate(lines, 1):
-                for pattern in patterns:
-                    # Look for key=value or key:value patterns
-                    match = re.search(rf'({pattern})\s*[=:]\s*([^\s\n]+)', line, re.IGNORECASE)
-                    if match:
-                        found_ids.append({
-                            'file': file_path,
-                            'format': 'text',
-                            'line_number': line_num,
-                            'key': match.group(1),
-                            'value': match.group(2),
-                            'pattern_matched': pattern,
-                            'full_line': line.strip()
-                        })
+            # Look for key=value or key:value patterns
+            for line_num, full_line, pattern, match in _scan_text(content, patterns):
+                yield IdHit(
+                    file=file_path,
+                    format='text',
+                    line_number=line_num,
+                    key=match.group(1),
+                    value=match.group(2),
+                    pattern_matched=pattern,
+                    full_line=full_line
+                )
         
         except Exception as e:
             self.logger.error(f"Error reading text file {file_path}: {e}")
-        
-        return found_ids
     
-    def modify_telemetry_id(self, id_info: Dict[str, Any], new_value: str) -> bool:
+    def modify_telemetry_id(self, id_info: IdHit, new_value: str) -> bool:
         """Modify a telemetry ID in its configuration file."""
-        file_path = id_info['file']
-        format_type = id_info['format']
-        
-        self.logger.info(f"Modifying ID in {file_path} (format: {format_type})")
+        return self.modify_telemetry_ids([(id_info, new_value)])
+    
+    def modify_telemetry_ids(self, changes: List[Tuple[IdHit, str]]) -> bool:
+        """Modify several telemetry IDs, parsing and rewriting each file only once."""
+        # Group by file, keeping the order the changes were requested in
+        grouped_changes: Dict[Tuple[Path, str], List[Tuple[IdHit, str]]] = {}
+        for id_info, new_value in changes:
+            file_key = (id_info.file, id_info.format)
+            grouped_changes.setdefault(file_key, []).append((id_info, new_value))
         
-        try:
-            if format_type == 'json':
-                return self._modify_json_id(id_info, new_value)
-            elif format_type == 'ini':
-                return self._modify_ini_id(id_info, new_value)
-            elif format_type == 'xml':
-                return self._modify_xml_id(id_info, new_value)
-            elif format_type == 'text':
-                return self._modify_text_id(id_info, new_value)
-            else:
-                self.logger.error(f"Unsupported format: {format_type}")
-                return False
+        success = True
+        for (file_path, format_type), file_changes in grouped_changes.items():
+            self.logger.info(f"Modifying {len(file_changes)} ID(s) in {file_path} (format: {format_type})")
+            
+            try:
+                if format_type == 'json':
+                    file_success = self._modify_json_ids(file_path, file_changes)
+                elif format_type == 'ini':
+                    file_success = self._modify_ini_ids(file_path, file_changes)
+                elif format_type == 'xml':
+                    file_success = self._modify_xml_ids(file_path, file_changes)
+                elif format_type == 'text':
+                    file_success = self._modify_text_ids(file_path, file_changes)
+                else:
+                    self.logger.error(f"Unsupported format: {format_type}")
+                    file_success = False
+            
+            except Exception as e:
+                self.logger.error(f"Error modifying ID: {e}")
+                file_success = False
+            finally:
+                # A rewrite within the timestamp granularity can keep mtime and size
+                self.invalidate(file_path)
+            
+            success &= file_success
         
-        except Exception as e:
-            self.logger.error(f"Error modifying ID: {e}")
-            return False
+        return success
     
-    def _modify_json_id(self, id_info: Dict[str, Any], new_value: str) -> bool:
-        """Modify an ID in a JSON file."""
-        file_path = id_info['file']
-        key_path = id_info['key_path']
-        
+    def _modify_json_ids(self, file_path: Path, changes: List[Tuple[IdHit, str]]) -> bool:
+        """Modify IDs in a JSON file."""
         data = SafeFileOperations.safe_read_json(file_path)
         if not data:
             return False
         
+        results = [self._set_json_value(data, id_info.key_path, new_value)
+                   for id_info, new_value in changes]
+        if any(results):
+            results.append(SafeFileOperations.safe_write_json(file_path, data))
+        return all(results)
+    
+    def _set_json_value(self, data: Any, key_path: str, new_value: str) -> bool:
+        """Set the value at a dotted key path in parsed JSON data."""
         # Navigate to the key using the path
         keys = key_path.split('.')
         current = data
@@ -292,307 +728,304 @@ class ConfigManager:
             old_value = current[final_key]
             current[final_key] = new_value
             self.logger.info(f"Changed {final_key}: {old_value} -> {new_value}")
-            
-            return SafeFileOperations.safe_write_json(file_path, data)
+            return True
         else:
             self.logger.error(f"Final key not found: {final_key}")
             return False
     
-    def _modify_ini_id(self, id_info: Dict[str, Any], new_value: str) -> bool:
-        """Modify an ID in an INI file."""
-        file_path = id_info['file']
-        section_name = id_info['section']
-        key = id_info['key']
-        
+    def _modify_ini_ids(self, file_path: Path, changes: List[Tuple[IdHit, str]]) -> bool:
+        """Modify IDs in an INI file."""
         config = configparser.ConfigParser()
         config.read(file_path, encoding='utf-8')
         
-        if section_name in config and key in config[section_name]:
-            old_value = config[section_name][key]
-            config[section_name][key] = new_value
-            self.logger.info(f"Changed [{section_name}] {key}: {old_value} -> {new_value}")
+        results = []
+        for id_info, new_value in changes:
+            section_name = id_info.section
+            key = id_info.key
             
+            if section_name in config and key in config[section_name]:
+                old_value = config[section_name][key]
+                config[section_name][key] = new_value
+                self.logger.info(f"Changed [{section_name}] {key}: {old_value} -> {new_value}")
+                results.append(True)
+            else:
+                self.logger.error(f"Section/key not found: [{section_name}] {key}")
+                results.append(False)
+        
+        if any(results):
             with open(file_path, 'w', encoding='utf-8') as f:
                 config.write(f)
-            return True
-        else:
-            self.logger.error(f"Section/key not found: [{section_name}] {key}")
-            return False
+        return all(results)
     
-    def _modify_xml_id(self, id_info: Dict[str, Any], new_value: str) -> bool:
-        """Modify an ID in an XML file."""
-        file_path = id_info['file']
-        
+    def _modify_xml_ids(self, file_path: Path, changes: List[Tuple[IdHit, str]]) -> bool:
+        """Modify IDs in an XML file."""
         tree = ET.parse(file_path)
         root = tree.getroot()
         
-        # This is a simplified implementation
-        # In practice, you'd need to navigate to the specific element
-        # based on the stored path information
+        results = [self._set_xml_value(root, id_info, new_value) for id_info, new_value in changes]
+        if any(results):
+            tree.write(file_path, encoding='utf-8', xml_declaration=True)
+        return all(results)
+    
+    def _find_xml_element(self, root: ET.Element, element_index: Tuple[int, ...]) -> Optional[ET.Element]:
+        """Follow child indices recorded during the search down from the root."""
+        element = root
+        for index in element_index:
+            if index >= len(element):
+                return None
+            element = element[index]
+        return element
+    
+    def _set_xml_value(self, root: ET.Element, id_info: IdHit, new_value: str) -> bool:
+        """Set the element text or attribute that the search found, if it still holds the recorded value."""
+        if id_info.element_index is not None:
+            elem = self._find_xml_element(root, id_info.element_index)
+            if elem is None:
+                self.logger.error(f"Element no longer present: {id_info.element_path}")
+                return False
+            
+            if id_info.type == 'element' and elem.tag == id_info.tag and elem.text == id_info.value:
+                old_value = elem.text
+                elem.text = new_value
+                self.logger.info(f"Changed element {elem.tag}: {old_value} -> {new_value}")
+                return True
+            if id_info.type == 'attribute' and elem.attrib.get(id_info.attribute) == id_info.value:
+                old_value = elem.attrib[id_info.attribute]
+                elem.attrib[id_info.attribute] = new_value
+                self.logger.info(f"Changed attribute {id_info.attribute}: {old_value} -> {new_value}")
+                return True
+            
+            self.logger.error(f"Element changed since it was searched: {id_info.element_path}")
+            return False
         
-        if id_info['type'] == 'element':
+        # Without a recorded location, take the first match anywhere in the tree
+        if id_info.type == 'element':
             # Find and modify element text
             for elem in root.iter():
-                if elem.tag == id_info['tag'] and elem.text == id_info['value']:
+                if elem.tag == id_info.tag and elem.text == id_info.value:
                     old_value = elem.text
                     elem.text = new_value
                     self.logger.info(f"Changed element {elem.tag}: {old_value} -> {new_value}")
-                    tree.write(file_path, encoding='utf-8', xml_declaration=True)
                     return True
         
-        elif id_info['type'] == 'attribute':
+        elif id_info.type == 'attribute':
             # Find and modify attribute
             for elem in root.iter():
-                if id_info['attribute'] in elem.attrib:
-                    if elem.attrib[id_info['attribute']] == id_info['value']:
-                        old_value = elem.attrib[id_info['attribute']]
-                        elem.attrib[id_info['attribute']] = new_value
-                        self.logger.info(f"Changed attribute {id_info['attribute']}: {old_value} -> {new_value}")
-                        tree.write(file_path, encoding='utf-8', xml_declaration=True)
+                if id_info.attribute in elem.attrib:
+                    if elem.attrib[id_info.attribute] == id_info.value:
+                        old_value = elem.attrib[id_info.attribute]
+                        elem.attrib[id_info.attribute] = new_value
+                        self.logger.info(f"Changed attribute {id_info.attribute}: {old_value} -> {new_value}")
                         return True
         
         return False
     
-    def _modify_text_id(self, id_info: Dict[str, Any], new_value: str) -> bool:
-        """Modify an ID in a plain text file."""
-        file_path = id_info['file']
-        line_number = id_info['line_number']
-        key = id_info['key']
-        old_value = id_info['value']
-        
+    def _modify_text_ids(self, file_path: Path, changes: List[Tuple[IdHit, str]]) -> bool:
+        """Modify IDs in a plain text file."""
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 lines = f.readlines()
             
-            if line_number <= len(lines):
-                old_line = lines[line_number - 1]
-                new_line = old_line.replace(f"{key}={old_value}", f"{key}={new_value}")
-                new_line = new_line.replace(f"{key}:{old_value}", f"{key}:{new_value}")
+            results = []
+            for id_info, new_value in changes:
+                line_number = id_info.line_number
+                key = id_info.key
+                old_value = id_info.value
                 
-                if new_line != old_line:
-                    lines[line_number - 1] = new_line
+                changed = False
+                if line_number <= len(lines):
+                    old_line = lines[line_number - 1]
+                    new_line = old_line.replace(f"{key}={old_value}", f"{key}={new_value}")
+                    new_line = new_line.replace(f"{key}:{old_value}", f"{key}:{new_value}")
                     
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.writelines(lines)
-                    
-                    self.logger.info(f"Changed {key}: {old_value} -> {new_value}")
-                    return True
+                    if new_line != old_line:
+                        lines[line_number - 1] = new_line
+                        self.logger.info(f"Changed {key}: {old_value} -> {new_value}")
+                        changed = True
+                results.append(changed)
             
-            return False
+            if any(results):
+                with open(file_path, 'w', encoding='utf-8') as f:
+                    f.writelines(lines)
+            return all(results)
             
         except Exception as e:
             self.logger.error(f"Error modifying text file: {e}")
             return False
 
-    def _search_json_for_accounts(self, file_path: Path, email_pattern: str, account_patterns: List[str]) -> List[Dict[str, Any]]:
+    def _search_json_for_accounts(self, file_path: Path, email_re: re.Pattern,
+                                  classifier: _PatternClassifier) -> Iterator[AccountHit]:
         """Search for account data in JSON files."""
-        found_accounts = []
-        data = SafeFileOperations.safe_read_json(file_path)
+        data = self._read_json(file_path)
 
         if not data:
-            return found_accounts
-
-        def search_dict(obj: Any, path: str = "") -> None:
-            if isinstance(obj, dict):
-                for key, value in obj.items():
-                    current_path = f"{path}.{key}" if path else key
-
-                    # Check if key matches account patterns
-                    for pattern in account_patterns:
-                        if re.search(pattern, key, re.IGNORECASE):
-                            found_accounts.append({
-                                'file': file_path,
-                                'format': 'json',
-                                'key_path': current_path,
-                                'key': key,
-                                'value': value,
-                                'pattern_matched': pattern,
-                                'data_type': 'account_field'
-                            })
-                            break
-
-                    # Check if value is an email
-                    if isinstance(value, str) and re.match(email_pattern, value):
-                        found_accounts.append({
-                            'file': file_path,
-                            'format': 'json',
-                            'key_path': current_path,
-                            'key': key,
-                            'value': value,
-                            'pattern_matched': 'email',
-                            'data_type': 'email'
-                        })
-
-                    # Recursively search nested objects
-                    search_dict(value, current_path)
-            elif isinstance(obj, list):
-                for i, item in enumerate(obj):
-                    search_dict(item, f"{path}[{i}]")
-
-        search_dict(data)
-        return found_accounts
-
-    def _search_ini_for_accounts(self, file_path: Path, email_pattern: str, account_patterns: List[str]) -> List[Dict[str, Any]]:
-        """Search for account data in INI files."""
-        found_accounts = []
+            return
 
+        entries = list(_walk_json(data))
+        patterns = classifier.classify_many(key for key, _, _ in entries)
+        for (key, value, current_path), pattern in zip(entries, patterns):
+            # Check if key matches account patterns
+            if pattern:
+                yield AccountHit(
+                    file=file_path,
+                    format='json',
+                    key_path=current_path,
+                    key=key,
+                    value=value,
+                    pattern_matched=pattern,
+                    data_type='account_field'
+                )
+
+            # Check if value is an email
+            if isinstance(value, str) and email_re.match(value):
+                yield AccountHit(
+                    file=file_path,
+                    format='json',
+                    key_path=current_path,
+                    key=key,
+                    value=value,
+                    pattern_matched='email',
+                    data_type='email'
+                )
+
+    def _search_ini_for_accounts(self, file_path: Path, email_re: re.Pattern,
+                                 classifier: _PatternClassifier) -> Iterator[AccountHit]:
+        """Search for account data in INI files."""
         try:
-            config = configparser.ConfigParser()
-            config.read(file_path, encoding='utf-8')
-
-            for section_name in config.sections():
-                section = config[section_name]
-                for key, value in section.items():
-                    # Check for account patterns
-                    for pattern in account_patterns:
-                        if re.search(pattern, key, re.IGNORECASE):
-                            found_accounts.append({
-                                'file': file_path,
-                                'format': 'ini',
-                                'section': section_name,
-                                'key': key,
-                                'value': value,
-                                'pattern_matched': pattern,
-                                'data_type': 'account_field'
-                            })
-                            break
-
-                    # Check for email values
-                    if re.match(email_pattern, value):
-                        found_accounts.append({
-                            'file': file_path,
-                            'format': 'ini',
-                            'section': section_name,
-                            'key': key,
-                            'value': value,
-                            'pattern_matched': 'email',
-                            'data_type': 'email'
-                        })
+            for section_name, key, value in _scan_ini(file_path):
+                # Check for account patterns
+                pattern = classifier.classify(key)
+                if pattern:
+                    yield AccountHit(
+                        file=file_path,
+                        format='ini',
+                        section=section_name,
+                        key=key,
+                        value=value,
+                        pattern_matched=pattern,
+                        data_type='account_field'
+                    )
+
+                # Check for email values
+                if email_re.match(value):
+                    yield AccountHit(
+                        file=file_path,
+                        format='ini',
+                        section=section_name,
+                        key=key,
+                        value=value,
+                        pattern_matched='email',
+                        data_type='email'
+                    )
         except Exception as e:
             self.logger.error(f"Error parsing INI file {file_path}: {e}")
 
-        return found_accounts
-
-    def _search_xml_for_accounts(self, file_path: Path, email_pattern: str, account_patterns: List[str]) -> List[Dict[str, Any]]:
+    def _search_xml_for_accounts(self, file_path: Path, email_re: re.Pattern,
+                                 classifier: _PatternClassifier) -> Iterator[AccountHit]:
         """Search for account data in XML files."""
-        found_accounts = []
+        matches = []
 
         try:
-            tree = ET.parse(file_path)
-            root = tree.getroot()
-
-            def search_element(element: ET.Element, path: str = "") -> None:
-                current_path = f"{path}/{element.tag}" if path else element.tag
-
+            for order, element, current_path, element_index in _iter_xml(file_path):
                 # Check element tag for account patterns
-                for pattern in account_patterns:
-                    if re.search(pattern, element.tag, re.IGNORECASE):
-                        found_accounts.append({
-                            'file': file_path,
-                            'format': 'xml',
-                            'element_path': current_path,
-                            'tag': element.tag,
-                            'value': element.text,
-                            'pattern_matched': pattern,
-                            'type': 'element',
-                            'data_type': 'account_field'
-                        })
-                        break
+                pattern = classifier.classify(element.tag)
+                if pattern:
+                    matches.append((order, AccountHit(
+                        file=file_path,
+                        format='xml',
+                        element_path=current_path,
+                        element_index=element_index,
+                        tag=element.tag,
+                        value=element.text,
+                        pattern_matched=pattern,
+                        type='element',
+                        data_type='account_field'
+                    )))
 
                 # Check element text for emails
-                if element.text and re.match(email_pattern, element.text.strip()):
-                    found_accounts.append({
-                        'file': file_path,
-                        'format': 'xml',
-                        'element_path': current_path,
-                        'tag': element.tag,
-                        'value': element.text,
-                        'pattern_matched': 'email',
-                        'type': 'element',
-                        'data_type': 'email'
-                    })
+                if element.text and email_re.match(element.text.strip()):
+                    matches.append((order, AccountHit(
+                        file=file_path,
+                        format='xml',
+                        element_path=current_path,
+                        element_index=element_index,
+                        tag=element.tag,
+                        value=element.text,
+                        pattern_matched='email',
+                        type='element',
+                        data_type='email'
+                    )))
 
                 # Check attributes
                 for attr_name, attr_value in element.attrib.items():
                     # Check attribute names for account patterns
-                    for pattern in account_patterns:
-                        if re.search(pattern, attr_name, re.IGNORECASE):
-                            found_accounts.append({
-                                'file': file_path,
-                                'format': 'xml',
-                                'element_path': current_path,
-                                'attribute': attr_name,
-                                'value': attr_value,
-                                'pattern_matched': pattern,
-                                'type': 'attribute',
-                                'data_type': 'account_field'
-                            })
-                            break
+                    pattern = classifier.classify(attr_name)
+                    if pattern:
+                        matches.append((order, AccountHit(
+                            file=file_path,
+                            format='xml',
+                            element_path=current_path,
+                            element_index=element_index,
+                            attribute=attr_name,
+                            value=attr_value,
+                            pattern_matched=pattern,
+                            type='attribute',
+                            data_type='account_field'
+                        )))
 
                     # Check attribute values for emails
-                    if re.match(email_pattern, attr_value):
-                        found_accounts.append({
-                            'file': file_path,
-                            'format': 'xml',
-                            'element_path': current_path,
-                            'attribute': attr_name,
-                            'value': attr_value,
-                            'pattern_matched': 'email',
-                            'type': 'attribute',
-                            'data_type': 'email'
-                        })
-
-                # Recursively search child elements
-                for child in element:
-                    search_element(child, current_path)
-
-            search_element(root)
+                    if email_re.match(attr_value):
+                        matches.append((order, AccountHit(
+                            file=file_path,
+                            format='xml',
+                            element_path=current_path,
+                            element_index=element_index,
+                            attribute=attr_name,
+                            value=attr_value,
+                            pattern_matched='email',
+                            type='attribute',
+                            data_type='email'
+                        )))
 
         except Exception as e:
             self.logger.error(f"Error parsing XML file {file_path}: {e}")
+            # Like a failed up-front parse, a malformed document yields nothing
+            matches = []
 
-        return found_accounts
+        # Elements arrive as they close; report them in document order
+        matches.sort(key=lambda match: match[0])
+        yield from (record for _, record in matches)
 
-    def _search_text_for_accounts(self, file_path: Path, email_pattern: str, account_patterns: List[str]) -> List[Dict[str, Any]]:
+    def _search_text_for_accounts(self, file_path: Path, email_re: re.Pattern,
+                                  account_patterns: List[Tuple[re.Pattern, str]]) -> Iterator[AccountHit]:
         """Search for account data in plain text files."""
-        found_accounts = []
-
         try:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                 content = f.read()
 
-            lines = content.split('\n')
-            for line_num, line in enumerate(lines, 1):
-                # Search for emails
-                email_matches = re.finditer(email_pattern, line)
-                for match in email_matches:
-                    found_accounts.append({
-                        'file': file_path,
-                        'format': 'text',
-                        'line_number': line_num,
-                        'value': match.group(),
-                        'pattern_matched': 'email',
-                        'full_line': line.strip(),
-                        'data_type': 'email'
-                    })
-
-                # Search for account patterns
-                for pattern in account_patterns:
-                    # Look for key=value or key:value patterns
-                    match = re.search(rf'({pattern})\s*[=:]\s*([^\s\n]+)', line, re.IGNORECASE)
-                    if match:
-                        found_accounts.append({
-                            'file': file_path,
-                            'format': 'text',
-                            'line_number': line_num,
-                            'key': match.group(1),
-                            'value': match.group(2),
-                            'pattern_matched': pattern,
-                            'full_line': line.strip(),
-                            'data_type': 'account_field'
-                        })
+            # Search for emails and key=value or key:value account patterns
+            for line_num, full_line, pattern, match in _scan_text(content, account_patterns, email_re):
+                if pattern is None:
+                    yield AccountHit(
+                        file=file_path,
+                        format='text',
+                        line_number=line_num,
+                        value=match.group(),
+                        pattern_matched='email',
+                        full_line=full_line,
+                        data_type='email'
+                    )
+                else:
+                    yield AccountHit(
+                        file=file_path,
+                        format='text',
+                        line_number=line_num,
+                        key=match.group(1),
+                        value=match.group(2),
+                        pattern_matched=pattern,
+                        full_line=full_line,
+                        data_type='account_field'
+                    )
 
         except Exception as e:
             self.logger.error(f"Error reading text file {file_path}: {e}")
-
-        return found_accounts
@@ -4,12 +4,17 @@ Coordinates all cleaning operations and provides the main API.
 """
 
 import logging
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from functools import lru_cache, partial
+from itertools import groupby, islice
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterator, TextIO
 import threading
 import time
 
-from utils import OSDetector, PathFinder, FileSearcher, Logger, IDEDetector
+from utils import OSDetector, PathFinder, FileSearcher, Logger, IDEDetector, DirectorySnapshot
 from backup_manager import BackupManager
 from config_manager import ConfigManager
 from database_cleaner import DatabaseCleaner
@@ -19,6 +24,95 @@ from account_cleaner import AccountDataCleaner
 from ide_manager import AugmentCodeIDEManager
 
 
+# Database and workspace cleanup jobs are disk-bound and overlap this many at a time
+_CLEANUP_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+
+# Units for human-readable sizes, each 1024 times the previous
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+# Status log entries kept for display; older ones are dropped
+_DETAILED_LOG_SIZE = 4096
+
+# Stats overlap in threads (they release the GIL) only for lists this long;
+# shorter ones finish serially before a pool would start
+_STAT_POOL_MIN_FILES = 64
+
+
+def _stat_size(path: Path) -> Optional[int]:
+    """Return a file's size, or None if it can't be stat'ed."""
+    try:
+        return path.stat().st_size
+    except OSError:
+        return None
+
+
+def _batch_stat_sizes(paths: List[Path]) -> Dict[Path, Optional[int]]:
+    """Stat many files, overlapping the syscalls for long lists."""
+    if len(paths) < _STAT_POOL_MIN_FILES:
+        return {path: _stat_size(path) for path in paths}
+    with ThreadPoolExecutor(max_workers=min(32, len(paths))) as executor:
+        return dict(zip(paths, executor.map(_stat_size, paths)))
+
+
+def _paths_overlap(first: Path, second: Path) -> bool:
+    """Whether two paths are the same or one contains the other."""
+    return first == second or first in second.parents or second in first.parents
+
+
+class CleanupTask:
+    """One progress step of a cleanup run, planned before anything is changed."""
+    
+    __slots__ = ('label', 'done_label', 'run', 'path', 'backup_name')
+    
+    def __init__(self, label: str, done_label: str, run: Callable[..., bool],
+                 path: Optional[Path] = None, backup_name: Optional[str] = None):
+        self.label = label
+        self.done_label = done_label
+        # Called as run(backup_dir=...) once the backup directory exists
+        self.run = run
+        # Tasks with a path touch only that file or tree and may run concurrently
+        self.path = path
+        self.backup_name = backup_name
+
+
+def _chain_conflicting_tasks(tasks: List[CleanupTask]) -> List[List[CleanupTask]]:
+    """Group path-bound tasks into chains that must run one after another.
+    
+    Tasks sharing a backup name, or whose paths contain one another (a database
+    inside a workspace), land in one chain in their original order; separate
+    chains touch disjoint files and may run concurrently.
+    """
+    chains: List[List[int]] = []
+    for index, task in enumerate(tasks):
+        conflicting = [chain for chain in chains
+                       if any(tasks[other].backup_name == task.backup_name
+                              or _paths_overlap(tasks[other].path, task.path)
+                              for other in chain)]
+        merged = sorted([other for chain in conflicting for other in chain] + [index])
+        chains = [chain for chain in chains if not any(chain is other for other in conflicting)]
+        chains.append(merged)
+    chains.sort(key=lambda chain: chain[0])
+    return [[tasks[index] for index in chain] for chain in chains]
+
+
+def _unique_real_paths(paths: List[Path]) -> List[Path]:
+    """Drop paths that resolve to a directory already listed, keeping the first spelling."""
+    unique = {}
+    for path in paths:
+        try:
+            real_path = path.resolve()
+        except (OSError, RuntimeError):
+            real_path = path
+        unique.setdefault(real_path, path)
+    return list(unique.values())
+
+
+@lru_cache(maxsize=1)
+def _cached_app_data_paths() -> Tuple[Path, ...]:
+    """Look up the OS application data directories once per session."""
+    return tuple(PathFinder.get_app_data_paths())
+
+
 class DataCleanerStatus:
     """Status tracking for data cleaning operations."""
     
@@ -30,25 +124,42 @@ class DataCleanerStatus:
         self.is_running = False
         self.success = True
         self.error_message = ""
-        self.detailed_log = []
+        # (timestamp, message) pairs, formatted only when displayed
+        self.detailed_log = deque(maxlen=_DETAILED_LOG_SIZE)
+        self.log_count = 0
+        # Discovery steps report from worker threads
+        self._lock = threading.Lock()
     
     def update(self, operation: str, progress: float = None, step_completed: bool = False):
         """Update the status."""
-        self.current_operation = operation
-        if progress is not None:
-            self.progress = progress
-        if step_completed:
-            self.completed_steps += 1
-            if self.total_steps > 0:
-                self.progress = self.completed_steps / self.total_steps
-        
-        self.detailed_log.append(f"{time.strftime('%H:%M:%S')} - {operation}")
+        with self._lock:
+            self.current_operation = operation
+            if progress is not None:
+                self.progress = progress
+            if step_completed:
+                self.completed_steps += 1
+                if self.total_steps > 0:
+                    self.progress = self.completed_steps / self.total_steps
+            
+            self.detailed_log.append((time.time(), operation))
+            self.log_count += 1
     
     def set_error(self, error_message: str):
         """Set error status."""
-        self.success = False
-        self.error_message = error_message
-        self.detailed_log.append(f"{time.strftime('%H:%M:%S')} - ERROR: {error_message}")
+        with self._lock:
+            self.success = False
+            self.error_message = error_message
+            self.detailed_log.append((time.time(), f"ERROR: {error_message}"))
+            self.log_count += 1
+    
+    def log_entries_since(self, seen: int) -> Tuple[int, List[str]]:
+        """Return the total number of entries logged and the formatted ones after the first `seen`."""
+        with self._lock:
+            first_retained = self.log_count - len(self.detailed_log)
+            entries = list(islice(self.detailed_log, max(seen - first_retained, 0), None))
+            log_count = self.log_count
+        return log_count, [f"{time.strftime('%H:%M:%S', time.localtime(timestamp))} - {message}"
+                           for timestamp, message in entries]
 
 
 class FreeAugmentCodeCleaner:
@@ -74,9 +185,14 @@ class FreeAugmentCodeCleaner:
         self.database_files = []
         self.workspace_locations = []
         self.account_data = {}
+        # (paths, tree fingerprint, results) of the last directory scans, reused
+        # while nothing under the AugmentCode directories has changed
+        self._path_scan_cache: Optional[Tuple[List[Path], Tuple, Dict[str, Any]]] = None
         
         # Status tracking
         self.status = DataCleanerStatus()
+        # One worker, reused across runs, so cleanups never overlap
+        self._cleanup_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='augcleanup')
         
         self.logger.info("Data cleaner initialized successfully")
     
@@ -102,54 +218,102 @@ class FreeAugmentCodeCleaner:
             if custom_paths:
                 self.augmentcode_paths = custom_paths
             else:
-                app_data_paths = PathFinder.get_app_data_paths()
+                app_data_paths = list(_cached_app_data_paths())
                 self.augmentcode_paths = FileSearcher.find_augmentcode_directories(app_data_paths)
             
+            # Symlinks and junctions can list one directory twice; scan it once
+            found_count = len(self.augmentcode_paths)
+            self.augmentcode_paths = _unique_real_paths(self.augmentcode_paths)
+            if len(self.augmentcode_paths) < found_count:
+                self.logger.debug(f"Skipped {found_count - len(self.augmentcode_paths)} "
+                                  f"duplicate AugmentCode directories")
+            
             discovery_results['augmentcode_paths'] = self.augmentcode_paths
             self.status.update("Found AugmentCode directories", step_completed=True)
             
-            # Step 2: Discover telemetry data
-            self.status.update("Discovering telemetry data...")
-            self.telemetry_data = self.telemetry_manager.discover_telemetry_data(self.augmentcode_paths)
-            discovery_results['telemetry_data'] = self.telemetry_data
-            self.status.update("Telemetry data discovery complete", step_completed=True)
+            # Steps 2-6 are independent directory walks and file scans, so they
+            # run concurrently, with the database search split per directory.
+            # The database and account searches only read the AugmentCode
+            # directories and are skipped while their tree is unchanged. The
+            # other steps also read outside it and always run: telemetry
+            # re-reads the registry (its config file results are reused),
+            # workspaces checks the user's common workspace directories and
+            # paths named in config files, and the IDE scan reports running
+            # processes
+            self.status.update("Discovering telemetry data, database files, workspaces, "
+                               "account data and IDE installations...")
+            paths = self.augmentcode_paths
+            # Every scan below replays this one listing of the directories
+            # instead of walking them again
+            snapshot = DirectorySnapshot(paths)
+            fingerprint = snapshot.fingerprint()
+            cached = self._path_scan_cache
+            reuse = cached is not None and cached[0] == paths and cached[1] == fingerprint
+            step_messages = {
+                'telemetry': "Telemetry data discovery complete",
+                'databases': "Database file search complete",
+                'workspaces': "Workspace discovery complete",
+                'accounts': "Account data discovery complete",
+                'ides': "IDE scan complete",
+            }
+            if reuse:
+                self.logger.info("AugmentCode directories unchanged, reusing previous scan results")
+                for step in ('databases', 'accounts'):
+                    self.status.update(f"{step_messages.pop(step)} (unchanged)", step_completed=True)
+                tasks = [
+                    ('telemetry', partial(self.telemetry_manager.refresh_registry_data,
+                                          cached[2]['telemetry_data'])),
+                    ('workspaces', partial(self.workspace_cleaner.discover_workspace_locations, paths, snapshot)),
+                    ('ides', self.ide_manager.perform_comprehensive_scan),
+                ]
+            else:
+                tasks = [
+                    ('telemetry', partial(self.telemetry_manager.discover_telemetry_data, paths, snapshot)),
+                    ('workspaces', partial(self.workspace_cleaner.discover_workspace_locations, paths, snapshot)),
+                    ('accounts', partial(self.account_cleaner.discover_account_data, paths, snapshot)),
+                    ('ides', self.ide_manager.perform_comprehensive_scan),
+                ]
+                tasks.extend(('databases', partial(FileSearcher.find_database_files, path, snapshot))
+                             for path in paths)
+            results = self._discover_parallel(tasks, step_messages)
             
-            # Step 3: Find database files
-            self.status.update("Searching for database files...")
-            self.database_files = []
-            for path in self.augmentcode_paths:
-                db_files = FileSearcher.find_database_files(path)
-                self.database_files.extend(db_files)
-            discovery_results['database_files'] = self.database_files
-            self.status.update("Database file search complete", step_completed=True)
+            if reuse:
+                path_scans = dict(cached[2],
+                                  telemetry_data=results['telemetry'][0],
+                                  workspace_locations=results['workspaces'][0])
+            else:
+                path_scans = {
+                    'telemetry_data': results['telemetry'][0],
+                    'database_files': [db_file for db_files in results['databases'] for db_file in db_files],
+                    'workspace_locations': results['workspaces'][0],
+                    'account_data': results['accounts'][0],
+                }
+                # Stamped with the fingerprint taken before scanning, so changes
+                # made meanwhile are picked up next time
+                self._path_scan_cache = (list(paths), fingerprint, path_scans)
             
-            # Step 4: Discover workspace locations
-            self.status.update("Discovering workspace locations...")
-            self.workspace_locations = self.workspace_cleaner.discover_workspace_locations(self.augmentcode_paths)
+            self.telemetry_data = path_scans['telemetry_data']
+            discovery_results['telemetry_data'] = self.telemetry_data
+            self.database_files = path_scans['database_files']
+            discovery_results['database_files'] = self.database_files
+            self.workspace_locations = path_scans['workspace_locations']
             discovery_results['workspace_locations'] = self.workspace_locations
-            self.status.update("Workspace discovery complete", step_completed=True)
-
-            # Step 5: Discover account data
-            self.status.update("Discovering account data...")
-            self.account_data = self.account_cleaner.discover_account_data(self.augmentcode_paths)
+            self.account_data = path_scans['account_data']
             discovery_results['account_data'] = self.account_data
-            self.status.update("Account data discovery complete", step_completed=True)
-
-            # Step 6: Perform comprehensive IDE scan
-            self.status.update("Scanning IDEs for AugmentCode installations...")
-            ide_scan_results = self.ide_manager.perform_comprehensive_scan()
-            discovery_results['ide_scan_results'] = ide_scan_results
-            self.status.update("IDE scan complete", step_completed=True)
+            discovery_results['ide_scan_results'] = results['ides'][0]
 
             # Step 7: Calculate totals
             self.status.update("Finalizing discovery results...")
+            # "or ()" instead of a [] default: no throwaway list per lookup
+            telemetry_data = self.telemetry_data
+            account_data = self.account_data
             total_locations = (
                 len(self.augmentcode_paths) +
                 len(self.database_files) +
                 len(self.workspace_locations) +
-                len(self.telemetry_data.get('found_ids', [])) +
-                len(self.account_data.get('email_addresses', [])) +
-                len(self.account_data.get('account_files', []))
+                len(telemetry_data.get('found_ids') or ()) +
+                len(account_data.get('email_addresses') or ()) +
+                len(account_data.get('account_files') or ())
             )
             discovery_results['total_locations_found'] = total_locations
             self.status.update("Discovery complete", step_completed=True)
@@ -163,98 +327,57 @@ class FreeAugmentCodeCleaner:
         
         return discovery_results
     
+    def invalidate_discovery_cache(self) -> None:
+        """Make the next discovery look up directories and rescan them and the IDE installations."""
+        _cached_app_data_paths.cache_clear()
+        self._path_scan_cache = None
+        self.ide_manager.invalidate_scan_cache()
+    
+    def _discover_parallel(self, tasks: List[Tuple[str, Callable[[], Any]]],
+                           step_messages: Dict[str, str]) -> Dict[str, List[Any]]:
+        """Run (step, task) pairs in a thread pool and return each step's results in task order."""
+        pending = {step: 0 for step in step_messages}
+        for step, _ in tasks:
+            pending[step] += 1
+        for step, count in pending.items():
+            if not count:
+                self.status.update(step_messages[step], step_completed=True)
+        
+        ordered = [None] * len(tasks)
+        with ThreadPoolExecutor(max_workers=min(32, len(tasks))) as executor:
+            futures = {executor.submit(task): (index, step) for index, (step, task) in enumerate(tasks)}
+            for future in as_completed(futures):
+                index, step = futures[future]
+                ordered[index] = future.result()
+                pending[step] -= 1
+                if not pending[step]:
+                    self.status.update(step_messages[step], step_completed=True)
+        
+        results = {step: [] for step in step_messages}
+        for (step, _), result in zip(tasks, ordered):
+            results[step].append(result)
+        return results
+    
     def perform_cleanup(self, cleanup_options: Dict[str, Any]) -> bool:
         """Perform the actual data cleanup based on options."""
         self.status.update("Starting data cleanup...")
         self.status.is_running = True
-        
-        # Calculate total steps
-        total_steps = 1  # Backup creation
-        if cleanup_options.get('modify_telemetry_ids', False):
-            total_steps += 1
-        if cleanup_options.get('clean_database', False):
-            total_steps += len(self.database_files)
-        if cleanup_options.get('clean_workspace', False):
-            total_steps += len(self.workspace_locations)
-        if cleanup_options.get('clean_account_data', False):
-            total_steps += 1
-        
-        self.status.total_steps = total_steps
         self.status.completed_steps = 0
         
         try:
-            # Create backup directory
-            self.status.update("Creating backup directory...")
-            backup_dir = self.backup_manager.create_timestamped_backup_dir()
-            self.status.update("Backup directory created", step_completed=True)
+            tasks = self._plan_cleanup_tasks(cleanup_options)
+            self.status.total_steps = len(tasks) + 1  # Backup creation comes first
             
-            success = True
-            
-            # Modify telemetry IDs
-            if cleanup_options.get('modify_telemetry_ids', False):
-                self.status.update("Modifying telemetry IDs...")
-                telemetry_success = self.telemetry_manager.modify_telemetry_ids(
-                    backup_dir, 
-                    {
-                        'found_ids': self.telemetry_data.get('found_ids', []),
-                        'registry_keys': self.telemetry_data.get('registry_keys', []),
-                        'modify_config_files': cleanup_options.get('modify_config_files', True),
-                        'modify_registry': cleanup_options.get('modify_registry', True)
-                    }
-                )
-                success &= telemetry_success
-                self.status.update("Telemetry ID modification complete", step_completed=True)
-            
-            # Clean databases
-            if cleanup_options.get('clean_database', False):
-                for db_file in self.database_files:
-                    self.status.update(f"Cleaning database: {db_file.name}")
-                    db_success = self.database_cleaner.clean_database(
-                        db_file,
-                        backup_dir,
-                        {
-                            'remove_augment_records': cleanup_options.get('remove_augment_records', True),
-                            'remove_account_data': cleanup_options.get('remove_account_data', False),
-                            'target_email': cleanup_options.get('target_email', ''),
-                            'reset_telemetry_ids': cleanup_options.get('reset_db_telemetry_ids', False),
-                            'clear_session_data': cleanup_options.get('clear_session_data', True)
-                        }
-                    )
-                    success &= db_success
-                    self.status.update(f"Database {db_file.name} cleaned", step_completed=True)
-            
-            # Clean workspaces
-            if cleanup_options.get('clean_workspace', False):
-                for workspace in self.workspace_locations:
-                    workspace_name = workspace['name']
-                    self.status.update(f"Cleaning workspace: {workspace_name}")
-                    
-                    workspace_success = self.workspace_cleaner.clean_workspace(
-                        workspace,
-                        backup_dir,
-                        {
-                            'backup_workspace': cleanup_options.get('backup_workspace', True),
-                            'selected_items': cleanup_options.get('workspace_items_to_clean', ['cache_folder', 'temp_file']),
-                            'clear_all_cache': cleanup_options.get('clear_all_cache', False),
-                            'remove_lock_files': cleanup_options.get('remove_lock_files', True)
-                        }
-                    )
-                    success &= workspace_success
-                    self.status.update(f"Workspace {workspace_name} cleaned", step_completed=True)
-
-            # Clean account data
-            if cleanup_options.get('clean_account_data', False):
-                self.status.update("Cleaning account data...")
-                account_success = self.account_cleaner.clean_account_data(
-                    backup_dir,
-                    {
-                        'target_email': cleanup_options.get('target_email', ''),
-                        'remove_all_accounts': cleanup_options.get('remove_all_accounts', False),
-                        'account_files': self.account_data.get('account_files', [])
-                    }
-                )
-                success &= account_success
-                self.status.update("Account data cleaning complete", step_completed=True)
+            # Create backup directory; leaving the session persists everything
+            # backed up so far, even if cleanup failed midway
+            self.status.update("Creating backup directory...")
+            with self.backup_manager.session() as backup_dir:
+                self.status.update("Backup directory created", step_completed=True)
+                success = self._run_cleanup_tasks(tasks, backup_dir)
+                # Files backed up but missing from the manifest can't be restored
+                if not self.backup_manager.flush_manifest(backup_dir):
+                    self.logger.error(f"Failed to record backed-up items in {backup_dir}")
+                    success = False
 
             if success:
                 self.status.update("Data cleanup completed successfully!")
@@ -272,78 +395,184 @@ class FreeAugmentCodeCleaner:
             self.status.set_error(error_msg)
             self.status.is_running = False
             return False
+        
+        finally:
+            # Don't hold database files open once the run is over
+            self.database_cleaner.close_all()
+            # Whatever was removed, the next discovery must not report it again
+            self.invalidate_discovery_cache()
+    
+    def _plan_cleanup_tasks(self, cleanup_options: Dict[str, Any]) -> List[CleanupTask]:
+        """List the steps a cleanup will take, in the order they run."""
+        tasks = []
+        
+        if cleanup_options.get('modify_telemetry_ids', False):
+            tasks.append(CleanupTask(
+                "Modifying telemetry IDs...", "Telemetry ID modification complete",
+                partial(self.telemetry_manager.modify_telemetry_ids, modification_options={
+                    'found_ids': self.telemetry_data.get('found_ids', []),
+                    'registry_keys': self.telemetry_data.get('registry_keys', []),
+                    'modify_config_files': cleanup_options.get('modify_config_files', True),
+                    'modify_registry': cleanup_options.get('modify_registry', True)
+                })
+            ))
+        
+        if cleanup_options.get('clean_database', False):
+            db_options = {
+                'remove_augment_records': cleanup_options.get('remove_augment_records', True),
+                'remove_account_data': cleanup_options.get('remove_account_data', False),
+                'target_email': cleanup_options.get('target_email', ''),
+                'reset_telemetry_ids': cleanup_options.get('reset_db_telemetry_ids', False),
+                'clear_session_data': cleanup_options.get('clear_session_data', True),
+                'audit': cleanup_options.get('audit_deleted_rows', False)
+            }
+            tasks.extend(
+                CleanupTask(f"Cleaning database: {db_file.name}", f"Database {db_file.name} cleaned",
+                            partial(self.database_cleaner.clean_database, db_file, cleanup_options=db_options),
+                            db_file, f"database/{db_file.name}")
+                for db_file in self.database_files
+            )
+        
+        if cleanup_options.get('clean_workspace', False):
+            workspace_options = {
+                'backup_workspace': cleanup_options.get('backup_workspace', True),
+                'selected_items': cleanup_options.get('workspace_items_to_clean', ['cache_folder', 'temp_file']),
+                'clear_all_cache': cleanup_options.get('clear_all_cache', False),
+                'remove_lock_files': cleanup_options.get('remove_lock_files', True)
+            }
+            tasks.extend(
+                CleanupTask(f"Cleaning workspace: {workspace['name']}", f"Workspace {workspace['name']} cleaned",
+                            partial(self.workspace_cleaner.clean_workspace, workspace,
+                                    cleanup_options=workspace_options),
+                            workspace['path'], f"workspace/{workspace['path'].name}")
+                for workspace in self.workspace_locations
+            )
+        
+        if cleanup_options.get('clean_account_data', False):
+            tasks.append(CleanupTask(
+                "Cleaning account data...", "Account data cleaning complete",
+                partial(self.account_cleaner.clean_account_data, cleanup_options={
+                    'target_email': cleanup_options.get('target_email', ''),
+                    'remove_all_accounts': cleanup_options.get('remove_all_accounts', False),
+                    'account_files': self.account_data.get('account_files', [])
+                })
+            ))
+        
+        return tasks
+    
+    def _run_cleanup_task(self, task: CleanupTask, backup_dir: Path) -> bool:
+        """Run one planned task, reporting its start and completion."""
+        self.status.update(task.label)
+        task_success = task.run(backup_dir=backup_dir)
+        self.status.update(task.done_label, step_completed=True)
+        return task_success
     
-    def perform_cleanup_async(self, cleanup_options: Dict[str, Any]) -> threading.Thread:
-        """Perform cleanup in a separate thread."""
-        def cleanup_thread():
-            self.perform_cleanup(cleanup_options)
+    def _run_cleanup_tasks(self, tasks: List[CleanupTask], backup_dir: Path) -> bool:
+        """Run planned tasks in order, overlapping each run of consecutive path-bound tasks."""
+        success = True
+        for path_bound, group in groupby(tasks, key=lambda task: task.path is not None):
+            group = list(group)
+            if path_bound:
+                success &= self._run_task_chains(group, backup_dir)
+            else:
+                for task in group:
+                    success &= self._run_cleanup_task(task, backup_dir)
+        return success
+    
+    def _run_task_chains(self, tasks: List[CleanupTask], backup_dir: Path) -> bool:
+        """Run disk-bound tasks in a thread pool, one chain of conflicting tasks per job."""
+        def run_chain(chain: List[CleanupTask]) -> bool:
+            chain_success = True
+            for task in chain:
+                chain_success &= self._run_cleanup_task(task, backup_dir)
+            return chain_success
         
-        thread = threading.Thread(target=cleanup_thread, daemon=True)
-        thread.start()
-        return thread
+        success = True
+        chains = _chain_conflicting_tasks(tasks)
+        with ThreadPoolExecutor(max_workers=min(_CLEANUP_WORKERS, len(chains))) as executor:
+            for future in as_completed([executor.submit(run_chain, chain) for chain in chains]):
+                success &= future.result()
+        return success
+    
+    def perform_cleanup_async(self, cleanup_options: Dict[str, Any]) -> Future:
+        """Perform cleanup on the background worker; the future resolves to its success."""
+        return self._cleanup_executor.submit(self.perform_cleanup, cleanup_options)
+    
+    def close(self) -> None:
+        """Release the background worker once any queued cleanup has finished."""
+        self._cleanup_executor.shutdown(wait=False)
     
     def generate_discovery_report(self) -> str:
         """Generate a comprehensive discovery report."""
-        report_lines = []
-        
-        report_lines.append("=" * 60)
-        report_lines.append("FREE AUGMENTCODE DATA CLEANER - DISCOVERY REPORT")
-        report_lines.append("=" * 60)
-        report_lines.append("")
+        return "\n".join(self._iter_discovery_report_lines())
+    
+    def write_discovery_report(self, out: TextIO) -> None:
+        """Write the discovery report to a text stream as it is generated."""
+        separator = ""
+        for line in self._iter_discovery_report_lines():
+            out.write(separator)
+            out.write(line)
+            separator = "\n"
+    
+    def _iter_discovery_report_lines(self) -> Iterator[str]:
+        """Yield the discovery report line by line."""
+        yield "=" * 60
+        yield "FREE AUGMENTCODE DATA CLEANER - DISCOVERY REPORT"
+        yield "=" * 60
+        yield ""
         
         # System information
-        report_lines.append(f"Operating System: {OSDetector.get_os_type().title()}")
-        report_lines.append(f"Discovery Time: {time.strftime('%Y-%m-%d %H:%M:%S')}")
-        report_lines.append("")
+        yield f"Operating System: {OSDetector.get_os_type().title()}"
+        yield f"Discovery Time: {time.strftime('%Y-%m-%d %H:%M:%S')}"
+        yield ""
         
         # AugmentCode directories
-        report_lines.append(f"AugmentCode Directories Found: {len(self.augmentcode_paths)}")
+        yield f"AugmentCode Directories Found: {len(self.augmentcode_paths)}"
         for i, path in enumerate(self.augmentcode_paths, 1):
-            report_lines.append(f"  {i}. {path}")
-        report_lines.append("")
+            yield f"  {i}. {path}"
+        yield ""
         
         # Telemetry data
         if self.telemetry_data:
-            telemetry_report = self.telemetry_manager.generate_telemetry_report(self.telemetry_data)
-            report_lines.append(telemetry_report)
-            report_lines.append("")
+            yield from self.telemetry_manager.generate_telemetry_report_lines(self.telemetry_data)
+            yield ""
         
         # Database files
-        report_lines.append(f"Database Files Found: {len(self.database_files)}")
+        yield f"Database Files Found: {len(self.database_files)}"
+        sizes = _batch_stat_sizes(self.database_files)
         for i, db_file in enumerate(self.database_files, 1):
-            try:
-                size = db_file.stat().st_size
+            size = sizes[db_file]
+            if size is not None:
                 size_str = self._format_size(size)
-                report_lines.append(f"  {i}. {db_file} ({size_str})")
-            except OSError:
-                report_lines.append(f"  {i}. {db_file} (size unknown)")
-        report_lines.append("")
+                yield f"  {i}. {db_file} ({size_str})"
+            else:
+                yield f"  {i}. {db_file} (size unknown)"
+        yield ""
         
         # Workspace locations
         if self.workspace_locations:
-            workspace_report = self.workspace_cleaner.generate_workspace_report(self.workspace_locations)
-            report_lines.append(workspace_report)
+            yield from self.workspace_cleaner.generate_workspace_report_lines(self.workspace_locations)
 
         # Account data
         if self.account_data:
-            account_report = self.account_cleaner.generate_account_report(self.account_data)
-            report_lines.append(account_report)
+            yield from self.account_cleaner.generate_account_report_lines(self.account_data)
 
         # IDE scan results
-        ide_report = self.ide_manager.generate_detailed_report()
-        if ide_report:
-            report_lines.append("")
-            report_lines.append(ide_report)
-
-        return "\n".join(report_lines)
+        # Sub-reports are yielded line by line rather than as joined strings
+        ide_report_lines = self.ide_manager.generate_detailed_report_lines()
+        if ide_report_lines:
+            yield ""
+            yield from ide_report_lines
     
     def _format_size(self, size_bytes: int) -> str:
         """Format file size in human-readable format."""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.1f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.1f} TB"
+        if size_bytes < 1024:
+            return f"{size_bytes:.1f} B"
+        # Each unit is 2**10 of the previous one, so the bit length picks it directly
+        unit_index = (size_bytes.bit_length() - 1) // 10
+        if unit_index >= len(_SIZE_UNITS):
+            unit_index = len(_SIZE_UNITS) - 1
+        return f"{size_bytes / (1 << (10 * unit_index)):.1f} {_SIZE_UNITS[unit_index]}"
     
     def get_backup_list(self) -> List[Dict[str, Any]]:
         """Get list of available backups."""
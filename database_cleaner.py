@@ -3,13 +3,130 @@ Free AugmentCode Data Cleaner - Database Cleaner
 Handles SQLite database operations for cleaning AugmentCode data.
 """
 
+import hashlib
 import sqlite3
 import logging
+import threading
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Iterator
 import re
 
 from backup_manager import BackupManager
+from utils import OSDetector
+
+
+# Column names that suggest IDs: ending in "id", or naming a device, user, etc.
+_ID_COLUMN_RE = re.compile(
+    r'id$|device|machine|client|telemetry|session|user|guid|uuid|unique', re.IGNORECASE
+)
+
+# Lowercased table names that commonly hold user/session data
+_CLEANUP_TABLE_RE = re.compile(
+    r'account|user|session|login|auth|telemetry|analytics|log|history|'
+    r'workspace|project|setting|preference'
+)
+
+# Lowercased table names for account data
+_ACCOUNT_TABLE_RE = re.compile(
+    r'account|user|profile|login|auth|credential|identity|member|person|contact'
+)
+
+# Lowercased column names for emails ("mail" also covers email, e_mail) and
+# user identifiers ("user" also covers username)
+_EMAIL_COLUMN_RE = re.compile(r'mail')
+_USER_COLUMN_RE = re.compile(r'user|account|login')
+
+
+# Without incremental auto-vacuum, only rewrite the whole file with VACUUM
+# once cleanup has left at least this much free space in it
+_VACUUM_MIN_FREE_BYTES = 50 * 1024 * 1024
+
+# PRAGMA auto_vacuum value for databases that free pages on request
+_AUTO_VACUUM_INCREMENTAL = 2
+
+# Bytes of each database SQLite may memory-map, so the keyword scans read pages
+# straight from the mapping instead of copying them through the page cache
+_MMAP_SIZE = 256 * 1024 * 1024
+
+# Tables emptied by the clear_session_data option
+_SESSION_TABLES = ('sessions', 'session', 'user_sessions', 'login_sessions')
+
+# Rows fetched from SQLite at a time when streaming search results
+_FETCH_BATCH_SIZE = 1000
+
+
+def _is_text_type(column_type: str) -> bool:
+    """Whether a declared column type holds text (TEXT, VARCHAR, CHAR and the like)."""
+    column_type = column_type.upper()
+    # 'CHAR' also covers VARCHAR
+    return 'TEXT' in column_type or 'CHAR' in column_type
+
+
+# Keys of the dict form of an AugmentRecord
+_RECORD_KEYS = ('table', 'rowid', 'data', 'matching_columns')
+
+
+class AugmentRecord:
+    """A database row found by a keyword search.
+    
+    Keeps the row tuple as fetched and shares the table's column name list
+    with every other record from that table; 'data' builds the column dict
+    only when asked for.
+    """
+
+    __slots__ = ('table', 'rowid', 'values', 'column_names', 'matching_columns')
+
+    def __init__(self, table: str, rowid: Any, values: Tuple[Any, ...],
+                 column_names: List[str], matching_columns: List[str]):
+        self.table = table
+        self.rowid = rowid
+        self.values = values
+        self.column_names = column_names
+        self.matching_columns = matching_columns
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        """The row as a column name -> value dict."""
+        return dict(zip(self.column_names, self.values))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the record in its old dict form, e.g. for JSON serialization."""
+        return {
+            'table': self.table,
+            'rowid': self.rowid,
+            'data': self.data,
+            'matching_columns': self.matching_columns
+        }
+
+    # Read-only mapping access for callers written against the old dict records
+    def __getitem__(self, name: str) -> Any:
+        if name in _RECORD_KEYS:
+            return getattr(self, name)
+        raise KeyError(name)
+
+    def __contains__(self, name: Any) -> bool:
+        return name in _RECORD_KEYS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_RECORD_KEYS)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Return a field like dict.get, or default for unknown names."""
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    # Equal by (mutable) contents like the dicts they replace, so unhashable too
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
 
 
 class DatabaseCleaner:
@@ -18,9 +135,48 @@ class DatabaseCleaner:
     def __init__(self, backup_manager: BackupManager):
         self.logger = logging.getLogger('FreeAugmentCode.DatabaseCleaner')
         self.backup_manager = backup_manager
+        # Open connections by resolved database path, reused until close_all()
+        self._connections: Dict[Path, sqlite3.Connection] = {}
+        self._connections_lock = threading.Lock()
+        # (connection, table name) -> table schema, see _table_schema()
+        self._schemas: Dict[Tuple[sqlite3.Connection, str], Dict[str, List[Any]]] = {}
+        # Connections with an audit database attached, see _delete_rows(),
+        # and whether copying rows into it has failed during this cleanup
+        self._audited: Dict[sqlite3.Connection, bool] = {}
+    
+    def _get_connection(self, db_path: Path) -> sqlite3.Connection:
+        """Return the open connection to a database, opening it on first use."""
+        key = db_path.resolve()
+        with self._connections_lock:
+            conn = self._connections.get(key)
+            if conn is None:
+                # Cleanup works on each database from a pool thread, but only
+                # one thread uses a given database at a time
+                conn = sqlite3.connect(key, check_same_thread=False)
+                # A per-connection setting, nothing is written to the file.
+                # Windows can't truncate a file while it is mapped, which
+                # would get in the way of VACUUM shrinking it
+                if not OSDetector.is_windows():
+                    mmap_size = conn.execute(f"PRAGMA mmap_size={_MMAP_SIZE};").fetchone()
+                    self.logger.debug(f"mmap_size for {key}: {mmap_size[0] if mmap_size else 0}")
+                self._connections[key] = conn
+            return conn
+    
+    def close_all(self) -> None:
+        """Close all cached connections, e.g. once a cleanup run is over."""
+        with self._connections_lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+            self._schemas.clear()
+        for conn in connections:
+            conn.close()
     
-    def analyze_database(self, db_path: Path) -> Dict[str, Any]:
-        """Analyze a SQLite database to understand its structure."""
+    def analyze_database(self, db_path: Path, exact_counts: bool = False) -> Dict[str, Any]:
+        """Analyze a SQLite database to understand its structure.
+        
+        Row counts cost a full table scan each, so unless exact_counts is set
+        tables only record whether they have rows and 'row_count' is None.
+        """
         if not db_path.exists():
             self.logger.error(f"Database file does not exist: {db_path}")
             return {}
@@ -33,45 +189,50 @@ class DatabaseCleaner:
         }
         
         try:
-            with sqlite3.connect(db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Get all tables
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-                table_names = [row[0] for row in cursor.fetchall()]
-                
-                for table_name in table_names:
-                    table_info = self._analyze_table(cursor, table_name)
-                    analysis['tables'].append(table_info)
-                    
-                    # Check if this table might contain data we want to clean
-                    if self._is_potential_cleanup_target(table_info):
-                        analysis['potential_cleanup_targets'].append(table_info)
-                
-                self.logger.info(f"Analyzed database {db_path}: {len(table_names)} tables, "
-                               f"{len(analysis['potential_cleanup_targets'])} potential cleanup targets")
+            # Read-only, so no transaction is committed on a connection the
+            # caller may be in the middle of cleaning with
+            cursor = self._get_connection(db_path).cursor()
+            
+            analysis['tables'] = self._analyze_tables(cursor, exact_counts)
+            
+            # Check which tables might contain data we want to clean
+            analysis['potential_cleanup_targets'] = [
+                table_info for table_info in analysis['tables']
+                if self._is_potential_cleanup_target(table_info)
+            ]
+            
+            self.logger.info(f"Analyzed database {db_path}: {len(analysis['tables'])} tables, "
+                           f"{len(analysis['potential_cleanup_targets'])} potential cleanup targets")
         
         except sqlite3.Error as e:
             self.logger.error(f"Error analyzing database {db_path}: {e}")
         
         return analysis
     
-    def _analyze_table(self, cursor: sqlite3.Cursor, table_name: str) -> Dict[str, Any]:
+    def _analyze_tables(self, cursor: sqlite3.Cursor,
+                        exact_counts: bool = False) -> List[Dict[str, Any]]:
+        """Analyze every table of the database the cursor is connected to."""
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
+        table_names = [row[0] for row in cursor.fetchall()]
+        return [self._analyze_table(cursor, table_name, exact_counts) for table_name in table_names]
+    
+    def _analyze_table(self, cursor: sqlite3.Cursor, table_name: str,
+                       exact_count: bool = False) -> Dict[str, Any]:
         """Analyze a single table structure and content."""
         table_info = {
             'name': table_name,
             'columns': [],
-            'row_count': 0,
+            'row_count': 0 if exact_count else None,
+            'has_rows': False,
             'text_columns': [],
             'potential_id_columns': []
         }
         
         try:
             # Get table schema
-            cursor.execute(f"PRAGMA table_info({table_name});")
-            columns = cursor.fetchall()
+            schema = self._table_schema(cursor, table_name)
             
-            for col in columns:
+            for col in schema['columns']:
                 col_info = {
                     'name': col[1],
                     'type': col[2],
@@ -81,105 +242,110 @@ class DatabaseCleaner:
                 }
                 table_info['columns'].append(col_info)
                 
-                # Track text columns for keyword searching
-                if 'TEXT' in col[2].upper() or 'VARCHAR' in col[2].upper() or 'CHAR' in col[2].upper():
-                    table_info['text_columns'].append(col[1])
-                
                 # Track potential ID columns
                 if self._is_potential_id_column(col[1]):
                     table_info['potential_id_columns'].append(col[1])
             
-            # Get row count
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name};")
-            table_info['row_count'] = cursor.fetchone()[0]
+            # Text columns are searched for keywords
+            table_info['text_columns'] = list(schema['text_columns'])
+            
+            if exact_count:
+                cursor.execute(f"SELECT COUNT(*) FROM {table_name};")
+                table_info['row_count'] = cursor.fetchone()[0]
+                table_info['has_rows'] = table_info['row_count'] > 0
+            else:
+                table_info['has_rows'] = self._table_has_rows(cursor, table_name)
             
         except sqlite3.Error as e:
             self.logger.error(f"Error analyzing table {table_name}: {e}")
         
         return table_info
     
+    @staticmethod
+    def _table_has_rows(cursor: sqlite3.Cursor, table_name: str) -> bool:
+        """Whether a table holds any row; stops at the first one instead of counting."""
+        cursor.execute(f"SELECT EXISTS(SELECT 1 FROM {table_name});")
+        return bool(cursor.fetchone()[0])
+    
+    def _table_schema(self, cursor: sqlite3.Cursor, table_name: str) -> Dict[str, List[Any]]:
+        """Return a table's PRAGMA table_info rows, column names and text columns.
+        
+        Read once per connection: analysis, search and every cleanup step
+        would otherwise each query and classify the same columns again.
+        """
+        key = (cursor.connection, table_name)
+        schema = self._schemas.get(key)
+        if schema is None:
+            cursor.execute(f"PRAGMA table_info({table_name});")
+            columns = cursor.fetchall()
+            schema = {
+                'columns': columns,
+                'column_names': [col[1] for col in columns],
+                'text_columns': [col[1] for col in columns if _is_text_type(col[2])],
+            }
+            self._schemas[key] = schema
+        return schema
+    
     def _is_potential_id_column(self, column_name: str) -> bool:
         """Check if a column name suggests it might contain IDs."""
-        id_patterns = [
-            r'.*id$', r'.*_id$', r'.*Id$',
-            r'device.*', r'machine.*', r'client.*',
-            r'telemetry.*', r'session.*', r'user.*',
-            r'guid.*', r'uuid.*', r'unique.*'
-        ]
-        
-        for pattern in id_patterns:
-            if re.search(pattern, column_name, re.IGNORECASE):
-                return True
-        return False
+        return _ID_COLUMN_RE.search(column_name) is not None
     
     def _is_potential_cleanup_target(self, table_info: Dict[str, Any]) -> bool:
         """Determine if a table is a potential target for cleanup."""
         table_name = table_info['name'].lower()
         
         # Tables that commonly contain user/session data
-        target_patterns = [
-            'account', 'user', 'session', 'login', 'auth',
-            'telemetry', 'analytics', 'log', 'history',
-            'workspace', 'project', 'setting', 'preference'
-        ]
-        
-        for pattern in target_patterns:
-            if pattern in table_name:
-                return True
+        if _CLEANUP_TABLE_RE.search(table_name):
+            return True
         
         # Tables with potential ID columns
         if table_info['potential_id_columns']:
             return True
         
         # Tables with text columns (for keyword search)
-        if table_info['text_columns'] and table_info['row_count'] > 0:
+        if table_info['text_columns'] and table_info['has_rows']:
             return True
         
         return False
     
     def search_for_augment_records(self, db_path: Path, 
-                                  tables_to_search: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+                                  tables_to_search: Optional[List[str]] = None) -> List[AugmentRecord]:
         """Search for records containing 'augment' keyword in the database."""
-        found_records = []
-        
+        found_records = list(self.iter_augment_records(db_path, tables_to_search))
+        self.logger.info(f"Found {len(found_records)} records containing 'augment' keyword")
+        return found_records
+    
+    def iter_augment_records(self, db_path: Path,
+                             tables_to_search: Optional[List[str]] = None) -> Iterator[AugmentRecord]:
+        """Yield records containing 'augment' keyword as they are read, table by table."""
         if not db_path.exists():
             self.logger.error(f"Database file does not exist: {db_path}")
-            return found_records
+            return
         
         try:
-            with sqlite3.connect(db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Get tables to search
-                if tables_to_search is None:
-                    analysis = self.analyze_database(db_path)
-                    tables_to_search = [t['name'] for t in analysis['potential_cleanup_targets']]
-                
-                for table_name in tables_to_search:
-                    table_records = self._search_table_for_keyword(cursor, table_name, 'augment')
-                    found_records.extend(table_records)
-                
-                self.logger.info(f"Found {len(found_records)} records containing 'augment' keyword")
+            cursor = self._get_connection(db_path).cursor()
+            
+            # Get tables to search
+            if tables_to_search is None:
+                analysis = self.analyze_database(db_path)
+                tables_to_search = [t['name'] for t in analysis['potential_cleanup_targets']]
+            
+            for table_name in tables_to_search:
+                yield from self._iter_table_for_keyword(cursor, table_name, 'augment')
         
         except sqlite3.Error as e:
             self.logger.error(f"Error searching database {db_path}: {e}")
-        
-        return found_records
     
-    def _search_table_for_keyword(self, cursor: sqlite3.Cursor, table_name: str, 
-                                 keyword: str) -> List[Dict[str, Any]]:
-        """Search a specific table for records containing a keyword."""
-        found_records = []
-        
+    def _iter_table_for_keyword(self, cursor: sqlite3.Cursor, table_name: str, 
+                                keyword: str) -> Iterator[AugmentRecord]:
+        """Yield the records of a specific table containing a keyword."""
         try:
             # Get table structure
-            cursor.execute(f"PRAGMA table_info({table_name});")
-            columns = cursor.fetchall()
-            text_columns = [col[1] for col in columns if 'TEXT' in col[2].upper() or 
-                           'VARCHAR' in col[2].upper() or 'CHAR' in col[2].upper()]
+            schema = self._table_schema(cursor, table_name)
+            text_columns = schema['text_columns']
             
             if not text_columns:
-                return found_records
+                return
             
             # Build WHERE clause for text columns
             where_conditions = []
@@ -194,27 +360,27 @@ class DatabaseCleaner:
             cursor.execute(query, search_params)
             
             # Get column names for result mapping
-            column_names = ['rowid'] + [col[1] for col in columns]
+            column_names = schema['column_names']
+            # Only text columns can match; their positions in each row are fixed
+            text_positions = [(i, col_name) for i, col_name in enumerate(column_names, 1)
+                              if col_name in text_columns]
+            keyword_lower = keyword.lower()
             
-            for row in cursor.fetchall():
-                record = {
-                    'table': table_name,
-                    'rowid': row[0],
-                    'data': dict(zip(column_names[1:], row[1:])),
-                    'matching_columns': []
-                }
-                
-                # Identify which columns contain the keyword
-                for i, col_name in enumerate(column_names[1:], 1):
-                    if col_name in text_columns and row[i] and keyword.lower() in str(row[i]).lower():
-                        record['matching_columns'].append(col_name)
-                
-                found_records.append(record)
+            # Rows are read in batches, so memory stays bounded however many match
+            while True:
+                rows = cursor.fetchmany(_FETCH_BATCH_SIZE)
+                if not rows:
+                    break
+                for row in rows:
+                    yield AugmentRecord(
+                        table_name, row[0], row[1:], column_names,
+                        # Identify which columns contain the keyword
+                        [col_name for i, col_name in text_positions
+                         if row[i] and keyword_lower in str(row[i]).lower()]
+                    )
         
         except sqlite3.Error as e:
             self.logger.error(f"Error searching table {table_name}: {e}")
-        
-        return found_records
     
     def clean_database(self, db_path: Path, backup_dir: Path, 
                       cleanup_options: Dict[str, Any]) -> bool:
@@ -228,9 +394,25 @@ class DatabaseCleaner:
             self.logger.error("Failed to backup database before cleaning")
             return False
         
+        conn = None
         try:
-            with sqlite3.connect(db_path) as conn:
+            conn = self._get_connection(db_path)
+            # Zero deleted records in place, so they don't linger in free pages
+            # when the file isn't vacuumed afterwards
+            conn.execute("PRAGMA secure_delete=ON;")
+            if cleanup_options.get('audit', False):
+                # Deleted rows are copied here first; ATTACH isn't allowed
+                # inside the transaction below
+                audit_path = self._audit_path(db_path, backup_dir)
+                audit_path.parent.mkdir(parents=True, exist_ok=True)
+                conn.execute("ATTACH DATABASE ? AS audit;", (str(audit_path),))
+                self._audited[conn] = False
+            # The connection's context manager commits or rolls back, it doesn't close
+            with conn:
                 cursor = conn.cursor()
+                # One write transaction for every step, taken up front so a
+                # database that is in use fails before anything is changed
+                cursor.execute("BEGIN IMMEDIATE;")
                 
                 success = True
                 
@@ -250,19 +432,79 @@ class DatabaseCleaner:
                 if cleanup_options.get('clear_session_data', False):
                     success &= self._clear_session_data(cursor, cleanup_options)
                 
-                if success:
-                    # Vacuum database to reclaim space
-                    cursor.execute("VACUUM;")
-                    conn.commit()
-                    self.logger.info("Database cleaning completed successfully")
-                else:
-                    self.logger.warning("Database cleaning completed with some errors")
-                
-                return success
+                # Rows whose audit copy failed must not be deleted; raising
+                # rolls back every step of this database's cleanup
+                if self._audited.get(conn):
+                    raise sqlite3.Error("copying deleted rows to the audit database failed")
+            
+            if success:
+                self._reclaim_free_space(conn, db_path)
+                self.logger.info("Database cleaning completed successfully")
+            else:
+                self.logger.warning("Database cleaning completed with some errors")
+            
+            return success
         
         except sqlite3.Error as e:
             self.logger.error(f"Error cleaning database {db_path}: {e}")
             return False
+        
+        finally:
+            if conn in self._audited:
+                del self._audited[conn]
+                try:
+                    conn.execute("DETACH DATABASE audit;")
+                except sqlite3.Error as e:
+                    self.logger.warning(f"Could not detach audit database from {db_path}: {e}")
+    
+    @staticmethod
+    def _audit_path(db_path: Path, backup_dir: Path) -> Path:
+        """Return the audit database for one database file.
+        
+        IDEs all call their state database state.vscdb, so the name alone
+        would put rows from different databases (and schemas) in one table;
+        a hash of the resolved path keeps each database's audit separate.
+        """
+        digest = hashlib.sha1(str(db_path.resolve()).encode('utf-8')).hexdigest()[:12]
+        return backup_dir / 'database' / f"{db_path.name}.{digest}.audit.db"
+    
+    def _delete_rows(self, cursor: sqlite3.Cursor, table_name: str,
+                     where_clause: str = '', params: Any = ()) -> int:
+        """Delete matching rows (all rows without a WHERE clause) and return how many went.
+        
+        When cleaning with auditing on, the rows are first copied into a table
+        of the same name in the attached audit database, within the same
+        transaction as the DELETE.
+        """
+        where = f" WHERE {where_clause}" if where_clause else ""
+        conn = cursor.connection
+        if conn in self._audited:
+            try:
+                cursor.execute(f"CREATE TABLE IF NOT EXISTS audit.{table_name} AS "
+                               f"SELECT * FROM main.{table_name} WHERE 0;")
+                cursor.execute(f"INSERT INTO audit.{table_name} SELECT * FROM main.{table_name}{where};", params)
+            except sqlite3.Error:
+                # The cleanup steps log and carry on past table errors, so
+                # also flag the failure for clean_database to roll back on
+                self._audited[conn] = True
+                raise
+        cursor.execute(f"DELETE FROM main.{table_name}{where};", params)
+        return cursor.rowcount
+    
+    def _reclaim_free_space(self, conn: sqlite3.Connection, db_path: Path) -> None:
+        """Shrink the database file after cleanup, outside any transaction."""
+        if conn.execute("PRAGMA auto_vacuum;").fetchone()[0] == _AUTO_VACUUM_INCREMENTAL:
+            # Frees one page per step; executescript steps it to the end,
+            # where execute() would stop after the first page
+            conn.executescript("PRAGMA incremental_vacuum;")
+            return
+        
+        page_size = conn.execute("PRAGMA page_size;").fetchone()[0]
+        free_pages = conn.execute("PRAGMA freelist_count;").fetchone()[0]
+        if free_pages * page_size >= _VACUUM_MIN_FREE_BYTES:
+            # VACUUM rewrites the whole file, so it's only worth it for a lot of space
+            conn.execute("VACUUM;")
+            self.logger.info(f"Vacuumed {db_path} to reclaim {free_pages * page_size} bytes")
     
     def _remove_augment_records(self, cursor: sqlite3.Cursor, 
                                options: Dict[str, Any]) -> bool:
@@ -270,9 +512,9 @@ class DatabaseCleaner:
         try:
             tables_to_clean = options.get('tables_to_clean', [])
             if not tables_to_clean:
-                # Auto-detect tables
-                analysis = self.analyze_database(Path(cursor.connection.execute("PRAGMA database_list").fetchone()[2]))
-                tables_to_clean = [t['name'] for t in analysis['potential_cleanup_targets']]
+                # Auto-detect tables, on the cursor the cleanup already holds
+                tables_to_clean = [t['name'] for t in self._analyze_tables(cursor)
+                                   if self._is_potential_cleanup_target(t)]
             
             total_deleted = 0
             
@@ -295,12 +537,12 @@ class DatabaseCleaner:
         """Delete records containing a keyword from a specific table."""
         try:
             # Get table structure
-            cursor.execute(f"PRAGMA table_info({table_name});")
-            columns = cursor.fetchall()
-            text_columns = [col[1] for col in columns if 'TEXT' in col[2].upper() or 
-                           'VARCHAR' in col[2].upper() or 'CHAR' in col[2].upper()]
+            schema = self._table_schema(cursor, table_name)
+            text_columns = schema['text_columns']
             
-            if not text_columns:
+            # Most tables in IDE state databases are empty; probing is much
+            # cheaper than compiling and running a DELETE against each
+            if not text_columns or not self._table_has_rows(cursor, table_name):
                 return 0
             
             # Build WHERE clause
@@ -309,13 +551,10 @@ class DatabaseCleaner:
                 where_conditions.append(f"{col} LIKE ?")
             
             where_clause = " OR ".join(where_conditions)
-            delete_query = f"DELETE FROM {table_name} WHERE {where_clause};"
             
             # Execute deletion
             search_params = [f'%{keyword}%'] * len(text_columns)
-            cursor.execute(delete_query, search_params)
-            
-            return cursor.rowcount
+            return self._delete_rows(cursor, table_name, where_clause, search_params)
         
         except sqlite3.Error as e:
             self.logger.error(f"Error deleting records from {table_name}: {e}")
@@ -329,24 +568,13 @@ class DatabaseCleaner:
             # Get target email if specified
             target_email = options.get('target_email', '')
 
-            # Common account-related table patterns
-            account_table_patterns = [
-                'account', 'user', 'profile', 'login', 'auth', 'credential',
-                'identity', 'member', 'person', 'contact'
-            ]
-
             # Get all tables
             cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
             all_tables = [row[0] for row in cursor.fetchall()]
 
             # Find account-related tables
-            account_tables = []
-            for table in all_tables:
-                table_lower = table.lower()
-                for pattern in account_table_patterns:
-                    if pattern in table_lower:
-                        account_tables.append(table)
-                        break
+            account_tables = [table for table in all_tables
+                              if _ACCOUNT_TABLE_RE.search(table.lower())]
 
             # Remove data from account tables
             for table_name in account_tables:
@@ -371,9 +599,11 @@ class DatabaseCleaner:
     def _clean_account_table(self, cursor: sqlite3.Cursor, table_name: str, target_email: str = '') -> int:
         """Clean account data from a specific table."""
         try:
+            if not self._table_has_rows(cursor, table_name):
+                return 0
+
             # Get table structure
-            cursor.execute(f"PRAGMA table_info({table_name});")
-            columns = [row[1] for row in cursor.fetchall()]
+            columns = self._table_schema(cursor, table_name)['column_names']
 
             # Find email and user identifier columns
             email_columns = []
@@ -381,9 +611,9 @@ class DatabaseCleaner:
 
             for col in columns:
                 col_lower = col.lower()
-                if any(pattern in col_lower for pattern in ['email', 'mail', 'e_mail']):
+                if _EMAIL_COLUMN_RE.search(col_lower):
                     email_columns.append(col)
-                elif any(pattern in col_lower for pattern in ['user', 'account', 'login', 'username']):
+                elif _USER_COLUMN_RE.search(col_lower):
                     user_id_columns.append(col)
 
             deleted_count = 0
@@ -391,12 +621,10 @@ class DatabaseCleaner:
             if target_email and email_columns:
                 # Remove specific email
                 for email_col in email_columns:
-                    cursor.execute(f"DELETE FROM {table_name} WHERE {email_col} = ?;", (target_email,))
-                    deleted_count += cursor.rowcount
+                    deleted_count += self._delete_rows(cursor, table_name, f"{email_col} = ?", (target_email,))
             else:
                 # Remove all account data if no specific email
-                cursor.execute(f"DELETE FROM {table_name};")
-                deleted_count = cursor.rowcount
+                deleted_count = self._delete_rows(cursor, table_name)
 
             return deleted_count
 
@@ -411,26 +639,26 @@ class DatabaseCleaner:
         for table_name in tables:
             try:
                 # Get table structure
-                cursor.execute(f"PRAGMA table_info({table_name});")
-                columns = [row[1] for row in cursor.fetchall()]
+                columns = self._table_schema(cursor, table_name)['column_names']
+
+                if not columns:
+                    continue
 
-                # Find text columns that might contain emails
-                text_columns = []
-                for col in columns:
-                    cursor.execute(f"SELECT {col} FROM {table_name} LIMIT 1;")
-                    sample = cursor.fetchone()
-                    if sample and isinstance(sample[0], str):
-                        text_columns.append(col)
+                # Find text columns that might contain emails. Declared types
+                # aren't enough (VS Code keeps JSON text in a BLOB column), so
+                # check the stored types of one row, all columns at once
+                cursor.execute(f"SELECT {', '.join(f'typeof({col})' for col in columns)} "
+                               f"FROM {table_name} LIMIT 1;")
+                sample = cursor.fetchone() or ()
+                text_columns = [col for col, value_type in zip(columns, sample) if value_type == 'text']
 
                 # Remove records containing the email
                 if text_columns:
                     where_conditions = [f"{col} LIKE ?" for col in text_columns]
                     where_clause = " OR ".join(where_conditions)
-                    delete_query = f"DELETE FROM {table_name} WHERE {where_clause};"
 
                     search_params = [f'%{email}%'] * len(text_columns)
-                    cursor.execute(delete_query, search_params)
-                    total_deleted += cursor.rowcount
+                    total_deleted += self._delete_rows(cursor, table_name, where_clause, search_params)
 
             except sqlite3.Error:
                 # Skip tables that cause errors
@@ -449,18 +677,22 @@ class DatabaseCleaner:
     def _clear_session_data(self, cursor: sqlite3.Cursor, options: Dict[str, Any]) -> bool:
         """Clear session data from the database."""
         try:
-            # Common session table names
-            session_tables = ['sessions', 'session', 'user_sessions', 'login_sessions']
+            # Common session table names; look up which exist in one query
+            # rather than attempting a DELETE on each and catching the failures
+            # (lower() because SQLite matches table names case-insensitively)
+            cursor.execute(
+                "SELECT lower(name) FROM sqlite_master WHERE type='table' "
+                f"AND lower(name) IN ({', '.join('?' * len(_SESSION_TABLES))});",
+                _SESSION_TABLES
+            )
+            existing = {row[0] for row in cursor.fetchall()}
             
             deleted_count = 0
-            for table_name in session_tables:
-                try:
-                    cursor.execute(f"DELETE FROM {table_name};")
-                    deleted_count += cursor.rowcount
-                    self.logger.info(f"Cleared {cursor.rowcount} records from {table_name}")
-                except sqlite3.OperationalError:
-                    # Table doesn't exist, continue
-                    continue
+            for table_name in _SESSION_TABLES:
+                if table_name in existing:
+                    cleared = self._delete_rows(cursor, table_name)
+                    deleted_count += cleared
+                    self.logger.info(f"Cleared {cleared} records from {table_name}")
             
             self.logger.info(f"Total session records cleared: {deleted_count}")
             return True
@@ -4,9 +4,10 @@ Handles multiple IDEs and provides precise AugmentCode detection and cleanup.
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from utils import IDEDetector, OSDetector
+from typing import Dict, List, Any, Optional, Tuple
+from utils import IDEDetector, OSDetector, DirectorySnapshot
 
 
 class AugmentCodeIDEManager:
@@ -16,7 +17,24 @@ class AugmentCodeIDEManager:
         self.logger = logging.getLogger(__name__)
         self.detected_installations = {}
         self.running_processes = []
-        
+        self._installations_cache: Optional[Tuple[Tuple, Dict[str, List[Dict[str, Any]]]]] = None
+    
+    def invalidate_scan_cache(self) -> None:
+        """Forget cached installation results so the next scan walks the IDE directories again."""
+        self._installations_cache = None
+    
+    def _installations_fingerprint(self) -> Tuple:
+        """Fingerprint every entry under the IDE directories the installation scan walks."""
+        # The scan reports files anywhere in these trees, with their sizes, so
+        # any change at any depth must invalidate it
+        os_type = OSDetector.get_os_type()
+        home = Path.home()
+        ide_paths = [Path(config_path) if config_path.startswith('/') else home / config_path
+                     for ide_info in IDEDetector.SUPPORTED_IDES.values()
+                     for config_path in ide_info['config_paths'].get(os_type, [])]
+        return os_type, DirectorySnapshot(ide_paths).fingerprint()
+    
+
     def perform_comprehensive_scan(self) -> Dict[str, Any]:
         """Perform a comprehensive scan for AugmentCode across all supported IDEs."""
         self.logger.info("Starting comprehensive AugmentCode IDE scan...")
@@ -30,20 +48,31 @@ class AugmentCodeIDEManager:
         }
         
         try:
-            # Step 1: Detect running processes
+            # Step 1: Detect running processes on a worker thread; walking the
+            # process table overlaps with the installation scan below
             self.logger.info("Scanning for running AugmentCode processes...")
-            self.running_processes = IDEDetector.detect_running_augmentcode_processes()
-            scan_results['running_processes'] = self.running_processes
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix='procscan') as executor:
+                processes_future = executor.submit(IDEDetector.detect_running_augmentcode_processes)
+                
+                # Step 2: Detect IDE installations, unless nothing has changed since
+                # the last scan; running processes above are always re-detected
+                fingerprint = self._installations_fingerprint()
+                if self._installations_cache is not None and self._installations_cache[0] == fingerprint:
+                    self.logger.info("IDE installations unchanged since the last scan, reusing results")
+                    self.detected_installations = self._installations_cache[1]
+                else:
+                    self.logger.info("Scanning IDE installations for AugmentCode...")
+                    self.detected_installations = IDEDetector.detect_ide_installations_parallel()
+                    self._installations_cache = (fingerprint, self.detected_installations)
+                
+                self.running_processes = processes_future.result()
             
+            scan_results['running_processes'] = self.running_processes
             if self.running_processes:
                 scan_results['warnings'].append(
                     f"Found {len(self.running_processes)} running processes with AugmentCode. "
                     "These should be closed before cleanup."
                 )
-            
-            # Step 2: Detect IDE installations
-            self.logger.info("Scanning IDE installations for AugmentCode...")
-            self.detected_installations = IDEDetector.detect_ide_installations()
             scan_results['ide_installations'] = self.detected_installations
             
             # Step 3: Calculate totals and generate recommendations
@@ -126,10 +155,11 @@ class AugmentCodeIDEManager:
                     data = installation['augmentcode_data']
                     
                     # Add all AugmentCode-related files
-                    for file_list in [data['config_files'], data['workspace_data'], data['cache_files']]:
-                        for file_info in file_list:
-                            cleanup_targets['files_to_clean'].append(file_info)
-                            cleanup_targets['total_size_estimate'] += file_info.get('size', 0)
+                    for file_list in (data['config_files'], data['workspace_data'], data['cache_files']):
+                        cleanup_targets['files_to_clean'].extend(file_list)
+                        cleanup_targets['total_size_estimate'] += sum(
+                            file_info.get('size', 0) for file_info in file_list
+                        )
                     
                     # Add extension directories
                     for ext_info in data['extensions']:
@@ -168,10 +198,14 @@ class AugmentCodeIDEManager:
     
     def generate_detailed_report(self) -> str:
         """Generate a detailed report for user review."""
+        return "\n".join(self.generate_detailed_report_lines())
+    
+    def generate_detailed_report_lines(self) -> List[str]:
+        """Return the detailed report as lines that can be spliced into another report."""
         if not self.detected_installations and not self.running_processes:
-            return "No AugmentCode installations detected across any supported IDEs."
+            return ["No AugmentCode installations detected across any supported IDEs."]
         
-        return IDEDetector.generate_ide_report(
+        return IDEDetector.generate_ide_report_lines(
             self.detected_installations, 
             self.running_processes
         )
@@ -4,15 +4,45 @@ A comprehensive tool for cleaning AugmentCode data to enable unlimited logins.
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog, scrolledtext
-import threading
+from tkinter import ttk, messagebox, scrolledtext
+import multiprocessing
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import sys
 
-from data_cleaner import FreeAugmentCodeCleaner, DataCleanerStatus
-from utils import OSDetector
+
+# Lines the log widget may hold; past that, the oldest are deleted down to
+# _LOG_TRIM_LINES so inserts don't keep getting slower over a long session
+_LOG_MAX_LINES = 5000
+_LOG_TRIM_LINES = 4000
+
+
+# Units for human-readable sizes, each 1024 times the previous
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+
+@lru_cache(maxsize=4096)
+def _format_size(size_bytes: int) -> str:
+    """Format a byte count for display; many backups share a size, so results are cached."""
+    if size_bytes < 1024:
+        return f"{size_bytes:.1f} B"
+    # Each unit is 2**10 of the previous one, so the bit length picks it directly
+    unit_index = min((size_bytes.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * unit_index)):.1f} {_SIZE_UNITS[unit_index]}"
+
+
+@lru_cache(maxsize=1024)
+def _format_backup_timestamp(timestamp: str) -> str:
+    """Format a manifest's ISO timestamp for the backup list, or return it as is if it doesn't parse."""
+    try:
+        return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).strftime('%Y-%m-%d %H:%M')
+    except ValueError:
+        return timestamp
 
 
 class FreeAugmentCodeGUI:
@@ -24,10 +54,24 @@ class FreeAugmentCodeGUI:
         self.root.geometry("900x700")
         self.root.resizable(True, True)
         
-        # Initialize data cleaner
+        # Initialize data cleaner. Imported here rather than at module level:
+        # it pulls in every cleaner module, which processes that re-import
+        # this module (spawned config-search workers) have no use for
+        from data_cleaner import FreeAugmentCodeCleaner
         self.cleaner = FreeAugmentCodeCleaner()
         self.discovery_complete = False
-        self.cleanup_thread = None
+        # Discovery report rendered once per discovery, for display and saving
+        self._last_report: Optional[str] = None
+        # Auto-detection, discovery and backup listing run one at a time on
+        # this worker, so they never touch the cleaner's state concurrently;
+        # cleanup runs on the cleaner's own worker
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix='augui')
+        self.discovery_future = None
+        self.cleanup_future = None
+        self.status_log_seen = 0
+        # Log lines waiting for the next update_status_loop tick; appended from
+        # worker threads too, which must not touch Tk widgets themselves
+        self._log_queue = deque()
         
         # GUI variables
         self.augmentcode_path_var = tk.StringVar()
@@ -46,32 +90,33 @@ class FreeAugmentCodeGUI:
         self.remove_all_accounts_var = tk.BooleanVar(value=False)
         
         self.setup_gui()
-        self.update_status_loop()
+        # Polling starts once the event loop is running
+        self.root.after_idle(self.update_status_loop)
     
     def setup_gui(self):
         """Setup the main GUI layout."""
         # Create main notebook for tabs
-        notebook = ttk.Notebook(self.root)
-        notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.notebook = ttk.Notebook(self.root)
+        self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         # Main tab
-        main_frame = ttk.Frame(notebook)
-        notebook.add(main_frame, text="Main")
+        main_frame = ttk.Frame(self.notebook)
+        self.notebook.add(main_frame, text="Main")
         self.setup_main_tab(main_frame)
         
         # Discovery tab
-        discovery_frame = ttk.Frame(notebook)
-        notebook.add(discovery_frame, text="Discovery")
-        self.setup_discovery_tab(discovery_frame)
+        self.discovery_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.discovery_frame, text="Discovery")
+        self.setup_discovery_tab(self.discovery_frame)
         
         # Backup tab
-        backup_frame = ttk.Frame(notebook)
-        notebook.add(backup_frame, text="Backups")
+        backup_frame = ttk.Frame(self.notebook)
+        self.notebook.add(backup_frame, text="Backups")
         self.setup_backup_tab(backup_frame)
         
         # About tab
-        about_frame = ttk.Frame(notebook)
-        notebook.add(about_frame, text="About")
+        about_frame = ttk.Frame(self.notebook)
+        self.notebook.add(about_frame, text="About")
         self.setup_about_tab(about_frame)
     
     def setup_main_tab(self, parent):
@@ -207,6 +252,8 @@ class FreeAugmentCodeGUI:
     
     def setup_about_tab(self, parent):
         """Setup the about tab."""
+        from utils import OSDetector
+        
         about_text = """
 Free AugmentCode Data Cleaner v1.1 - Enhanced Email Support
 
@@ -241,6 +288,8 @@ Operating System: {}
     
     def browse_augmentcode_path(self):
         """Browse for AugmentCode installation directory."""
+        from tkinter import filedialog
+        
         directory = filedialog.askdirectory(title="Select AugmentCode Directory")
         if directory:
             self.augmentcode_path_var.set(directory)
@@ -252,6 +301,8 @@ Operating System: {}
         def detect_thread():
             try:
                 discovery_results = self.cleaner.discover_augmentcode_data()
+                # The cleaner's results changed; render the report afresh when next needed
+                self._last_report = None
                 paths = discovery_results.get('augmentcode_paths', [])
                 
                 if paths:
@@ -269,11 +320,11 @@ Operating System: {}
                 self.log_message(f"Error during auto-detection: {str(e)}")
                 messagebox.showerror("Error", f"Auto-detection failed: {str(e)}")
         
-        threading.Thread(target=detect_thread, daemon=True).start()
+        self._worker.submit(detect_thread)
     
     def start_discovery(self):
         """Start the discovery process."""
-        if self.cleanup_thread and self.cleanup_thread.is_alive():
+        if self._operation_in_progress():
             messagebox.showwarning("Operation in Progress", 
                                  "Please wait for the current operation to complete.")
             return
@@ -287,10 +338,10 @@ Operating System: {}
                     custom_paths = [Path(self.augmentcode_path_var.get().strip())]
                 
                 discovery_results = self.cleaner.discover_augmentcode_data(custom_paths)
-                self.discovery_complete = True
                 
                 # Update discovery tab
-                report = self.cleaner.generate_discovery_report()
+                report = self._last_report = self.cleaner.generate_discovery_report()
+                self.discovery_complete = True
                 self.root.after(0, lambda: self.update_discovery_display(report))
                 
                 self.log_message("Discovery completed successfully!")
@@ -300,8 +351,7 @@ Operating System: {}
                 self.log_message(error_msg)
                 self.root.after(0, lambda: messagebox.showerror("Discovery Error", error_msg))
         
-        self.cleanup_thread = threading.Thread(target=discovery_thread, daemon=True)
-        self.cleanup_thread.start()
+        self.discovery_future = self._worker.submit(discovery_thread)
     
     def start_cleanup(self):
         """Start the cleanup process."""
@@ -310,7 +360,7 @@ Operating System: {}
                                  "Please run discovery first to identify AugmentCode data locations.")
             return
         
-        if self.cleanup_thread and self.cleanup_thread.is_alive():
+        if self._operation_in_progress():
             messagebox.showwarning("Operation in Progress", 
                                  "Please wait for the current operation to complete.")
             return
@@ -360,7 +410,12 @@ Operating System: {}
             'remove_all_accounts': self.remove_all_accounts_var.get()
         }
         
-        self.cleanup_thread = self.cleaner.perform_cleanup_async(cleanup_options)
+        self.cleanup_future = self.cleaner.perform_cleanup_async(cleanup_options)
+    
+    def _operation_in_progress(self) -> bool:
+        """Whether a discovery or cleanup is still running."""
+        return any(future is not None and not future.done()
+                   for future in (self.discovery_future, self.cleanup_future))
     
     def generate_report(self):
         """Generate and display discovery report."""
@@ -369,12 +424,17 @@ Operating System: {}
                                  "Please run discovery first to generate a report.")
             return
         
-        report = self.cleaner.generate_discovery_report()
-        self.update_discovery_display(report)
+        self.update_discovery_display(self._discovery_report())
         
         # Switch to discovery tab
-        notebook = self.root.children['!notebook']
-        notebook.select(1)  # Discovery tab
+        self.notebook.select(self.discovery_frame)
+    
+    def _discovery_report(self) -> str:
+        """Return the report of the last discovery, rendering it only if it isn't cached."""
+        report = self._last_report
+        if report is None:
+            report = self._last_report = self.cleaner.generate_discovery_report()
+        return report
     
     def save_discovery_report(self):
         """Save discovery report to file."""
@@ -382,6 +442,8 @@ Operating System: {}
             messagebox.showwarning("No Report", "No discovery report available to save.")
             return
         
+        from tkinter import filedialog
+        
         file_path = filedialog.asksaveasfilename(
             title="Save Discovery Report",
             defaultextension=".txt",
@@ -390,9 +452,8 @@ Operating System: {}
         
         if file_path:
             try:
-                report = self.cleaner.generate_discovery_report()
                 with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(report)
+                    f.write(self._discovery_report())
                 self.log_message(f"Report saved to: {file_path}")
                 messagebox.showinfo("Report Saved", f"Discovery report saved to:\n{file_path}")
             except Exception as e:
@@ -401,43 +462,55 @@ Operating System: {}
                 messagebox.showerror("Save Error", error_msg)
     
     def refresh_backup_list(self):
-        """Refresh the backup list display."""
-        try:
-            # Clear existing items
-            for item in self.backup_tree.get_children():
-                self.backup_tree.delete(item)
-            
-            # Get backup list
-            backups = self.cleaner.get_backup_list()
+        """Refresh the backup list display.
+        
+        The backup directory is read on a worker thread; only the finished
+        rows are handed back to the Tk thread.
+        """
+        def load_thread():
+            try:
+                rows = self._load_backup_rows()
+            except Exception as e:
+                error_msg = f"Failed to refresh backup list: {str(e)}"
+                self.log_message(error_msg)
+                self.root.after(0, lambda: messagebox.showerror("Refresh Error", error_msg))
+                return
+            self.root.after(0, lambda: self._apply_backup_rows(rows))
+        
+        self._worker.submit(load_thread)
+    
+    def _load_backup_rows(self) -> List[Tuple[str, str, int, str]]:
+        """Read the backups and format them as (name, date, items, size) rows."""
+        rows = []
+        for backup in self.cleaner.get_backup_list():
+            name = backup['name']
+            timestamp = backup.get('timestamp', 'Unknown')
+            items_count = backup.get('items_count', 0)
+            total_size = backup.get('total_size', 0)
             
-            for backup in backups:
-                name = backup['name']
-                timestamp = backup.get('timestamp', 'Unknown')
-                items_count = backup.get('items_count', 0)
-                total_size = backup.get('total_size', 0)
-                
-                # Format size
-                size_str = self.format_size(total_size)
-                
-                # Format timestamp
-                if timestamp and timestamp != 'Unknown':
-                    try:
-                        from datetime import datetime
-                        dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                        date_str = dt.strftime('%Y-%m-%d %H:%M')
-                    except:
-                        date_str = timestamp
-                else:
-                    date_str = 'Unknown'
-                
-                self.backup_tree.insert('', tk.END, values=(name, date_str, items_count, size_str))
+            # Format size
+            size_str = self.format_size(total_size)
             
-            self.log_message(f"Backup list refreshed: {len(backups)} backups found")
+            # Format timestamp
+            if timestamp and timestamp != 'Unknown':
+                # Parsed once per distinct string across refreshes
+                date_str = _format_backup_timestamp(timestamp) if isinstance(timestamp, str) else timestamp
+            else:
+                date_str = 'Unknown'
             
-        except Exception as e:
-            error_msg = f"Failed to refresh backup list: {str(e)}"
-            self.log_message(error_msg)
-            messagebox.showerror("Refresh Error", error_msg)
+            rows.append((name, date_str, items_count, size_str))
+        return rows
+    
+    def _apply_backup_rows(self, rows: List[Tuple[str, str, int, str]]):
+        """Replace the backup list display with freshly loaded rows."""
+        # Clear existing items
+        for item in self.backup_tree.get_children():
+            self.backup_tree.delete(item)
+        
+        for row in rows:
+            self.backup_tree.insert('', tk.END, values=row)
+        
+        self.log_message(f"Backup list refreshed: {len(rows)} backups found")
     
     def restore_backup(self):
         """Restore selected backup."""
@@ -509,11 +582,7 @@ Operating System: {}
     def log_message(self, message: str):
         """Add a message to the log display."""
         timestamp = time.strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {message}\n"
-        
-        self.log_text.insert(tk.END, log_entry)
-        self.log_text.see(tk.END)
-        self.root.update_idletasks()
+        self._log_queue.append(f"[{timestamp}] {message}\n")
     
     def update_status_loop(self):
         """Update status and progress from the cleaner."""
@@ -528,14 +597,19 @@ Operating System: {}
             progress_percent = status.progress * 100
             self.progress_var.set(progress_percent)
             
-            # Update log with new entries
-            if hasattr(status, 'detailed_log') and status.detailed_log:
-                # Only show new log entries (simple approach)
-                current_log_lines = self.log_text.get(1.0, tk.END).count('\n')
-                if len(status.detailed_log) > current_log_lines - 1:
-                    for log_entry in status.detailed_log[current_log_lines - 1:]:
-                        self.log_text.insert(tk.END, f"{log_entry}\n")
-                    self.log_text.see(tk.END)
+            # Update log with our own queued messages and the cleaner's new
+            # entries, in a single insert per tick
+            pending = []
+            while self._log_queue:
+                pending.append(self._log_queue.popleft())
+            self.status_log_seen, new_entries = status.log_entries_since(self.status_log_seen)
+            pending.extend(f"{log_entry}\n" for log_entry in new_entries)
+            if pending:
+                self.log_text.insert(tk.END, "".join(pending))
+                line_count = int(self.log_text.index('end-1c').split('.')[0])
+                if line_count > _LOG_MAX_LINES:
+                    self.log_text.delete('1.0', f'{line_count - _LOG_TRIM_LINES}.0')
+                self.log_text.see(tk.END)
             
             # Check for errors
             if not status.success and status.error_message:
@@ -550,19 +624,18 @@ Operating System: {}
     
     def format_size(self, size_bytes: int) -> str:
         """Format file size in human-readable format."""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.1f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.1f} TB"
+        return _format_size(size_bytes)
     
     def run(self):
         """Run the GUI application."""
-        # Initialize backup list
-        self.refresh_backup_list()
+        # Initialize backup list once the event loop is running, so the
+        # loader thread's root.after() callback can't arrive before it
+        self.root.after_idle(self.refresh_backup_list)
         
         # Start the main loop
         self.root.mainloop()
+        self._worker.shutdown(wait=False)
+        self.cleaner.close()
 
 
 def main():
@@ -576,4 +649,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Lets frozen builds start config-search worker processes
+    multiprocessing.freeze_support()
     main()
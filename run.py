@@ -4,11 +4,21 @@ Simple launcher for Free AugmentCode Data Cleaner
 Handles common startup issues and provides helpful error messages.
 """
 
+import importlib.util
+import multiprocessing
 import sys
 import os
 from pathlib import Path
 
 
+# Compiled extensions behind stdlib packages that distributions sometimes ship
+# separately; the pure-Python package can be found while these are missing
+_NATIVE_MODULES = {
+    'tkinter': '_tkinter',
+    'sqlite3': '_sqlite3',
+}
+
+
 def check_python_version():
     """Check if Python version is compatible."""
     if sys.version_info < (3, 7):
@@ -31,13 +41,13 @@ def check_dependencies():
         'configparser'
     ]
     
-    missing_modules = []
-    
-    for module in required_modules:
-        try:
-            __import__(module)
-        except ImportError:
-            missing_modules.append(module)
+    # Locate the modules without importing them; the application imports
+    # what it needs itself once the checks pass
+    missing_modules = [
+        module for module in required_modules
+        if importlib.util.find_spec(module) is None
+        or (module in _NATIVE_MODULES and importlib.util.find_spec(_NATIVE_MODULES[module]) is None)
+    ]
     
     if missing_modules:
         print("❌ Error: Missing required modules:")
@@ -57,12 +67,9 @@ def check_permissions():
     """Check if we have necessary permissions."""
     current_dir = Path(__file__).parent
     
-    # Check if we can write to current directory (for logs)
-    try:
-        test_file = current_dir / "test_write_permission.tmp"
-        test_file.write_text("test")
-        test_file.unlink()
-    except PermissionError:
+    # Check if we can write to current directory (for logs); asking the OS
+    # avoids creating and deleting a probe file on every launch
+    if not os.access(current_dir, os.W_OK):
         print("⚠️  Warning: Limited write permissions in current directory.")
         print("Some features (like logging) may not work properly.")
         print("Consider running as administrator or from a writable location.")
@@ -121,6 +128,8 @@ def main():
 
 
 if __name__ == "__main__":
+    # Lets frozen builds start config-search worker processes
+    multiprocessing.freeze_support()
     try:
         main()
     except KeyboardInterrupt:
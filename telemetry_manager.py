@@ -10,8 +10,8 @@ try:
     import winreg
 except ImportError:
     winreg = None  # Not available on non-Windows systems
-from utils import OSDetector, IDGenerator, FileSearcher
-from config_manager import ConfigManager
+from utils import OSDetector, IDGenerator, FileSearcher, DirectorySnapshot
+from config_manager import ConfigManager, IdHit
 from backup_manager import BackupManager
 
 
@@ -23,7 +23,8 @@ class TelemetryManager:
         self.backup_manager = backup_manager
         self.config_manager = ConfigManager()
     
-    def discover_telemetry_data(self, augmentcode_paths: List[Path]) -> Dict[str, Any]:
+    def discover_telemetry_data(self, augmentcode_paths: List[Path],
+                                snapshot: Optional[DirectorySnapshot] = None) -> Dict[str, Any]:
         """Discover telemetry data across all possible storage locations."""
         discovery_results = {
             'config_files': [],
@@ -34,7 +35,7 @@ class TelemetryManager:
         
         # Search configuration files
         for path in augmentcode_paths:
-            config_files = FileSearcher.find_config_files(path)
+            config_files = FileSearcher.find_config_files(path, snapshot)
             discovery_results['config_files'].extend(config_files)
             
             # Search for telemetry IDs in config files
@@ -56,6 +57,17 @@ class TelemetryManager:
         
         return discovery_results
     
+    def refresh_registry_data(self, discovery_results: Dict[str, Any]) -> Dict[str, Any]:
+        """Return earlier discovery results with the Windows registry read again.
+        
+        The registry lies outside the AugmentCode directories, so it can change
+        while the configuration files found by discover_telemetry_data don't.
+        """
+        refreshed = dict(discovery_results)
+        refreshed['registry_keys'] = self._search_registry_for_telemetry() if OSDetector.is_windows() else []
+        refreshed['total_locations'] = len(refreshed['config_files']) + len(refreshed['registry_keys'])
+        return refreshed
+    
     def _search_registry_for_telemetry(self) -> List[Dict[str, Any]]:
         """Search Windows registry for AugmentCode telemetry data."""
         registry_data = []
@@ -177,14 +189,15 @@ class TelemetryManager:
         
         return success
     
-    def _modify_config_file_ids(self, found_ids: List[Dict[str, Any]], 
+    def _modify_config_file_ids(self, found_ids: List[IdHit], 
                                backup_dir: Path, new_ids: Dict[str, str]) -> bool:
         """Modify telemetry IDs in configuration files."""
         success = True
         modified_files = set()
+        changes = []
         
         for id_info in found_ids:
-            file_path = id_info['file']
+            file_path = id_info.file
             
             # Backup file if not already backed up
             if file_path not in modified_files:
@@ -198,7 +211,7 @@ class TelemetryManager:
                 modified_files.add(file_path)
             
             # Determine which new ID to use based on the pattern matched
-            pattern = id_info.get('pattern_matched', '').lower()
+            pattern = id_info.pattern_matched.lower()
             new_value = None
             
             if 'device' in pattern:
@@ -211,11 +224,12 @@ class TelemetryManager:
                 # Default to device ID for generic patterns
                 new_value = new_ids['device_id']
             
-            # Modify the ID
-            modify_success = self.config_manager.modify_telemetry_id(id_info, new_value)
-            if not modify_success:
-                self.logger.error(f"Failed to modify ID in {file_path}")
-                success = False
+            changes.append((id_info, new_value))
+        
+        # Modify the IDs, rewriting each file once
+        if changes and not self.config_manager.modify_telemetry_ids(changes):
+            self.logger.error("Failed to modify one or more telemetry IDs")
+            success = False
         
         self.logger.info(f"Modified telemetry IDs in {len(modified_files)} configuration files")
         return success
@@ -288,6 +302,10 @@ class TelemetryManager:
     
     def generate_telemetry_report(self, discovery_results: Dict[str, Any]) -> str:
         """Generate a human-readable report of discovered telemetry data."""
+        return "\n".join(self.generate_telemetry_report_lines(discovery_results))
+    
+    def generate_telemetry_report_lines(self, discovery_results: Dict[str, Any]) -> List[str]:
+        """Build the telemetry report as a list of lines."""
         report_lines = []
         
         report_lines.append("=== TELEMETRY DISCOVERY REPORT ===")
@@ -308,10 +326,10 @@ class TelemetryManager:
         if discovery_results['found_ids']:
             report_lines.append("Found Telemetry IDs:")
             for id_info in discovery_results['found_ids']:
-                file_path = id_info['file']
-                key = id_info.get('key', 'N/A')
-                value = id_info.get('value', 'N/A')
-                pattern = id_info.get('pattern_matched', 'N/A')
+                file_path = id_info.file
+                key = id_info.key if id_info.key is not None else 'N/A'
+                value = id_info.value
+                pattern = id_info.pattern_matched
                 
                 report_lines.append(f"  File: {file_path}")
                 report_lines.append(f"    Key: {key}")
@@ -331,4 +349,4 @@ class TelemetryManager:
                     report_lines.append(f"    {value_name}: {value_info['data']}")
                 report_lines.append("")
         
-        return "\n".join(report_lines)
+        return report_lines
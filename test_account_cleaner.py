@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for scanning files for account data and removing it with AccountDataCleaner.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add current directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+import account_cleaner
+from backup_manager import BackupManager
+
+
+def _scan_whole(content: bytes):
+    emails = {match.group() for match in account_cleaner._EMAIL_RE.finditer(content)}
+    usernames = {match.group(1) or match.group(2)
+                 for match in account_cleaner._USERNAMES_RE.finditer(content)}
+    return emails, usernames
+
+
+@pytest.mark.parametrize('chunk_size', [64, 97, 128, 1000])
+def test_scan_large_file_finds_matches_straddling_chunk_boundaries(tmp_path, monkeypatch, chunk_size):
+    monkeypatch.setattr(account_cleaner, '_CHUNK_SIZE', chunk_size)
+    monkeypatch.setattr(account_cleaner, '_CHUNK_OVERLAP', 48)
+
+    # Records of varying length push matches across every boundary offset
+    content = b''.join(
+        b'x' * (i % 7) + b' mail user%d@example.com; "username": "name%d" login=l%d\n' % (i, i, i)
+        for i in range(60)
+    )
+    path = tmp_path / 'big.log'
+    path.write_bytes(content)
+
+    expected = _scan_whole(content)
+    assert len(expected[0]) == 60 and len(expected[1]) == 120
+    assert account_cleaner._scan_large_file(path) == expected
+
+
+REMOVAL_TARGETS = (('me@example.com', 'me@example.co'), ('alice', 'al', 'bob_1'))
+REMOVAL_BUFFERS = [
+    b'contact me@example.com or me@example.co today',
+    b'alice alicex xalice al-ice bob_1 bob_12 "alice"',
+    b'user=alice email=me@example.com, al@example.com',
+    b'caf\xc3\xa9 alice \xff\xfe me@example.com',
+    b'nothing to see here',
+]
+
+
+@pytest.mark.skipif(account_cleaner.ahocorasick is None, reason="needs pyahocorasick")
+@pytest.mark.parametrize('buffer', REMOVAL_BUFFERS)
+def test_removal_matches_the_same_with_and_without_ahocorasick(monkeypatch, buffer):
+    with_automaton = account_cleaner._compile_removal_pattern.__wrapped__(*REMOVAL_TARGETS)
+    monkeypatch.setattr(account_cleaner, 'ahocorasick', None)
+    with_regex = account_cleaner._compile_removal_pattern.__wrapped__(*REMOVAL_TARGETS)
+    assert isinstance(with_automaton, account_cleaner._MultiTargetMatcher)
+
+    assert (account_cleaner._replace_targets(with_automaton, b'[REMOVED]', buffer) ==
+            account_cleaner._replace_targets(with_regex, b'[REMOVED]', buffer))
+
+
+def test_clean_account_data_fails_when_the_manifest_cannot_be_written(tmp_path, monkeypatch):
+    manager = BackupManager(tmp_path / 'backups')
+    cleaner = account_cleaner.AccountDataCleaner(manager)
+    backup_dir = manager.create_timestamped_backup_dir()
+    account_file = tmp_path / 'account.txt'
+    account_file.write_text('email=me@example.com\n')
+    monkeypatch.setattr(manager, 'flush_manifest', lambda directory: False)
+
+    options = {'remove_all_accounts': True,
+               'account_files': [{'file': account_file, 'data': {'emails': ['me@example.com']}}]}
+    assert not cleaner.clean_account_data(backup_dir, options)
+    assert 'me@example.com' not in account_file.read_text()
+
+
+@pytest.mark.skipif(account_cleaner.ahocorasick is None, reason="needs pyahocorasick")
+@pytest.mark.parametrize('chunk_size', [1, 5, 13, 64])
+def test_ahocorasick_removal_matches_targets_straddling_decode_chunks(monkeypatch, chunk_size):
+    monkeypatch.setattr(account_cleaner, '_CHUNK_SIZE', chunk_size)
+    buffer = b' '.join(REMOVAL_BUFFERS) * 3
+    with_automaton = account_cleaner._compile_removal_pattern.__wrapped__(*REMOVAL_TARGETS)
+    monkeypatch.setattr(account_cleaner, 'ahocorasick', None)
+    with_regex = account_cleaner._compile_removal_pattern.__wrapped__(*REMOVAL_TARGETS)
+
+    expected = account_cleaner._replace_targets(with_regex, b'[REMOVED]', buffer)
+    assert expected is not None
+    assert account_cleaner._replace_targets(with_automaton, b'[REMOVED]', buffer) == expected
+
+
+def test_clean_account_file_leaves_files_without_targets_untouched(tmp_path):
+    cleaner = account_cleaner.AccountDataCleaner(BackupManager(tmp_path / 'backups'))
+    account_file = tmp_path / 'account.txt'
+    account_file.write_text('email=other@example.com\n')
+    before = account_file.stat().st_mtime_ns
+
+    assert cleaner._clean_account_file(account_file, {'emails': ['me@example.com']}, '', True)
+    assert account_file.stat().st_mtime_ns == before
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Tests for BackupManager file copies, backup sessions, manifests and deletion.
+"""
+
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add current directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+import backup_manager
+from backup_manager import BackupManager
+
+
+@pytest.mark.skipif(not hasattr(os, 'copy_file_range'), reason="needs os.copy_file_range")
+def test_fast_copy_falls_back_when_copy_file_range_stops_early(tmp_path, monkeypatch):
+    src = tmp_path / 'src.bin'
+    src.write_bytes(os.urandom(64 * 1024))
+    dst = tmp_path / 'dst.bin'
+
+    real_copy_file_range = os.copy_file_range
+    calls = []
+
+    def short_copy_file_range(src_fd, dst_fd, count, *args):
+        # Copy one small chunk, then claim end of file
+        calls.append(count)
+        if len(calls) > 1:
+            return 0
+        return real_copy_file_range(src_fd, dst_fd, 4096, *args)
+
+    monkeypatch.setattr(backup_manager.os, 'copy_file_range', short_copy_file_range)
+    BackupManager._fast_copy(src, dst)
+
+    assert dst.read_bytes() == src.read_bytes()
+
+
+@pytest.mark.skipif(not hasattr(os, 'mkfifo'), reason="needs FIFOs")
+def test_fast_copy_rejects_fifo_instead_of_blocking(tmp_path):
+    fifo = tmp_path / 'pipe'
+    os.mkfifo(fifo)
+
+    with pytest.raises(shutil.SpecialFileError):
+        BackupManager._fast_copy(fifo, tmp_path / 'copy')
+
+
+def test_session_flushes_manifest_and_lets_listing_cache_it(tmp_path):
+    manager = BackupManager(tmp_path / 'backups')
+    source = tmp_path / 'settings.json'
+    source.write_text('{}')
+
+    with manager.session() as backup_dir:
+        assert manager.backup_file(source, backup_dir)
+        # Still being written: never served from the summary cache
+        assert manager.list_backups()[0]['items_count'] == 1
+        assert backup_dir not in manager._summary_cache
+
+    assert backup_dir not in manager._manifests
+    assert [item['source'] for item in manager._read_manifest(backup_dir)['items']] == [str(source)]
+
+    listed = manager.list_backups()
+    assert listed[0]['items_count'] == 1
+    assert backup_dir in manager._summary_cache
+    cached_summary = manager._summary_cache[backup_dir][1]
+    manager.list_backups()
+    assert manager._summary_cache[backup_dir][1] is cached_summary
+
+
+def test_legacy_json_manifest_is_listed_and_upgraded_on_flush(tmp_path):
+    manager = BackupManager(tmp_path / 'backups')
+    backup_dir = manager.backup_root / 'Backup_20240101_000000'
+    backup_dir.mkdir(parents=True)
+    old_item = {'type': 'file', 'source': 'old.json', 'destination': 'files/old.json', 'size': 5}
+    (backup_dir / 'backup_manifest.json').write_text(json.dumps(
+        {'timestamp': '2024-01-01T00:00:00', 'backup_type': 'AugmentCode_Data_Cleanup', 'items': [old_item]}
+    ))
+
+    listed = manager.list_backups()
+    assert [(b['name'], b['items_count'], b['total_size']) for b in listed] == [(backup_dir.name, 1, 5)]
+
+    source = tmp_path / 'new.json'
+    source.write_text('{}')
+    assert manager.backup_file(source, backup_dir)
+    assert manager.flush_manifest(backup_dir)
+
+    # The JSON Lines manifest now holds the header and both items
+    manifest = manager._read_manifest(backup_dir)
+    assert (backup_dir / 'backup_manifest.jsonl').exists()
+    assert manifest['timestamp'] == '2024-01-01T00:00:00'
+    assert [item['source'] for item in manifest['items']] == ['old.json', str(source)]
+
+
+def test_remove_tree_removes_links_without_following_them(tmp_path):
+    outside = tmp_path / 'outside'
+    outside.mkdir()
+    (outside / 'keep.txt').write_text('keep')
+    root = tmp_path / 'backup'
+    (root / 'sub').mkdir(parents=True)
+    (root / 'sub' / 'file.txt').write_text('x')
+    os.symlink(outside, root / 'sub' / 'link', target_is_directory=True)
+
+    BackupManager._remove_tree(root)
+
+    assert not root.exists()
+    assert (outside / 'keep.txt').read_text() == 'keep'
+
+
+def test_remove_tree_does_not_descend_into_junctions(tmp_path, monkeypatch):
+    root = tmp_path / 'backup'
+    junction = root / 'junction'
+    junction.mkdir(parents=True)
+    (junction / 'target.txt').write_text('keep')
+    junction_inode = junction.stat().st_ino
+
+    # Stand in for a Windows junction: a directory that must only be rmdir'ed
+    monkeypatch.setattr(backup_manager, '_IS_WINDOWS', True)
+    monkeypatch.setattr(backup_manager, '_is_junction', lambda path_stat: path_stat.st_ino == junction_inode)
+    removed = []
+    monkeypatch.setattr(backup_manager.os, 'rmdir', removed.append)
+
+    BackupManager._remove_tree(root)
+
+    assert removed == [str(junction), str(root)]
+    assert (junction / 'target.txt').exists()
+
+
+def test_failed_manifest_append_keeps_items_for_the_next_flush(tmp_path, monkeypatch):
+    manager = BackupManager(tmp_path / 'backups')
+    backup_dir = manager.create_timestamped_backup_dir()
+    first, second = tmp_path / 'a.txt', tmp_path / 'b.txt'
+    first.write_text('a')
+    second.write_text('b')
+
+    real_open = open
+    failures = []
+
+    def failing_append(file, mode='r', *args, **kwargs):
+        if mode == 'a' and not failures:
+            failures.append(file)
+            raise OSError("disk full")
+        return real_open(file, mode, *args, **kwargs)
+
+    monkeypatch.setattr(backup_manager, 'open', failing_append, raising=False)
+
+    assert manager.backup_file(first, backup_dir)
+    assert not manager.flush_manifest(backup_dir)
+    assert manager.backup_file(second, backup_dir)
+    assert manager.flush_manifest(backup_dir)
+
+    assert failures
+    sources = [item['source'] for item in manager._read_manifest(backup_dir)['items']]
+    assert sources == [str(first), str(second)]
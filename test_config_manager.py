@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Tests for finding and rewriting telemetry IDs and account data with ConfigManager.
+"""
+
+import configparser
+import json
+import sys
+from pathlib import Path
+from typing import List
+
+import pytest
+
+# Add current directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+import config_manager
+from config_manager import AccountHit, ConfigManager, IdHit, _scan_ini
+
+
+def test_hits_support_membership_and_iteration_like_dicts():
+    hit = IdHit(Path('settings.ini'), 'ini', 'abc', 'device[_-]?id', section='main', key='deviceid')
+
+    assert 'key' in hit
+    assert 'tag' not in hit
+    assert 0 not in hit
+    assert list(hit) == list(hit.to_dict())
+    assert dict(hit.to_dict()) == {name: hit[name] for name in hit}
+
+    account = AccountHit(Path('a.txt'), 'text', 'me@example.com', 'email', 'email', line_number=3)
+    assert 'data_type' in account
+    assert 'line_number' in account
+    assert 'key' not in account
+
+
+def test_hits_are_unhashable_like_the_dicts_they_replace():
+    hit = IdHit(Path('settings.json'), 'json', 'abc', 'device[_-]?id', key_path='deviceId')
+
+    assert hit == IdHit(Path('settings.json'), 'json', 'abc', 'device[_-]?id', key_path='deviceId')
+    with pytest.raises(TypeError):
+        hash(hit)
+
+
+# Layouts configparser accepts that the INI scan must read the same way
+INI_LAYOUTS = {
+    'continuation lines': "[main]\ndevice_id = abc\n  def\n\tghi\nmachine_id = m1\n",
+    'blank lines inside a value': "[main]\ndevice_id = a\n\n  b\n\nmachine_id = c\n",
+    'comment lines': "; top\n# top\n[main]\n; note\ndevice_id = x ; kept\n  # skipped\n  more\n",
+    'DEFAULT section': "[DEFAULT]\nmachineid = d1\n[one]\na = 1\n[two]\nclient_id = 2\n",
+    'colon delimiters': "[main]\nurl: http://host/?a=b\nclient_id = a:b\nguid :g\n",
+    'header followed by a comment': "[main] ; comment\ndevice_id = v\n",
+    'indented options': "[main]\n  device_id = v\n  uuid = w\n",
+    'empty value with continuation': "[main]\nuuid =\n  cont\n",
+}
+
+
+@pytest.mark.parametrize('text', INI_LAYOUTS.values(), ids=list(INI_LAYOUTS))
+def test_scan_ini_reads_files_like_configparser(tmp_path, text):
+    ini_file = tmp_path / 'settings.ini'
+    ini_file.write_text(text)
+    parser = configparser.ConfigParser(interpolation=None)
+    parser.read(ini_file)
+
+    expected = [('DEFAULT', key, value) for key, value in parser.defaults().items()]
+    # Section entries without the DEFAULT values configparser merges into them
+    expected += [(section, key, value) for section in parser.sections()
+                 for key, value in parser._sections[section].items()]
+    assert list(_scan_ini(ini_file)) == expected
+
+
+def _write_files_with_two_ids(directory: Path) -> List[Path]:
+    files = {
+        'settings.json': json.dumps({'deviceId': 'd-json', 'nested': {'machine_id': 'm-json'}}),
+        'settings.ini': "[telemetry]\ndevice_id = d-ini\nmachine-id = m-ini\n",
+        'settings.xml': '<config><deviceId>d-xml</deviceId><entry machineId="m-xml"/></config>',
+        'settings.txt': "deviceId=d-text\nname: x machineId:m-text\n",
+    }
+    for name, content in files.items():
+        (directory / name).write_text(content)
+    return [directory / name for name in files]
+
+
+def test_search_finds_every_id_in_each_format(tmp_path):
+    found = ConfigManager().search_for_telemetry_ids(_write_files_with_two_ids(tmp_path))
+
+    values = {}
+    for hit in found:
+        values.setdefault(hit.format, []).append((hit.pattern_matched, hit.value))
+    assert values == {
+        fmt: [(r'device[_-]?id', f'd-{fmt}'), (r'machine[_-]?id', f'm-{fmt}')]
+        for fmt in ('json', 'ini', 'xml', 'text')
+    }
+
+
+def test_modify_telemetry_ids_rewrites_every_id_in_each_format(tmp_path):
+    manager = ConfigManager()
+    files = _write_files_with_two_ids(tmp_path)
+    found = manager.search_for_telemetry_ids(files)
+    assert len(found) == 8
+
+    assert manager.modify_telemetry_ids([(hit, f'new-{hit.value}') for hit in found])
+
+    # Each file is rewritten once, so both of its changes must be in that write
+    refound = manager.search_for_telemetry_ids(files)
+    assert sorted(hit.value for hit in refound) == sorted(f'new-{hit.value}' for hit in found)
+
+
+def test_modify_telemetry_ids_reports_a_missing_id_but_applies_the_rest(tmp_path):
+    manager = ConfigManager()
+    json_file = _write_files_with_two_ids(tmp_path)[0]
+    device, machine = manager.search_for_telemetry_ids([json_file])
+    gone = IdHit(json_file, 'json', 'x', device.pattern_matched, key_path='missing.deviceId')
+
+    assert not manager.modify_telemetry_ids([(device, 'd2'), (gone, 'x2'), (machine, 'm2')])
+    assert json.loads(json_file.read_text()) == {'deviceId': 'd2', 'nested': {'machine_id': 'm2'}}
+
+
+CLASSIFIED_KEYS = ['deviceId', 'device_id', 'DEVICE-ID', 'myMachineIdHash', 'sessionGuid',
+                   'user_id_and_uuid', 'clientid', 'nothing', 'installation-Id', 'emailLogin',
+                   'userNameProfile', 'identity', 'gerät_device_id', 'İdentity']
+
+
+@pytest.mark.skipif(config_manager.ahocorasick is None, reason="needs pyahocorasick")
+@pytest.mark.parametrize('patterns', [config_manager._ID_PATTERNS, config_manager._ACCOUNT_PATTERNS],
+                         ids=['ids', 'accounts'])
+def test_key_classification_is_the_same_with_and_without_ahocorasick(monkeypatch, patterns):
+    with_automaton = config_manager._PatternClassifier(patterns)
+    monkeypatch.setattr(config_manager, 'ahocorasick', None)
+    with_regex = config_manager._PatternClassifier(patterns)
+    assert with_automaton._automaton is not None and with_regex._automaton is None
+
+    assert with_automaton.classify_many(CLASSIFIED_KEYS) == with_regex.classify_many(CLASSIFIED_KEYS)
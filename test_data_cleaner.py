@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for reusing discovery results between runs of FreeAugmentCodeCleaner.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add current directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+import telemetry_manager
+from data_cleaner import FreeAugmentCodeCleaner
+
+
+@pytest.fixture
+def augment_dir(tmp_path):
+    path = tmp_path / 'augment'
+    (path / 'sub').mkdir(parents=True)
+    (path / 'sub' / 'c.json').write_text(json.dumps({'deviceId': 'abc-123'}))
+    return path
+
+
+@pytest.fixture
+def cleaner(tmp_path):
+    data_cleaner = FreeAugmentCodeCleaner(tmp_path / 'backups')
+    yield data_cleaner
+    data_cleaner.close()
+
+
+def test_unchanged_tree_reuses_database_and_account_results(augment_dir, cleaner):
+    first = cleaner.discover_augmentcode_data([augment_dir])
+    second = cleaner.discover_augmentcode_data([augment_dir])
+
+    assert second['account_data'] is first['account_data']
+    assert second['database_files'] is first['database_files']
+    # Config file hits are reused even though the registry part is re-read
+    assert second['telemetry_data']['found_ids'] is first['telemetry_data']['found_ids']
+
+
+def test_changed_file_in_tree_is_rescanned(augment_dir, cleaner):
+    cleaner.discover_augmentcode_data([augment_dir])
+    (augment_dir / 'sub' / 'c.json').write_text(json.dumps({'deviceId': 'abc-456', 'machineId': 'x-1'}))
+
+    results = cleaner.discover_augmentcode_data([augment_dir])
+    assert sorted(hit.value for hit in results['telemetry_data']['found_ids']) == ['abc-456', 'x-1']
+
+
+def test_workspaces_outside_the_tree_are_rediscovered(augment_dir, cleaner, tmp_path, monkeypatch):
+    user_workspace = tmp_path / 'Documents' / 'AugmentCode'
+    monkeypatch.setattr(cleaner.workspace_cleaner, '_get_common_user_workspace_paths',
+                        lambda: [user_workspace])
+
+    first = cleaner.discover_augmentcode_data([augment_dir])
+    assert user_workspace not in [workspace['path'] for workspace in first['workspace_locations']]
+
+    user_workspace.mkdir(parents=True)
+    (user_workspace / 'notes.txt').write_text('hello')
+
+    second = cleaner.discover_augmentcode_data([augment_dir])
+    assert user_workspace in [workspace['path'] for workspace in second['workspace_locations']]
+
+
+def test_registry_is_reread_while_tree_is_unchanged(augment_dir, cleaner, monkeypatch):
+    registry = []
+    monkeypatch.setattr(telemetry_manager.OSDetector, 'is_windows', staticmethod(lambda: True))
+    monkeypatch.setattr(cleaner.telemetry_manager, '_search_registry_for_telemetry', lambda: list(registry))
+
+    first = cleaner.discover_augmentcode_data([augment_dir])
+    assert first['telemetry_data']['registry_keys'] == []
+
+    registry.append({'hive': 1, 'path': r'Software\AugmentCode', 'data': {'values': {'deviceId': 'x'}}})
+    second = cleaner.discover_augmentcode_data([augment_dir])
+    assert second['telemetry_data']['registry_keys'] == registry
+    assert second['telemetry_data']['total_locations'] == first['telemetry_data']['total_locations'] + 1
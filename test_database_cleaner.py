@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for the audit trail of rows deleted by DatabaseCleaner.
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add current directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from backup_manager import BackupManager
+from database_cleaner import AugmentRecord, DatabaseCleaner
+
+
+AUDIT_OPTIONS = {'audit': True, 'remove_augment_records': True}
+
+
+def _make_state_db(path: Path, extra_column: bool) -> Path:
+    """Create a state.vscdb with two augment rows and one other row."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    if extra_column:
+        conn.execute("CREATE TABLE ItemTable (key TEXT, value TEXT, extra TEXT)")
+        rows = [(f'augment.{path.parent.name}.{i}', 'v', 'x') for i in range(2)] + [('other', 'v', 'x')]
+        conn.executemany("INSERT INTO ItemTable VALUES (?, ?, ?)", rows)
+    else:
+        conn.execute("CREATE TABLE ItemTable (key TEXT, value TEXT)")
+        rows = [(f'augment.{path.parent.name}.{i}', 'v') for i in range(2)] + [('other', 'v')]
+        conn.executemany("INSERT INTO ItemTable VALUES (?, ?)", rows)
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _keys(path: Path):
+    conn = sqlite3.connect(path)
+    try:
+        return sorted(row[0] for row in conn.execute("SELECT key FROM ItemTable"))
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def cleaner(tmp_path):
+    db_cleaner = DatabaseCleaner(BackupManager(tmp_path / 'backups'))
+    yield db_cleaner
+    db_cleaner.close_all()
+
+
+def test_same_named_databases_get_separate_audit_files(tmp_path, cleaner):
+    first = _make_state_db(tmp_path / 'vscode' / 'state.vscdb', extra_column=False)
+    second = _make_state_db(tmp_path / 'cursor' / 'state.vscdb', extra_column=True)
+    backup_dir = tmp_path / 'backup'
+
+    assert cleaner.clean_database(first, backup_dir, AUDIT_OPTIONS)
+    assert cleaner.clean_database(second, backup_dir, AUDIT_OPTIONS)
+
+    assert _keys(first) == ['other']
+    assert _keys(second) == ['other']
+
+    first_audit = cleaner._audit_path(first, backup_dir)
+    second_audit = cleaner._audit_path(second, backup_dir)
+    assert first_audit != second_audit
+    assert _keys(first_audit) == ['augment.vscode.0', 'augment.vscode.1']
+    assert _keys(second_audit) == ['augment.cursor.0', 'augment.cursor.1']
+
+
+def test_failed_audit_copy_fails_cleanup_and_keeps_rows(tmp_path, cleaner):
+    db_path = _make_state_db(tmp_path / 'vscode' / 'state.vscdb', extra_column=True)
+    backup_dir = tmp_path / 'backup'
+
+    # An audit table that can't take the rows: the copy fails
+    audit_path = cleaner._audit_path(db_path, backup_dir)
+    audit_path.parent.mkdir(parents=True)
+    conn = sqlite3.connect(audit_path)
+    conn.execute("CREATE TABLE ItemTable (key TEXT)")
+    conn.commit()
+    conn.close()
+
+    assert not cleaner.clean_database(db_path, backup_dir, AUDIT_OPTIONS)
+    assert _keys(db_path) == ['augment.vscode.0', 'augment.vscode.1', 'other']
+    assert _keys(audit_path) == []
+
+
+def test_cleanup_without_audit_writes_no_audit_file(tmp_path, cleaner):
+    db_path = _make_state_db(tmp_path / 'vscode' / 'state.vscdb', extra_column=False)
+    backup_dir = tmp_path / 'backup'
+
+    assert cleaner.clean_database(db_path, backup_dir, {'remove_augment_records': True})
+    assert _keys(db_path) == ['other']
+    assert not cleaner._audit_path(db_path, backup_dir).exists()
+
+
+def test_records_support_membership_and_iteration_like_dicts():
+    record = AugmentRecord('ItemTable', 1, ('augment.x', 'v'), ['key', 'value'], ['key'])
+
+    assert 'data' in record
+    assert 'values' not in record
+    assert 0 not in record
+    assert list(record) == list(record.to_dict())
+    with pytest.raises(TypeError):
+        hash(record)
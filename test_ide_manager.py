@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests for reusing IDE installation scans in AugmentCodeIDEManager.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add current directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ide_manager import AugmentCodeIDEManager
+from utils import IDEDetector, OSDetector
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    monkeypatch.setattr(Path, 'home', classmethod(lambda cls: tmp_path))
+    monkeypatch.setattr(OSDetector, 'get_os_type', staticmethod(lambda: 'linux'))
+    monkeypatch.setattr(IDEDetector, 'detect_running_augmentcode_processes', staticmethod(lambda: []))
+    (tmp_path / '.config' / 'Code' / 'User').mkdir(parents=True)
+    return tmp_path
+
+
+def _config_files(scan_results):
+    return [(config['name'], config['size'])
+            for install in scan_results['ide_installations'].get('vscode', [])
+            for config in install['augmentcode_data']['config_files']]
+
+
+def test_scan_sees_files_created_deep_in_an_ide_tree(home):
+    deep = home / '.config' / 'Code' / 'User' / 'globalStorage' / 'x'
+    deep.mkdir(parents=True)
+    manager = AugmentCodeIDEManager()
+    assert _config_files(manager.perform_comprehensive_scan()) == []
+
+    # Only deep's own mtime changes, not the IDE directory's
+    (deep / 'augment-code.json').write_text('{}')
+
+    assert _config_files(manager.perform_comprehensive_scan()) == [('augment-code.json', 2)]
+
+
+def test_scan_sees_resized_files(home):
+    config = home / '.config' / 'Code' / 'User' / 'augment-code.json'
+    config.write_text('{}')
+    manager = AugmentCodeIDEManager()
+    assert _config_files(manager.perform_comprehensive_scan()) == [('augment-code.json', 2)]
+
+    config.write_text('{"a": 1}')
+    assert _config_files(manager.perform_comprehensive_scan()) == [('augment-code.json', 8)]
+
+
+def test_unchanged_trees_reuse_the_installation_scan(home, monkeypatch):
+    manager = AugmentCodeIDEManager()
+    first = manager.perform_comprehensive_scan()
+
+    def fail():
+        raise AssertionError("installations were scanned again")
+
+    monkeypatch.setattr(IDEDetector, 'detect_ide_installations_parallel', staticmethod(fail))
+    assert manager.perform_comprehensive_scan()['ide_installations'] is first['ide_installations']
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Tests for the file helpers in utils.
+"""
+
+import sys
+from pathlib import Path
+
+# Add current directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+import utils
+from utils import SafeFileOperations
+
+
+def _fail(*args, **kwargs):
+    raise OSError("simulated failure")
+
+
+def test_safe_atomic_write_replaces_content(tmp_path):
+    target = tmp_path / 'settings.json'
+    target.write_bytes(b'old')
+
+    assert SafeFileOperations.safe_atomic_write(target, b'new')
+    assert target.read_bytes() == b'new'
+    assert [path.name for path in tmp_path.iterdir()] == ['settings.json']
+
+
+def test_safe_atomic_write_returns_false_when_cleanup_also_fails(tmp_path, monkeypatch):
+    target = tmp_path / 'settings.json'
+    target.write_bytes(b'old')
+    monkeypatch.setattr(utils.os, 'replace', _fail)
+    monkeypatch.setattr(utils.os, 'unlink', _fail)
+
+    assert not SafeFileOperations.safe_atomic_write(target, b'new')
+    assert target.read_bytes() == b'old'
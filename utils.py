@@ -6,36 +6,48 @@ Provides cross-platform utilities, OS detection, and common helper functions.
 import os
 import platform
 import logging
+import shutil
+import tempfile
 import uuid
 import random
 import string
 import subprocess
 import psutil
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, Iterator, Union
 import json
 import re
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Optional; JSON is parsed with the standard library instead
+
 
 class OSDetector:
     """Detect operating system and provide platform-specific paths."""
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_os_type() -> str:
         """Get the current operating system type."""
+        # The platform can't change while the process runs
         return platform.system().lower()
     
     @staticmethod
     def is_windows() -> bool:
-        return platform.system().lower() == 'windows'
+        return OSDetector.get_os_type() == 'windows'
     
     @staticmethod
     def is_macos() -> bool:
-        return platform.system().lower() == 'darwin'
+        return OSDetector.get_os_type() == 'darwin'
     
     @staticmethod
     def is_linux() -> bool:
-        return platform.system().lower() == 'linux'
+        return OSDetector.get_os_type() == 'linux'
 
 
 class PathFinder:
@@ -214,34 +226,50 @@ class IDEDetector:
     @staticmethod
     def detect_ide_installations() -> Dict[str, List[Dict[str, Any]]]:
         """Detect all IDE installations that might have AugmentCode."""
-        installations = {}
         os_type = OSDetector.get_os_type()
         home = Path.home()
+        return {ide_key: IDEDetector._detect_installations_for_ide(ide_key, os_type, home)
+                for ide_key in IDEDetector.SUPPORTED_IDES}
 
-        for ide_key, ide_info in IDEDetector.SUPPORTED_IDES.items():
-            installations[ide_key] = []
-
-            # Get OS-specific config paths
-            config_paths = ide_info['config_paths'].get(os_type, [])
-
-            for config_path in config_paths:
-                if config_path.startswith('/'):
-                    # Absolute path
-                    full_path = Path(config_path)
-                else:
-                    # Relative to home directory
-                    full_path = home / config_path
-
-                if full_path.exists():
-                    # Check for AugmentCode extensions/plugins
-                    augmentcode_data = IDEDetector._find_augmentcode_in_ide(full_path, ide_info)
-
-                    if augmentcode_data:
-                        installations[ide_key].append({
-                            'path': full_path,
-                            'ide_name': ide_info['name'],
-                            'augmentcode_data': augmentcode_data
-                        })
+    @staticmethod
+    def detect_ide_installations_parallel() -> Dict[str, List[Dict[str, Any]]]:
+        """Like detect_ide_installations, but scan each IDE on its own worker thread."""
+        os_type = OSDetector.get_os_type()
+        home = Path.home()
+        ide_keys = list(IDEDetector.SUPPORTED_IDES)
+        with ThreadPoolExecutor(max_workers=len(ide_keys), thread_name_prefix='idescan') as executor:
+            futures = [executor.submit(IDEDetector._detect_installations_for_ide, ide_key, os_type, home)
+                       for ide_key in ide_keys]
+            # Collect in SUPPORTED_IDES order so results match the sequential scan
+            return {ide_key: future.result() for ide_key, future in zip(ide_keys, futures)}
+
+    @staticmethod
+    def _detect_installations_for_ide(ide_key: str, os_type: str, home: Path) -> List[Dict[str, Any]]:
+        """Find AugmentCode data under each configured directory of a single IDE."""
+        ide_info = IDEDetector.SUPPORTED_IDES[ide_key]
+        installations = []
+
+        # Get OS-specific config paths
+        config_paths = ide_info['config_paths'].get(os_type, [])
+
+        for config_path in config_paths:
+            if config_path.startswith('/'):
+                # Absolute path
+                full_path = Path(config_path)
+            else:
+                # Relative to home directory
+                full_path = home / config_path
+
+            if full_path.exists():
+                # Check for AugmentCode extensions/plugins
+                augmentcode_data = IDEDetector._find_augmentcode_in_ide(full_path, ide_info)
+
+                if augmentcode_data:
+                    installations.append({
+                        'path': full_path,
+                        'ide_name': ide_info['name'],
+                        'augmentcode_data': augmentcode_data
+                    })
 
         return installations
 
@@ -404,6 +432,12 @@ class IDEDetector:
     def generate_ide_report(installations: Dict[str, List[Dict[str, Any]]],
                            running_processes: List[Dict[str, Any]]) -> str:
         """Generate a comprehensive report of IDE installations and AugmentCode usage."""
+        return "\n".join(IDEDetector.generate_ide_report_lines(installations, running_processes))
+
+    @staticmethod
+    def generate_ide_report_lines(installations: Dict[str, List[Dict[str, Any]]],
+                                  running_processes: List[Dict[str, Any]]) -> List[str]:
+        """Build the IDE report as a list of lines."""
         report_lines = []
 
         report_lines.append("=" * 80)
@@ -452,7 +486,7 @@ class IDEDetector:
         report_lines.append("")
         report_lines.append("=" * 80)
 
-        return "\n".join(report_lines)
+        return report_lines
 
 
 class IDGenerator:
@@ -479,9 +513,71 @@ class IDGenerator:
         return f"machine_{IDGenerator.generate_uuid()}"
 
 
+class DirectorySnapshot:
+    """Entries of one or more directory trees, read once and shared by several scans.
+    
+    Each directory is listed a single time; scans then replay the listings in
+    whatever order they walk, so several of them cost one set of readdirs.
+    Directories outside the snapshot are read from disk as usual.
+    """
+    
+    def __init__(self, roots: List[Path]):
+        self.roots = list(roots)
+        # Directory path -> its entries in scandir order, or the error listing it raised
+        self._listings: Dict[str, Union[List[os.DirEntry], OSError]] = {}
+        for root in self.roots:
+            pending = [str(root)]
+            while pending:
+                current = pending.pop()
+                if current in self._listings:
+                    continue
+                try:
+                    entries = FileSearcher.list_directory(current)
+                except OSError as e:
+                    self._listings[current] = e
+                    continue
+                self._listings[current] = entries
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                    except OSError:
+                        continue
+    
+    def scandir(self, directory: str) -> List[os.DirEntry]:
+        """Return a directory's entries as listed when the snapshot was taken."""
+        listing = self._listings.get(directory)
+        if listing is None:
+            return FileSearcher.list_directory(directory)
+        if isinstance(listing, OSError):
+            raise listing
+        return listing
+    
+    def fingerprint(self) -> Tuple[Tuple[str, int, int], ...]:
+        """Path, mtime and size of every entry, to tell whether the trees changed since."""
+        stamps = []
+        for listing in self._listings.values():
+            if isinstance(listing, OSError):
+                continue
+            for entry in listing:
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                stamps.append((entry.path, stat.st_mtime_ns, stat.st_size))
+        stamps.sort()
+        return tuple(stamps)
+
+
 class FileSearcher:
     """Search for files and patterns across directories."""
     
+    @staticmethod
+    def list_directory(directory: str) -> List[os.DirEntry]:
+        """Read a directory's entries with scandir."""
+        with os.scandir(directory) as entries:
+            return list(entries)
+    
     @staticmethod
     def find_augmentcode_directories(search_paths: List[Path]) -> List[Path]:
         """Find directories that might contain AugmentCode data."""
@@ -509,40 +605,77 @@ class FileSearcher:
         return found_dirs
     
     @staticmethod
-    def find_config_files(directory: Path) -> List[Path]:
-        """Find configuration files in a directory."""
-        config_extensions = ['.json', '.ini', '.xml', '.cfg', '.conf', '.config']
-        config_files = []
+    def iter_tree(directory: Path, snapshot: Optional[DirectorySnapshot] = None) -> Iterator[os.DirEntry]:
+        """Yield every entry under a directory in Path.rglob('*') order, skipping unreadable ones."""
+        scandir = snapshot.scandir if snapshot else FileSearcher.list_directory
+        pending = [str(directory)]
+        while pending:
+            try:
+                entries = scandir(pending.pop())
+            except OSError:
+                continue
+            
+            subdirectories = []
+            for entry in entries:
+                yield entry
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirectories.append(entry.path)
+                except OSError:
+                    continue
+            pending.extend(reversed(subdirectories))
+    
+    @staticmethod
+    def _find_files_by_suffix(directory: Path, extensions: Tuple[str, ...],
+                              snapshot: Optional[DirectorySnapshot] = None) -> List[Path]:
+        """Walk a directory tree once with scandir, collecting files with the given suffixes.
         
+        Results come in the same order as Path.rglob('*'): each directory's
+        entries, then its subdirectories depth first, without following
+        symlinked directories. Names are checked on the raw directory entry,
+        so only candidate files are stat'ed and turned into Paths.
+        """
+        found = []
         if not directory.exists():
-            return config_files
+            return found
         
-        try:
-            for file_path in directory.rglob('*'):
-                if file_path.is_file() and file_path.suffix.lower() in config_extensions:
-                    config_files.append(file_path)
-        except PermissionError:
-            logging.warning(f"Permission denied searching {directory}")
+        scandir = snapshot.scandir if snapshot else FileSearcher.list_directory
+        pending = [str(directory)]
+        while pending:
+            current = pending.pop()
+            try:
+                entries = scandir(current)
+            except PermissionError:
+                if current == str(directory):
+                    logging.warning(f"Permission denied searching {directory}")
+                continue
+            except OSError:
+                continue
+            
+            subdirectories = []
+            for entry in entries:
+                try:
+                    if os.path.splitext(entry.name)[1].lower() in extensions and entry.is_file():
+                        found.append(Path(entry.path))
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirectories.append(entry.path)
+                except OSError:
+                    continue
+            pending.extend(reversed(subdirectories))
         
-        return config_files
+        return found
     
     @staticmethod
-    def find_database_files(directory: Path) -> List[Path]:
+    def find_config_files(directory: Path, snapshot: Optional[DirectorySnapshot] = None) -> List[Path]:
+        """Find configuration files in a directory."""
+        return FileSearcher._find_files_by_suffix(
+            directory, ('.json', '.ini', '.xml', '.cfg', '.conf', '.config'), snapshot
+        )
+    
+    @staticmethod
+    def find_database_files(directory: Path, snapshot: Optional[DirectorySnapshot] = None) -> List[Path]:
         """Find SQLite database files in a directory."""
-        db_extensions = ['.db', '.sqlite', '.sqlite3']
-        db_files = []
-        
-        if not directory.exists():
-            return db_files
-        
-        try:
-            for file_path in directory.rglob('*'):
-                if file_path.is_file() and file_path.suffix.lower() in db_extensions:
-                    db_files.append(file_path)
-        except PermissionError:
-            logging.warning(f"Permission denied searching {directory}")
-        
-        return db_files
+        return FileSearcher._find_files_by_suffix(directory, ('.db', '.sqlite', '.sqlite3'), snapshot)
 
 
 class Logger:
@@ -588,8 +721,17 @@ class SafeFileOperations:
     def safe_read_json(file_path: Path) -> Optional[Dict[str, Any]]:
         """Safely read a JSON file."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            
+            if orjson is not None:
+                try:
+                    return orjson.loads(data)
+                except orjson.JSONDecodeError:
+                    # orjson rejects NaN/Infinity and integers beyond 64 bits,
+                    # which the standard library accepts
+                    pass
+            return json.loads(data.decode('utf-8'))
         except (json.JSONDecodeError, FileNotFoundError, PermissionError) as e:
             logging.error(f"Failed to read JSON file {file_path}: {e}")
             return None
@@ -605,11 +747,34 @@ class SafeFileOperations:
             logging.error(f"Failed to write JSON file {file_path}: {e}")
             return False
     
+    @staticmethod
+    def safe_atomic_write(file_path: Path, data: bytes) -> bool:
+        """Safely replace a file's content via a temporary file and os.replace."""
+        tmp_path = None
+        try:
+            with tempfile.NamedTemporaryFile('wb', dir=file_path.parent, prefix=f".{file_path.name}.",
+                                             suffix='.tmp', delete=False) as tmp:
+                tmp_path = tmp.name
+                tmp.write(data)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            
+            # NamedTemporaryFile is created 0600; keep the original file's mode
+            shutil.copymode(file_path, tmp_path)
+            os.replace(tmp_path, file_path)
+            return True
+        except (PermissionError, OSError) as e:
+            logging.error(f"Failed to write file {file_path}: {e}")
+            if tmp_path:
+                # A failed cleanup must not replace the original error
+                with suppress(OSError):
+                    os.unlink(tmp_path)
+            return False
+    
     @staticmethod
     def safe_copy_file(src: Path, dst: Path) -> bool:
         """Safely copy a file."""
         try:
-            import shutil
             dst.parent.mkdir(parents=True, exist_ok=True)
             shutil.copy2(src, dst)
             return True
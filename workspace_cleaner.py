@@ -9,7 +9,7 @@ from pathlib import Path
 from typing import List, Dict, Any, Optional
 import json
 
-from utils import OSDetector, FileSearcher, SafeFileOperations
+from utils import OSDetector, FileSearcher, SafeFileOperations, DirectorySnapshot
 from backup_manager import BackupManager
 
 
@@ -20,7 +20,8 @@ class WorkspaceCleaner:
         self.logger = logging.getLogger('FreeAugmentCode.WorkspaceCleaner')
         self.backup_manager = backup_manager
     
-    def discover_workspace_locations(self, augmentcode_paths: List[Path]) -> List[Dict[str, Any]]:
+    def discover_workspace_locations(self, augmentcode_paths: List[Path],
+                                     snapshot: Optional[DirectorySnapshot] = None) -> List[Dict[str, Any]]:
         """Discover potential workspace locations."""
         workspace_locations = []
         
@@ -36,11 +37,11 @@ class WorkspaceCleaner:
                 continue
             
             try:
-                for item in base_path.rglob('*'):
-                    if item.is_dir():
+                for entry in FileSearcher.iter_tree(base_path, snapshot):
+                    if entry.is_dir():
                         for pattern in workspace_patterns:
-                            if pattern.lower() in item.name.lower():
-                                workspace_info = self._analyze_workspace_directory(item)
+                            if pattern.lower() in entry.name.lower():
+                                workspace_info = self._analyze_workspace_directory(Path(entry.path), snapshot)
                                 if workspace_info:
                                     workspace_locations.append(workspace_info)
                                 break
@@ -52,15 +53,15 @@ class WorkspaceCleaner:
         user_workspace_paths = self._get_common_user_workspace_paths()
         for path in user_workspace_paths:
             if path.exists():
-                workspace_info = self._analyze_workspace_directory(path)
+                workspace_info = self._analyze_workspace_directory(path, snapshot)
                 if workspace_info:
                     workspace_locations.append(workspace_info)
         
         # Check for workspace paths in configuration files
-        config_workspace_paths = self._find_workspace_paths_in_configs(augmentcode_paths)
+        config_workspace_paths = self._find_workspace_paths_in_configs(augmentcode_paths, snapshot)
         for path in config_workspace_paths:
             if path.exists():
-                workspace_info = self._analyze_workspace_directory(path)
+                workspace_info = self._analyze_workspace_directory(path, snapshot)
                 if workspace_info:
                     workspace_locations.append(workspace_info)
         
@@ -106,12 +107,13 @@ class WorkspaceCleaner:
         
         return paths
     
-    def _find_workspace_paths_in_configs(self, augmentcode_paths: List[Path]) -> List[Path]:
+    def _find_workspace_paths_in_configs(self, augmentcode_paths: List[Path],
+                                         snapshot: Optional[DirectorySnapshot] = None) -> List[Path]:
         """Find workspace paths mentioned in configuration files."""
         workspace_paths = []
         
         for base_path in augmentcode_paths:
-            config_files = FileSearcher.find_config_files(base_path)
+            config_files = FileSearcher.find_config_files(base_path, snapshot)
             
             for config_file in config_files:
                 try:
@@ -152,7 +154,8 @@ class WorkspaceCleaner:
         path_indicators = ['/', '\\', ':', 'C:', 'D:', '/home', '/Users', 'Documents', 'AppData']
         return any(indicator in value for indicator in path_indicators)
     
-    def _analyze_workspace_directory(self, workspace_path: Path) -> Optional[Dict[str, Any]]:
+    def _analyze_workspace_directory(self, workspace_path: Path,
+                                     snapshot: Optional[DirectorySnapshot] = None) -> Optional[Dict[str, Any]]:
         """Analyze a workspace directory to determine its contents and cleanable items."""
         if not workspace_path.exists() or not workspace_path.is_dir():
             return None
@@ -171,18 +174,18 @@ class WorkspaceCleaner:
         
         try:
             # Analyze directory contents
-            for item in workspace_path.rglob('*'):
-                if item.is_file():
+            for entry in FileSearcher.iter_tree(workspace_path, snapshot):
+                if entry.is_file():
                     workspace_info['file_count'] += 1
                     try:
-                        workspace_info['total_size'] += item.stat().st_size
+                        workspace_info['total_size'] += entry.stat().st_size
                     except (OSError, PermissionError):
                         continue
                     
                     # Categorize files
-                    self._categorize_workspace_item(item, workspace_info)
-                elif item.is_dir():
-                    self._categorize_workspace_directory(item, workspace_info)
+                    self._categorize_workspace_item(Path(entry.path), workspace_info)
+                elif entry.is_dir():
+                    self._categorize_workspace_directory(Path(entry.path), workspace_info)
         
         except PermissionError:
             self.logger.warning(f"Permission denied analyzing workspace: {workspace_path}")
@@ -388,6 +391,10 @@ class WorkspaceCleaner:
     
     def generate_workspace_report(self, workspace_locations: List[Dict[str, Any]]) -> str:
         """Generate a human-readable report of discovered workspace locations."""
+        return "\n".join(self.generate_workspace_report_lines(workspace_locations))
+    
+    def generate_workspace_report_lines(self, workspace_locations: List[Dict[str, Any]]) -> List[str]:
+        """Build the workspace report line by line, without joining it."""
         report_lines = []
         
         report_lines.append("=== WORKSPACE DISCOVERY REPORT ===")
@@ -395,7 +402,7 @@ class WorkspaceCleaner:
         
         if not workspace_locations:
             report_lines.append("No workspace locations found.")
-            return "\n".join(report_lines)
+            return report_lines
         
         # Summary
         total_size = sum(ws['total_size'] for ws in workspace_locations)
@@ -429,7 +436,7 @@ class WorkspaceCleaner:
             
             report_lines.append("")
         
-        return "\n".join(report_lines)
+        return report_lines
     
     def _format_size(self, size_bytes: int) -> str:
         """Format file size in human-readable format."""